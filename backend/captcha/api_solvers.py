@@ -3,17 +3,101 @@ API CAPTCHA Solvers
 Integration with 2Captcha and Anti-Captcha services
 """
 import time
-import requests
+import asyncio
+import importlib.util
+import httpx
+import orjson
 import logging
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterator, List, Optional, Dict, Tuple
 from config.settings import TWOCAPTCHA_API_KEY, ANTICAPTCHA_API_KEY
+from utils.helpers import ttl_cache
+from .pingback_receiver import PingbackReceiver
 
 logger = logging.getLogger(__name__)
 
+# Poll schedule: first check just below the typical 20-40s solve time,
+# then tighten so we notice the ready state quickly
+POLL_DELAYS = (15, 5, 5, 5)
+POLL_DELAY_TAIL = 3
+
+# With a pingback receiver, results arrive as events; poll only as a safety net
+PINGBACK_FALLBACK_DELAY = 30
+
+# Balances barely move between batches; avoid a round trip per GUI refresh
+BALANCE_CACHE_SECONDS = 30
+
+# Anti-Captcha bodies are sent pre-serialized with orjson
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# HTTP/2 lets concurrent polls to the same host share one connection
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Max parallel submissions in solve_batch
+BATCH_SUBMIT_WORKERS = 8
+
+# Solver instances cached per service so successive scrapes reuse one pool
+_solver_cache: Dict[str, "CaptchaSolver"] = {}
+
+# Sync client shared by every solver, created on first use
+_shared_client: Optional[httpx.Client] = None
+
+
+def _poll_delays(pingback: bool = False) -> Iterator[float]:
+    """Yield seconds to wait before each result poll"""
+    if not pingback:
+        yield from POLL_DELAYS
+    while True:
+        yield PINGBACK_FALLBACK_DELAY if pingback else POLL_DELAY_TAIL
+
+
+def get_shared_client() -> httpx.Client:
+    """
+    Get the keep-alive client shared by all solvers.
+
+    Returns:
+        Shared httpx client (HTTP/2 when h2 is installed)
+    """
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        transport = httpx.HTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+            retries=2
+        )
+        # Replies are tiny JSON payloads, compression only costs CPU
+        _shared_client = httpx.Client(
+            transport=transport,
+            timeout=30,
+            headers={"Accept-Encoding": "identity"}
+        )
+    return _shared_client
+
+
+def close_shared_client():
+    """Close the shared client (e.g. on application shutdown)"""
+    global _shared_client
+    if _shared_client is not None:
+        _shared_client.close()
+        _shared_client = None
+
+
+def _create_async_client() -> httpx.AsyncClient:
+    """Create a keep-alive async client shared by concurrent solves"""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=10, keepalive_expiry=60),
+        timeout=30,
+        headers={"Accept-Encoding": "identity"}
+    )
+
 
 class CaptchaSolver:
     """Base class for CAPTCHA solving services"""
 
+    pingback: Optional[PingbackReceiver] = None
+
     def solve(self, site_key: str, page_url: str, captcha_type: str = "recaptcha_v2") -> Optional[str]:
         """
         Solve CAPTCHA.
@@ -28,23 +112,116 @@ class CaptchaSolver:
         """
         raise NotImplementedError
 
+    async def solve_async(self, site_key: str, page_url: str, captcha_type: str = "recaptcha_v2") -> Optional[str]:
+        """
+        Solve CAPTCHA without blocking the event loop.
+
+        Several solves can share one loop via asyncio.gather().
+
+        Args:
+            site_key: CAPTCHA site key
+            page_url: Page URL where CAPTCHA appears
+            captcha_type: Type of CAPTCHA (recaptcha_v2, recaptcha_v3, hcaptcha)
+
+        Returns:
+            CAPTCHA solution token or None
+        """
+        raise NotImplementedError
+
+    def solve_batch(self, tasks: List[Tuple[str, str, str]], timeout: int = 120) -> List[Optional[str]]:
+        """
+        Solve several CAPTCHAs at once.
+
+        Args:
+            tasks: (site_key, page_url, captcha_type) tuples
+            timeout: Maximum wait time in seconds for the whole batch
+
+        Returns:
+            Solution tokens (or None) in task order
+        """
+        return [self.solve(*task) for task in tasks]
+
+    def _submit_all(self, tasks: List[Tuple[str, str, str]]) -> List:
+        """Submit all tasks back-to-back, returning IDs (None on failure) in order"""
+        def submit(task):
+            try:
+                return self._submit_captcha(*task)
+            except Exception as e:
+                logger.error(f"Batch submit error: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(len(tasks), BATCH_SUBMIT_WORKERS)) as executor:
+            return list(executor.map(submit, tasks))
+
+    def _wait_pingbacks(self, pending: Dict[int, str], results: List[Optional[str]], timeout: int):
+        """Fill results from the pingback receiver for all pending IDs"""
+        deadline = time.time() + timeout
+        for index, captcha_id in pending.items():
+            results[index] = self.pingback.wait_for(captcha_id, max(0, deadline - time.time()))
+
+    def _wait_for_pingback(self, captcha_id, delay: float) -> Optional[str]:
+        """Wait up to delay seconds, returning early with the token if a pingback delivers it"""
+        if self.pingback:
+            return self.pingback.wait_for(captcha_id, delay)
+        time.sleep(delay)
+        return None
+
+    async def _wait_for_pingback_async(self, captcha_id, delay: float) -> Optional[str]:
+        """Async variant of _wait_for_pingback"""
+        if self.pingback:
+            return await asyncio.to_thread(self.pingback.wait_for, captcha_id, delay)
+        await asyncio.sleep(delay)
+        return None
+
+    async def _ensure_async_client(self) -> httpx.AsyncClient:
+        """Lazily create the async client on the running loop"""
+        client = getattr(self, "_async_client", None)
+        if client is None or client.is_closed:
+            client = self._async_client = _create_async_client()
+        return client
+
+    async def aclose(self):
+        """Close the async HTTP client"""
+        client = getattr(self, "_async_client", None)
+        if client is not None:
+            await client.aclose()
+            self._async_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
 
 class TwoCaptchaSolver(CaptchaSolver):
     """2Captcha API solver"""
 
     API_URL = "https://2captcha.com"
 
-    def __init__(self, api_key: str = None):
+    # Map captcha types to 2Captcha methods
+    METHOD_MAP = {
+        "recaptcha_v2": "userrecaptcha",
+        "recaptcha_v3": "userrecaptcha",
+        "hcaptcha": "hcaptcha"
+    }
+
+    def __init__(self, api_key: str = None, pingback: PingbackReceiver = None, client: httpx.Client = None):
         """
         Initialize 2Captcha solver.
 
         Args:
             api_key: 2Captcha API key
+            pingback: Optional receiver 2Captcha pushes results to instead of polling
+            client: HTTP client to use (defaults to the shared client)
         """
         self.api_key = api_key or TWOCAPTCHA_API_KEY
+        self.pingback = pingback
         if not self.api_key:
             raise ValueError("2Captcha API key not provided")
 
+        self.client = client or get_shared_client()
+
         logger.info("TwoCaptcha solver initialized")
 
     def solve(self, site_key: str, page_url: str, captcha_type: str = "recaptcha_v2") -> Optional[str]:
@@ -83,17 +260,43 @@ class TwoCaptchaSolver(CaptchaSolver):
             logger.error(f"2Captcha error: {e}")
             return None
 
-    def _submit_captcha(self, site_key: str, page_url: str, captcha_type: str) -> Optional[str]:
-        """Submit CAPTCHA to 2Captcha"""
+    async def solve_async(self, site_key: str, page_url: str, captcha_type: str = "recaptcha_v2") -> Optional[str]:
+        """
+        Solve CAPTCHA using 2Captcha API without blocking the event loop.
 
-        # Map captcha types to 2Captcha methods
-        method_map = {
-            "recaptcha_v2": "userrecaptcha",
-            "recaptcha_v3": "userrecaptcha",
-            "hcaptcha": "hcaptcha"
-        }
+        Args:
+            site_key: CAPTCHA site key
+            page_url: Page URL
+            captcha_type: CAPTCHA type
+
+        Returns:
+            Solution token or None
+        """
+        logger.info(f"Solving {captcha_type} via 2Captcha (async)...")
+
+        try:
+            captcha_id = await self._submit_captcha_async(site_key, page_url, captcha_type)
+            if not captcha_id:
+                return None
+
+            logger.info(f"CAPTCHA submitted, ID: {captcha_id}")
+
+            solution = await self._get_result_async(captcha_id)
 
-        method = method_map.get(captcha_type, "userrecaptcha")
+            if solution:
+                logger.info("✓ CAPTCHA solved successfully")
+            else:
+                logger.error("✗ CAPTCHA solving failed")
+
+            return solution
+
+        except Exception as e:
+            logger.error(f"2Captcha error: {e}")
+            return None
+
+    def _submit_params(self, site_key: str, page_url: str, captcha_type: str) -> Dict:
+        """Build in.php parameters for a CAPTCHA submission"""
+        method = self.METHOD_MAP.get(captcha_type, "userrecaptcha")
 
         params = {
             "key": self.api_key,
@@ -109,8 +312,40 @@ class TwoCaptchaSolver(CaptchaSolver):
             params["action"] = "verify"
             params["min_score"] = 0.3
 
-        response = requests.post(f"{self.API_URL}/in.php", data=params, timeout=30)
-        result = response.json()
+        if self.pingback:
+            params["pingback"] = self.pingback.callback_url
+
+        return params
+
+    def _result_params(self, captcha_id: str) -> Dict:
+        """Build res.php parameters for a result poll"""
+        return {
+            "key": self.api_key,
+            "action": "get",
+            "id": captcha_id,
+            "json": 1
+        }
+
+    def _submit_captcha(self, site_key: str, page_url: str, captcha_type: str) -> Optional[str]:
+        """Submit CAPTCHA to 2Captcha"""
+        params = self._submit_params(site_key, page_url, captcha_type)
+
+        response = self.client.post(f"{self.API_URL}/in.php", data=params, timeout=30)
+        result = orjson.loads(response.content)
+
+        if result.get("status") == 1:
+            return result.get("request")
+        else:
+            logger.error(f"2Captcha submit error: {result.get('request')}")
+            return None
+
+    async def _submit_captcha_async(self, site_key: str, page_url: str, captcha_type: str) -> Optional[str]:
+        """Submit CAPTCHA to 2Captcha (async)"""
+        client = await self._ensure_async_client()
+        params = self._submit_params(site_key, page_url, captcha_type)
+
+        response = await client.post(f"{self.API_URL}/in.php", data=params)
+        result = orjson.loads(response.content)
 
         if result.get("status") == 1:
             return result.get("request")
@@ -121,20 +356,45 @@ class TwoCaptchaSolver(CaptchaSolver):
     def _get_result(self, captcha_id: str, timeout: int = 120) -> Optional[str]:
         """Poll for CAPTCHA result"""
 
-        params = {
-            "key": self.api_key,
-            "action": "get",
-            "id": captcha_id,
-            "json": 1
-        }
+        params = self._result_params(captcha_id)
+
+        start_time = time.time()
+        delays = _poll_delays(self.pingback is not None)
+
+        while time.time() - start_time < timeout:
+            token = self._wait_for_pingback(captcha_id, next(delays))
+            if token:
+                return token
+
+            response = self.client.get(f"{self.API_URL}/res.php", params=params, timeout=30)
+            result = orjson.loads(response.content)
+
+            if result.get("status") == 1:
+                return result.get("request")
+            elif result.get("request") == "CAPCHA_NOT_READY":
+                continue
+            else:
+                logger.error(f"2Captcha result error: {result.get('request')}")
+                return None
+
+        logger.error("2Captcha timeout")
+        return None
+
+    async def _get_result_async(self, captcha_id: str, timeout: int = 120) -> Optional[str]:
+        """Poll for CAPTCHA result (async)"""
+        client = await self._ensure_async_client()
+        params = self._result_params(captcha_id)
 
         start_time = time.time()
+        delays = _poll_delays(self.pingback is not None)
 
         while time.time() - start_time < timeout:
-            time.sleep(5)  # Wait 5 seconds between polls
+            token = await self._wait_for_pingback_async(captcha_id, next(delays))
+            if token:
+                return token
 
-            response = requests.get(f"{self.API_URL}/res.php", params=params, timeout=30)
-            result = response.json()
+            response = await client.get(f"{self.API_URL}/res.php", params=params)
+            result = orjson.loads(response.content)
 
             if result.get("status") == 1:
                 return result.get("request")
@@ -147,6 +407,73 @@ class TwoCaptchaSolver(CaptchaSolver):
         logger.error("2Captcha timeout")
         return None
 
+    def solve_batch(self, tasks: List[Tuple[str, str, str]], timeout: int = 120) -> List[Optional[str]]:
+        """
+        Solve several CAPTCHAs with 2Captcha in one polling loop.
+
+        All tasks are submitted first, then each tick fetches every pending
+        result in a single res.php call (action=get with comma-separated ids).
+
+        Args:
+            tasks: (site_key, page_url, captcha_type) tuples
+            timeout: Maximum wait time in seconds for the whole batch
+
+        Returns:
+            Solution tokens (or None) in task order
+        """
+        if not tasks:
+            return []
+
+        logger.info(f"Solving batch of {len(tasks)} CAPTCHAs via 2Captcha...")
+
+        results: List[Optional[str]] = [None] * len(tasks)
+        ids = self._submit_all(tasks)
+        pending = {i: captcha_id for i, captcha_id in enumerate(ids) if captcha_id}
+
+        if self.pingback:
+            self._wait_pingbacks(pending, results, timeout)
+            return results
+
+        start_time = time.time()
+        delays = _poll_delays()
+
+        while pending and time.time() - start_time < timeout:
+            time.sleep(next(delays))
+
+            try:
+                params = {
+                    "key": self.api_key,
+                    "action": "get",
+                    "ids": ",".join(pending.values()),
+                    "json": 1
+                }
+                response = self.client.get(f"{self.API_URL}/res.php", params=params, timeout=30)
+                result = orjson.loads(response.content)
+            except Exception as e:
+                logger.error(f"2Captcha batch poll error: {e}")
+                continue
+
+            answers = str(result.get("request", "")).split("|")
+            if len(answers) != len(pending):
+                logger.error(f"2Captcha batch result error: {result.get('request')}")
+                break
+
+            for (index, captcha_id), answer in zip(list(pending.items()), answers):
+                if answer == "CAPCHA_NOT_READY":
+                    continue
+                if answer.startswith("ERROR"):
+                    logger.error(f"2Captcha result error for {captcha_id}: {answer}")
+                else:
+                    results[index] = answer
+                del pending[index]
+
+        if pending:
+            logger.error(f"2Captcha batch timeout, {len(pending)} unsolved")
+
+        logger.info(f"Batch done: {sum(r is not None for r in results)}/{len(tasks)} solved")
+        return results
+
+    @ttl_cache(BALANCE_CACHE_SECONDS, key=lambda self: (type(self).__name__, self.api_key))
     def get_balance(self) -> Optional[float]:
         """Get account balance"""
         try:
@@ -156,8 +483,8 @@ class TwoCaptchaSolver(CaptchaSolver):
                 "json": 1
             }
 
-            response = requests.get(f"{self.API_URL}/res.php", params=params, timeout=30)
-            result = response.json()
+            response = self.client.get(f"{self.API_URL}/res.php", params=params, timeout=30)
+            result = orjson.loads(response.content)
 
             if result.get("status") == 1:
                 balance = float(result.get("request", 0))
@@ -176,17 +503,29 @@ class AntiCaptchaSolver(CaptchaSolver):
 
     API_URL = "https://api.anti-captcha.com"
 
-    def __init__(self, api_key: str = None):
+    # Map captcha types to Anti-Captcha task types
+    TYPE_MAP = {
+        "recaptcha_v2": "RecaptchaV2TaskProxyless",
+        "recaptcha_v3": "RecaptchaV3TaskProxyless",
+        "hcaptcha": "HCaptchaTaskProxyless"
+    }
+
+    def __init__(self, api_key: str = None, pingback: PingbackReceiver = None, client: httpx.Client = None):
         """
         Initialize Anti-Captcha solver.
 
         Args:
             api_key: Anti-Captcha API key
+            pingback: Optional receiver Anti-Captcha pushes results to instead of polling
+            client: HTTP client to use (defaults to the shared client)
         """
         self.api_key = api_key or ANTICAPTCHA_API_KEY
+        self.pingback = pingback
         if not self.api_key:
             raise ValueError("Anti-Captcha API key not provided")
 
+        self.client = client or get_shared_client()
+
         logger.info("Anti-Captcha solver initialized")
 
     def solve(self, site_key: str, page_url: str, captcha_type: str = "recaptcha_v2") -> Optional[str]:
@@ -225,17 +564,43 @@ class AntiCaptchaSolver(CaptchaSolver):
             logger.error(f"Anti-Captcha error: {e}")
             return None
 
-    def _submit_captcha(self, site_key: str, page_url: str, captcha_type: str) -> Optional[int]:
-        """Submit CAPTCHA to Anti-Captcha"""
+    async def solve_async(self, site_key: str, page_url: str, captcha_type: str = "recaptcha_v2") -> Optional[str]:
+        """
+        Solve CAPTCHA using Anti-Captcha API without blocking the event loop.
 
-        # Map captcha types to Anti-Captcha task types
-        type_map = {
-            "recaptcha_v2": "RecaptchaV2TaskProxyless",
-            "recaptcha_v3": "RecaptchaV3TaskProxyless",
-            "hcaptcha": "HCaptchaTaskProxyless"
-        }
+        Args:
+            site_key: CAPTCHA site key
+            page_url: Page URL
+            captcha_type: CAPTCHA type
 
-        task_type = type_map.get(captcha_type, "RecaptchaV2TaskProxyless")
+        Returns:
+            Solution token or None
+        """
+        logger.info(f"Solving {captcha_type} via Anti-Captcha (async)...")
+
+        try:
+            task_id = await self._submit_captcha_async(site_key, page_url, captcha_type)
+            if not task_id:
+                return None
+
+            logger.info(f"CAPTCHA submitted, Task ID: {task_id}")
+
+            solution = await self._get_result_async(task_id)
+
+            if solution:
+                logger.info("✓ CAPTCHA solved successfully")
+            else:
+                logger.error("✗ CAPTCHA solving failed")
+
+            return solution
+
+        except Exception as e:
+            logger.error(f"Anti-Captcha error: {e}")
+            return None
+
+    def _task_payload(self, site_key: str, page_url: str, captcha_type: str) -> Dict:
+        """Build createTask payload"""
+        task_type = self.TYPE_MAP.get(captcha_type, "RecaptchaV2TaskProxyless")
 
         payload = {
             "clientKey": self.api_key,
@@ -251,12 +616,40 @@ class AntiCaptchaSolver(CaptchaSolver):
             payload["task"]["minScore"] = 0.3
             payload["task"]["pageAction"] = "verify"
 
-        response = requests.post(
+        if self.pingback:
+            payload["callbackUrl"] = self.pingback.callback_url
+
+        return payload
+
+    def _submit_captcha(self, site_key: str, page_url: str, captcha_type: str) -> Optional[int]:
+        """Submit CAPTCHA to Anti-Captcha"""
+        payload = self._task_payload(site_key, page_url, captcha_type)
+
+        response = self.client.post(
             f"{self.API_URL}/createTask",
-            json=payload,
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             timeout=30
         )
-        result = response.json()
+        result = orjson.loads(response.content)
+
+        if result.get("errorId") == 0:
+            return result.get("taskId")
+        else:
+            logger.error(f"Anti-Captcha submit error: {result.get('errorDescription')}")
+            return None
+
+    async def _submit_captcha_async(self, site_key: str, page_url: str, captcha_type: str) -> Optional[int]:
+        """Submit CAPTCHA to Anti-Captcha (async)"""
+        client = await self._ensure_async_client()
+        payload = self._task_payload(site_key, page_url, captcha_type)
+
+        response = await client.post(
+            f"{self.API_URL}/createTask",
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS
+        )
+        result = orjson.loads(response.content)
 
         if result.get("errorId") == 0:
             return result.get("taskId")
@@ -273,16 +666,57 @@ class AntiCaptchaSolver(CaptchaSolver):
         }
 
         start_time = time.time()
+        delays = _poll_delays(self.pingback is not None)
 
         while time.time() - start_time < timeout:
-            time.sleep(5)  # Wait 5 seconds between polls
+            token = self._wait_for_pingback(task_id, next(delays))
+            if token:
+                return token
 
-            response = requests.post(
+            response = self.client.post(
                 f"{self.API_URL}/getTaskResult",
-                json=payload,
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS,
                 timeout=30
             )
-            result = response.json()
+            result = orjson.loads(response.content)
+
+            if result.get("errorId") == 0:
+                if result.get("status") == "ready":
+                    solution = result.get("solution", {})
+                    return solution.get("gRecaptchaResponse")
+                elif result.get("status") == "processing":
+                    continue
+            else:
+                logger.error(f"Anti-Captcha result error: {result.get('errorDescription')}")
+                return None
+
+        logger.error("Anti-Captcha timeout")
+        return None
+
+    async def _get_result_async(self, task_id: int, timeout: int = 120) -> Optional[str]:
+        """Poll for CAPTCHA result (async)"""
+        client = await self._ensure_async_client()
+
+        payload = {
+            "clientKey": self.api_key,
+            "taskId": task_id
+        }
+
+        start_time = time.time()
+        delays = _poll_delays(self.pingback is not None)
+
+        while time.time() - start_time < timeout:
+            token = await self._wait_for_pingback_async(task_id, next(delays))
+            if token:
+                return token
+
+            response = await client.post(
+                f"{self.API_URL}/getTaskResult",
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS
+            )
+            result = orjson.loads(response.content)
 
             if result.get("errorId") == 0:
                 if result.get("status") == "ready":
@@ -297,6 +731,66 @@ class AntiCaptchaSolver(CaptchaSolver):
         logger.error("Anti-Captcha timeout")
         return None
 
+    def solve_batch(self, tasks: List[Tuple[str, str, str]], timeout: int = 120) -> List[Optional[str]]:
+        """
+        Solve several CAPTCHAs with Anti-Captcha in one polling loop.
+
+        All tasks are created first, then each tick checks every pending task
+        over the shared keep-alive connection.
+
+        Args:
+            tasks: (site_key, page_url, captcha_type) tuples
+            timeout: Maximum wait time in seconds for the whole batch
+
+        Returns:
+            Solution tokens (or None) in task order
+        """
+        if not tasks:
+            return []
+
+        logger.info(f"Solving batch of {len(tasks)} CAPTCHAs via Anti-Captcha...")
+
+        results: List[Optional[str]] = [None] * len(tasks)
+        ids = self._submit_all(tasks)
+        pending = {i: task_id for i, task_id in enumerate(ids) if task_id}
+
+        if self.pingback:
+            self._wait_pingbacks(pending, results, timeout)
+            return results
+
+        start_time = time.time()
+        delays = _poll_delays()
+
+        while pending and time.time() - start_time < timeout:
+            time.sleep(next(delays))
+
+            for index, task_id in list(pending.items()):
+                try:
+                    response = self.client.post(
+                        f"{self.API_URL}/getTaskResult",
+                        content=orjson.dumps({"clientKey": self.api_key, "taskId": task_id}),
+                        headers=JSON_HEADERS,
+                        timeout=30
+                    )
+                    result = orjson.loads(response.content)
+                except Exception as e:
+                    logger.error(f"Anti-Captcha batch poll error: {e}")
+                    continue
+
+                if result.get("errorId") != 0:
+                    logger.error(f"Anti-Captcha result error for {task_id}: {result.get('errorDescription')}")
+                    del pending[index]
+                elif result.get("status") == "ready":
+                    results[index] = result.get("solution", {}).get("gRecaptchaResponse")
+                    del pending[index]
+
+        if pending:
+            logger.error(f"Anti-Captcha batch timeout, {len(pending)} unsolved")
+
+        logger.info(f"Batch done: {sum(r is not None for r in results)}/{len(tasks)} solved")
+        return results
+
+    @ttl_cache(BALANCE_CACHE_SECONDS, key=lambda self: (type(self).__name__, self.api_key))
     def get_balance(self) -> Optional[float]:
         """Get account balance"""
         try:
@@ -304,12 +798,13 @@ class AntiCaptchaSolver(CaptchaSolver):
                 "clientKey": self.api_key
             }
 
-            response = requests.post(
+            response = self.client.post(
                 f"{self.API_URL}/getBalance",
-                json=payload,
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS,
                 timeout=30
             )
-            result = response.json()
+            result = orjson.loads(response.content)
 
             if result.get("errorId") == 0:
                 balance = float(result.get("balance", 0))
@@ -333,17 +828,22 @@ def get_solver(service: str = "2captcha") -> Optional[CaptchaSolver]:
     Returns:
         Solver instance or None
     """
+    if service in _solver_cache:
+        return _solver_cache[service]
+
     try:
         if service == "2captcha":
             if TWOCAPTCHA_API_KEY:
-                return TwoCaptchaSolver()
+                solver = _solver_cache[service] = TwoCaptchaSolver()
+                return solver
             else:
                 logger.warning("2Captcha API key not configured")
                 return None
 
         elif service == "anticaptcha":
             if ANTICAPTCHA_API_KEY:
-                return AntiCaptchaSolver()
+                solver = _solver_cache[service] = AntiCaptchaSolver()
+                return solver
             else:
                 logger.warning("Anti-Captcha API key not configured")
                 return None
@@ -355,3 +855,27 @@ def get_solver(service: str = "2captcha") -> Optional[CaptchaSolver]:
     except Exception as e:
         logger.error(f"Error initializing solver: {e}")
         return None
+
+
+@asynccontextmanager
+async def get_solver_async(service: str = "2captcha") -> AsyncIterator[Optional[CaptchaSolver]]:
+    """
+    Get CAPTCHA solver for async use.
+
+    Closes the solver's async client on exit. Usage:
+
+        async with get_solver_async("2captcha") as solver:
+            tokens = await asyncio.gather(*[solver.solve_async(k, url) for k, url in jobs])
+
+    Args:
+        service: Service name ("2captcha" or "anticaptcha")
+
+    Yields:
+        Solver instance or None
+    """
+    solver = get_solver(service)
+    try:
+        yield solver
+    finally:
+        if solver is not None:
+            await solver.aclose()
@@ -1,45 +1,31 @@
 """
 CAPTCHA Detector - Detects if a CAPTCHA is present on the page
 """
-from typing import Optional, Dict
+from typing import Dict, List, Optional, Union
 from utils.logger import get_logger
+from . import indicator_scanner
 
 logger = get_logger(__name__)
 
+# Page HTML (unless the caller has it) plus CAPTCHA iframe flags in a single Playwright round trip
+_PAGE_SCAN_JS = """
+(includeHtml) => ({
+    html: includeHtml ? document.documentElement.outerHTML : null,
+    recaptcha: !!document.querySelector('iframe[src*="recaptcha"]'),
+    hcaptcha: !!document.querySelector('iframe[src*="hcaptcha"]'),
+})
+"""
+
 
 class CaptchaDetector:
     """Detects various types of CAPTCHAs"""
 
-    # Common CAPTCHA indicators
-    CAPTCHA_INDICATORS = {
-        'recaptcha': [
-            'g-recaptcha',
-            'recaptcha',
-            'grecaptcha',
-            'data-sitekey',
-            'rc-anchor',
-        ],
-        'hcaptcha': [
-            'h-captcha',
-            'hcaptcha',
-            'data-hcaptcha',
-        ],
-        'cloudflare': [
-            'cf-challenge',
-            'cf-browser-verification',
-            'cf_chl_opt',
-            'Checking your browser',
-        ],
-        'generic': [
-            'captcha',
-            'challenge',
-            'verification',
-            'prove you are human',
-        ]
-    }
+    # Indicator lists live in indicator_scanner, shared with CloudflareHandler
+    CAPTCHA_INDICATORS = indicator_scanner.CAPTCHA_INDICATORS
+    BLOCKING_INDICATORS = indicator_scanner.BLOCKING_INDICATORS
 
     @staticmethod
-    def detect(html: str) -> Dict[str, any]:
+    def detect(html: Union[str, bytes]) -> Dict[str, any]:
         """
         Detect if CAPTCHA is present in HTML.
 
@@ -49,77 +35,60 @@ class CaptchaDetector:
         Returns:
             Dictionary with detection results
         """
-        html_lower = html.lower()
-
-        detected_types = []
-
-        # Check for each CAPTCHA type
-        for captcha_type, indicators in CaptchaDetector.CAPTCHA_INDICATORS.items():
-            for indicator in indicators:
-                if indicator.lower() in html_lower:
-                    if captcha_type not in detected_types:
-                        detected_types.append(captcha_type)
-                    break
+        detected_types = indicator_scanner.captcha_types(indicator_scanner.scan(html))
 
         if detected_types:
             logger.warning(f"CAPTCHA detected: {', '.join(detected_types)}")
-            return {
-                'detected': True,
-                'types': detected_types,
-                'primary_type': detected_types[0] if detected_types else None
-            }
 
+        return CaptchaDetector._build_result(detected_types)
+
+    @staticmethod
+    def _build_result(detected_types: List[str]) -> Dict[str, any]:
+        """Build the detection result; types are deduplicated keeping first-seen order"""
+        types = list(dict.fromkeys(detected_types))
         return {
-            'detected': False,
-            'types': [],
-            'primary_type': None
+            'detected': bool(types),
+            'types': types,
+            'primary_type': types[0] if types else None
         }
 
     @staticmethod
-    def detect_in_page(page) -> Dict[str, any]:
+    def detect_in_page(page, html: Optional[Union[str, bytes]] = None) -> Dict[str, any]:
         """
         Detect CAPTCHA in live page (Playwright/Selenium).
 
         Args:
             page: Page object
+            html: Current page HTML if the caller already fetched it
+                (avoids transferring and scanning the DOM again)
 
         Returns:
             Dictionary with detection results
         """
         try:
-            # Get page content
-            if hasattr(page, 'content'):  # Playwright
-                html = page.content()
-            elif hasattr(page, 'page_source'):  # Selenium
-                html = page.page_source
-            else:
-                return {'detected': False, 'types': [], 'primary_type': None}
+            if hasattr(page, 'evaluate'):  # Playwright
+                # HTML and live iframe checks in one round trip
+                scan = page.evaluate(_PAGE_SCAN_JS, html is None)
+                result = CaptchaDetector.detect(scan['html'] if html is None else html)
 
-            # Use HTML detection
-            result = CaptchaDetector.detect(html)
+                types = result['types']
+                for captcha_type in ('recaptcha', 'hcaptcha'):
+                    if scan[captcha_type]:
+                        types.append(captcha_type)
 
-            # Additional live checks for Playwright
-            if hasattr(page, 'query_selector'):
-                # Check for reCAPTCHA iframe
-                if page.query_selector('iframe[src*="recaptcha"]'):
-                    if 'recaptcha' not in result['types']:
-                        result['types'].append('recaptcha')
-                        result['detected'] = True
+                return CaptchaDetector._build_result(types)
 
-                # Check for hCaptcha iframe
-                if page.query_selector('iframe[src*="hcaptcha"]'):
-                    if 'hcaptcha' not in result['types']:
-                        result['types'].append('hcaptcha')
-                        result['detected'] = True
+            elif hasattr(page, 'page_source'):  # Selenium
+                return CaptchaDetector.detect(page.page_source if html is None else html)
 
-            return result
+            return {'detected': False, 'types': [], 'primary_type': None}
 
         except Exception as e:
             logger.error(f"Error detecting CAPTCHA in page: {e}")
             return {'detected': False, 'types': [], 'primary_type': None}
 
     @staticmethod
-    def is_blocked(html: str) -> bool:
+    def is_blocked(html: Union[str, bytes]) -> bool:
         """
         Check if we're blocked (403, 429, etc.).
 
@@ -129,20 +98,8 @@ class CaptchaDetector:
         Returns:
             True if blocked
         """
-        blocking_indicators = [
-            '403 forbidden',
-            'access denied',
-            '429 too many requests',
-            'rate limit exceeded',
-            'temporarily blocked',
-            'unusual traffic',
-            'automated requests',
-        ]
-
-        html_lower = html.lower()
-        for indicator in blocking_indicators:
-            if indicator in html_lower:
-                logger.warning(f"Blocking detected: {indicator}")
-                return True
+        if indicator_scanner.TAG_BLOCKED in indicator_scanner.scan(html):
+            logger.warning("Blocking detected")
+            return True
 
         return False
\ No newline at end of file
@@ -1,12 +1,33 @@
 """
 Cloudflare Challenge Handler
 """
+import re
 import time
-from typing import Optional
+from typing import Optional, Union
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from utils.logger import get_logger
+from . import indicator_scanner
 
 logger = get_logger(__name__)
 
+# Challenge interstitial text (body; the title is only "Just a moment...")
+_CHALLENGE_PATTERN = re.compile(r'checking your browser|ddos protection by cloudflare', re.IGNORECASE)
+
+# Live-page checks: return a boolean instead of serializing the whole DOM
+_CHALLENGE_SELECTOR = '[class*="cf-challenge"], [class*="cf-browser-verification"]'
+_PAGE_TEXT_JS = "(document.body ? document.body.innerText : '') + '\\n' + document.title"
+_CHALLENGE_JS = """
+(selector) => !!document.querySelector(selector)
+    || /checking your browser|ddos protection by cloudflare/i.test(%s)
+""" % _PAGE_TEXT_JS
+_CHALLENGE_CLEARED_JS = """
+(selector) => !document.querySelector(selector)
+    && !/checking your browser|ddos protection by cloudflare/i.test(%s)
+""" % _PAGE_TEXT_JS
+
 
 class CloudflareHandler:
     """Handles Cloudflare challenges"""
@@ -26,33 +47,26 @@ class CloudflareHandler:
         try:
             logger.info("Cloudflare challenge detected, waiting...")
 
+            # Let the browser/driver watch for the change when it can
+            cleared = CloudflareHandler._wait_until_cleared(page, timeout)
+            if cleared is not None:
+                if cleared:
+                    logger.info("Cloudflare challenge passed!")
+                    time.sleep(2)  # Wait for full page load
+                else:
+                    logger.warning(f"Cloudflare challenge timeout after {timeout}s")
+                return cleared
+
             start_time = time.time()
             check_interval = 1
 
             while time.time() - start_time < timeout:
-                # Get page content
-                if hasattr(page, 'content'):  # Playwright
-                    html = page.content()
-                    title = page.title()
-                elif hasattr(page, 'page_source'):  # Selenium
-                    html = page.page_source
-                    title = page.title
-                else:
+                # Check if challenge is still present
+                challenge_present = CloudflareHandler._challenge_present(page)
+                if challenge_present is None:
                     time.sleep(check_interval)
                     continue
 
-                html_lower = html.lower()
-
-                # Check if challenge is still present
-                cf_indicators = [
-                    'cf-challenge',
-                    'cf-browser-verification',
-                    'checking your browser',
-                    'ddos protection by cloudflare'
-                ]
-
-                challenge_present = any(ind in html_lower for ind in cf_indicators)
-
                 if not challenge_present:
                     logger.info("Cloudflare challenge passed!")
                     time.sleep(2)  # Wait for full page load
@@ -69,7 +83,58 @@ class CloudflareHandler:
             return False
 
     @staticmethod
-    def detect_cloudflare(html: str) -> bool:
+    def _wait_until_cleared(page, timeout: int) -> Optional[bool]:
+        """
+        Block until the challenge is gone using the native wait APIs.
+
+        Playwright evaluates the predicate in-page every animation frame;
+        Selenium polls through WebDriverWait.
+
+        Args:
+            page: Playwright/Selenium page object
+            timeout: Maximum wait time in seconds
+
+        Returns:
+            True if cleared, False on timeout, None if page type unsupported
+        """
+        if hasattr(page, 'wait_for_function'):  # Playwright
+            try:
+                page.wait_for_function(_CHALLENGE_CLEARED_JS, arg=_CHALLENGE_SELECTOR, timeout=timeout * 1000)
+                return True
+            except PlaywrightTimeoutError:
+                return False
+        elif hasattr(page, 'find_elements'):  # Selenium
+            try:
+                WebDriverWait(page, timeout).until(
+                    lambda driver: not CloudflareHandler._challenge_present(driver)
+                )
+                return True
+            except TimeoutException:
+                return False
+        return None
+
+    @staticmethod
+    def _challenge_present(page) -> Optional[bool]:
+        """
+        Check for the challenge with a targeted in-page query.
+
+        Args:
+            page: Playwright/Selenium page object
+
+        Returns:
+            True if challenge still showing, None if page type unsupported
+        """
+        if hasattr(page, 'evaluate'):  # Playwright
+            return page.evaluate(_CHALLENGE_JS, _CHALLENGE_SELECTOR)
+        elif hasattr(page, 'find_elements'):  # Selenium
+            if page.find_elements(By.CSS_SELECTOR, _CHALLENGE_SELECTOR):
+                return True
+            text = page.execute_script(f"return {_PAGE_TEXT_JS};") or ""
+            return _CHALLENGE_PATTERN.search(text) is not None
+        return None
+
+    @staticmethod
+    def detect_cloudflare(html: Union[str, bytes]) -> bool:
         """
         Detect if Cloudflare protection is active.
 
@@ -79,13 +144,4 @@ class CloudflareHandler:
         Returns:
             True if Cloudflare detected
         """
-        cf_indicators = [
-            'cloudflare',
-            'cf-ray',
-            '__cf_bm',
-            'cf_clearance',
-            'cf-challenge',
-        ]
-
-        html_lower = html.lower()
-        return any(indicator in html_lower for indicator in cf_indicators)
\ No newline at end of file
+        return indicator_scanner.TAG_CLOUDFLARE in indicator_scanner.scan(html)
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Indicator Scanner - One pass over page HTML for every CAPTCHA, blocking and
+Cloudflare indicator, shared by CaptchaDetector and CloudflareHandler
+"""
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+# CAPTCHA indicators by type (order decides the primary type)
+CAPTCHA_INDICATORS = {
+    'recaptcha': [
+        'g-recaptcha',
+        'recaptcha',
+        'grecaptcha',
+        'data-sitekey',
+        'rc-anchor',
+    ],
+    'hcaptcha': [
+        'h-captcha',
+        'hcaptcha',
+        'data-hcaptcha',
+    ],
+    'cloudflare': [
+        'cf-challenge',
+        'cf-browser-verification',
+        'cf_chl_opt',
+        'Checking your browser',
+    ],
+    'generic': [
+        'captcha',
+        'challenge',
+        'verification',
+        'prove you are human',
+    ]
+}
+
+# Block / rate-limit pages
+BLOCKING_INDICATORS = [
+    '403 forbidden',
+    'access denied',
+    '429 too many requests',
+    'rate limit exceeded',
+    'temporarily blocked',
+    'unusual traffic',
+    'automated requests',
+]
+
+# Cloudflare protection in front of the site
+CLOUDFLARE_INDICATORS = [
+    'cloudflare',
+    'cf-ray',
+    '__cf_bm',
+    'cf_clearance',
+    'cf-challenge',
+]
+
+# Tags returned by scan() besides the CAPTCHA types
+TAG_BLOCKED = 'blocked'
+TAG_CLOUDFLARE = 'cf'
+
+CAPTCHA_TYPES = tuple(CAPTCHA_INDICATORS)
+
+# Every CAPTCHA indicator contains one of these, so a page matching none
+# of them can skip the CAPTCHA groups entirely
+CAPTCHA_PREFILTER = (
+    b'captcha',
+    b'cf-',
+    b'cf_chl',
+    b'challenge',
+    b'verification',
+    b'sitekey',
+    b'rc-anchor',
+    b'checking your browser',
+    b'prove you are human',
+)
+
+
+def lower_bytes(html: Union[str, bytes]) -> bytes:
+    """
+    Lowercase HTML as bytes for indicator scans.
+
+    bytes.lower() only folds ASCII, which is all the indicators use, and
+    bytes substring search is much cheaper than a Unicode str scan.
+
+    Args:
+        html: HTML content
+
+    Returns:
+        Lowercased bytes
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8', 'ignore')
+    return html.lower()
+
+
+def _lower_indicators(indicators: List[str]) -> Tuple[bytes, ...]:
+    """Pre-lowercase indicator strings as bytes"""
+    return tuple(ind.lower().encode('utf-8') for ind in indicators)
+
+
+# Lowercased once at import, compared against lower_bytes(html)
+INDICATORS_LOWER: Dict[str, Tuple[bytes, ...]] = {
+    **{tag: _lower_indicators(indicators) for tag, indicators in CAPTCHA_INDICATORS.items()},
+    TAG_BLOCKED: _lower_indicators(BLOCKING_INDICATORS),
+    TAG_CLOUDFLARE: _lower_indicators(CLOUDFLARE_INDICATORS),
+}
+
+# (hash(html), tags) of the last scan; callers often pass the same page again
+_last_scan: Tuple[Optional[int], FrozenSet[str]] = (None, frozenset())
+
+
+def scan(html: Union[str, bytes]) -> FrozenSet[str]:
+    """
+    Scan HTML once for all indicator groups.
+
+    Args:
+        html: HTML content
+
+    Returns:
+        Matched tags: CAPTCHA types, TAG_BLOCKED and/or TAG_CLOUDFLARE
+    """
+    global _last_scan
+
+    html_hash = hash(html)
+    if html_hash == _last_scan[0]:
+        return _last_scan[1]
+
+    hb = lower_bytes(html)
+
+    # Fast reject of the CAPTCHA groups for the common clean-page case
+    captcha_possible = any(trigger in hb for trigger in CAPTCHA_PREFILTER)
+
+    tags = frozenset(
+        tag
+        for tag, indicators in INDICATORS_LOWER.items()
+        if (captcha_possible or tag not in CAPTCHA_INDICATORS)
+        and any(hb.find(indicator) != -1 for indicator in indicators)
+    )
+
+    _last_scan = (html_hash, tags)
+    return tags
+
+
+def captcha_types(tags: FrozenSet[str]) -> List[str]:
+    """
+    CAPTCHA types among scan tags, in CAPTCHA_INDICATORS order.
+
+    Args:
+        tags: Result of scan()
+
+    Returns:
+        Ordered list of CAPTCHA types
+    """
+    return [captcha_type for captcha_type in CAPTCHA_TYPES if captcha_type in tags]
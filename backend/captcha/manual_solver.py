@@ -2,23 +2,103 @@
 Manual CAPTCHA Solver - Opens browser for user to solve
 """
 import time
-from typing import Optional
+from typing import Dict, Optional
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from utils.logger import get_logger
+from .captcha_detector import CaptchaDetector
+from .cloudflare_handler import CloudflareHandler
 
 logger = get_logger(__name__)
 
+# Widgets that stay on the page until the CAPTCHA is solved
+_CAPTCHA_SELECTOR = 'iframe[src*="recaptcha"], iframe[src*="hcaptcha"], .g-recaptcha, .h-captcha'
+
+# Types _CAPTCHA_SELECTOR can see; anything else needs a different check
+_SELECTOR_TYPES = frozenset({'recaptcha', 'hcaptcha'})
+
+
+def _page_html(page) -> Optional[str]:
+    """
+    Read the full page HTML.
+
+    Args:
+        page: Playwright/Selenium page object
+
+    Returns:
+        HTML content, None if page type unsupported
+    """
+    if hasattr(page, 'content'):  # Playwright
+        return page.content()
+    elif hasattr(page, 'page_source'):  # Selenium
+        return page.page_source
+    return None
+
+
+def _captcha_present(page) -> Optional[bool]:
+    """
+    Check for a CAPTCHA widget with a targeted in-page query.
+
+    Args:
+        page: Playwright/Selenium page object
+
+    Returns:
+        True if a widget is present, None if page type unsupported
+    """
+    if hasattr(page, 'evaluate'):  # Playwright
+        return page.evaluate("(selector) => !!document.querySelector(selector)", _CAPTCHA_SELECTOR)
+    elif hasattr(page, 'find_elements'):  # Selenium
+        return bool(page.find_elements(By.CSS_SELECTOR, _CAPTCHA_SELECTOR))
+    return None
+
+
+def _wait_until_gone(page, timeout: int) -> Optional[bool]:
+    """
+    Block until the CAPTCHA widget disappears using the native wait APIs.
+
+    Args:
+        page: Playwright/Selenium page object
+        timeout: Maximum wait time in seconds
+
+    Returns:
+        True if gone, False on timeout, None if page type unsupported
+    """
+    if hasattr(page, 'wait_for_function'):  # Playwright
+        try:
+            page.wait_for_function(
+                "(selector) => !document.querySelector(selector)",
+                arg=_CAPTCHA_SELECTOR,
+                timeout=timeout * 1000
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+    elif hasattr(page, 'find_elements'):  # Selenium
+        try:
+            WebDriverWait(page, timeout).until(
+                lambda d: not d.find_elements(By.CSS_SELECTOR, _CAPTCHA_SELECTOR)
+            )
+            return True
+        except TimeoutException:
+            return False
+    return None
+
 
 class ManualCaptchaSolver:
     """Allows user to manually solve CAPTCHAs"""
 
     @staticmethod
-    def solve_with_browser(page, timeout: int = 300) -> bool:
+    def solve_with_browser(page, timeout: int = 300, detection: Optional[Dict] = None) -> bool:
         """
         Open browser for user to solve CAPTCHA manually.
 
         Args:
             page: Playwright/Selenium page object
             timeout: Maximum wait time in seconds (default 5 minutes)
+            detection: Result of a CaptchaDetector call the caller already made
+                (skips re-reading and re-scanning the page)
 
         Returns:
             True if likely solved
@@ -36,24 +116,47 @@ class ManualCaptchaSolver:
                 except Exception:
                     pass
 
+            # Classify once from the full HTML, then poll with cheap in-page checks
+            result = detection
+            if result is None:
+                html = _page_html(page)
+                if html is not None:
+                    result = CaptchaDetector.detect(html)
+
+            if result is not None:
+                if not result['detected']:
+                    logger.info("CAPTCHA appears to be solved!")
+                    return True
+                logger.info(f"Waiting on CAPTCHA type(s): {', '.join(result['types'])}")
+
+                # The widget selector only covers reCAPTCHA/hCaptcha
+                if result['types'] == ['cloudflare']:
+                    return CloudflareHandler.wait_for_challenge(page, timeout)
+                if not set(result['types']) <= _SELECTOR_TYPES:
+                    return ManualCaptchaSolver._poll_detector(page, timeout)
+
+            # Let the browser/driver watch for the change when it can
+            solved = _wait_until_gone(page, timeout)
+            if solved is not None:
+                if solved:
+                    logger.info("CAPTCHA appears to be solved!")
+                    time.sleep(2)  # Wait a bit more to ensure page loads
+                else:
+                    logger.warning(f"CAPTCHA solving timed out after {timeout}s")
+                return solved
+
             start_time = time.time()
             check_interval = 2  # Check every 2 seconds
 
             while time.time() - start_time < timeout:
                 # Check if CAPTCHA is still present
-                if hasattr(page, 'content'):  # Playwright
-                    html = page.content()
-                elif hasattr(page, 'page_source'):  # Selenium
-                    html = page.page_source
-                else:
+                present = _captcha_present(page)
+                if present is None:
                     time.sleep(check_interval)
                     continue
 
                 # Check if CAPTCHA is gone
-                from .captcha_detector import CaptchaDetector
-                result = CaptchaDetector.detect(html)
-
-                if not result['detected']:
+                if not present:
                     logger.info("CAPTCHA appears to be solved!")
                     time.sleep(2)  # Wait a bit more to ensure page loads
                     return True
@@ -68,6 +171,33 @@ class ManualCaptchaSolver:
             logger.error(f"Error during manual CAPTCHA solving: {e}")
             return False
 
+    @staticmethod
+    def _poll_detector(page, timeout: int) -> bool:
+        """
+        Re-scan the full page HTML until no CAPTCHA is detected.
+
+        Args:
+            page: Playwright/Selenium page object
+            timeout: Maximum wait time in seconds
+
+        Returns:
+            True if solved, False on timeout
+        """
+        start_time = time.time()
+        check_interval = 2
+
+        while time.time() - start_time < timeout:
+            time.sleep(check_interval)
+
+            html = _page_html(page)
+            if html is not None and not CaptchaDetector.detect(html)['detected']:
+                logger.info("CAPTCHA appears to be solved!")
+                time.sleep(2)  # Wait a bit more to ensure page loads
+                return True
+
+        logger.warning(f"CAPTCHA solving timed out after {timeout}s")
+        return False
+
     @staticmethod
     def wait_for_user_action(page, message: str = "Press Enter when ready...", timeout: int = 300) -> bool:
         """
@@ -93,15 +223,11 @@ class ManualCaptchaSolver:
                 time.sleep(1)
 
                 # Check if CAPTCHA is solved
-                if hasattr(page, 'content'):
-                    html = page.content()
-                elif hasattr(page, 'page_source'):
-                    html = page.page_source
-                else:
+                present = _captcha_present(page)
+                if present is None:
                     continue
 
-                from .captcha_detector import CaptchaDetector
-                if not CaptchaDetector.detect(html)['detected']:
+                if not present:
                     return True
 
             return False
@@ -0,0 +1,186 @@
+"""
+Pingback Receiver
+Local HTTP endpoint that receives solved CAPTCHA tokens pushed by
+2Captcha (pingback) and Anti-Captcha (callbackUrl), so solvers can wait
+on an event instead of polling the service.
+"""
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Tokens nobody collects (polling won, or unknown IDs) are dropped after this
+RESULT_TTL = 600
+
+
+class _PingbackHandler(BaseHTTPRequestHandler):
+    """Parses pingback requests and hands tokens to the receiver"""
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        self._handle(params)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+
+        if "json" in self.headers.get("Content-Type", ""):
+            try:
+                params = json.loads(body or b"{}")
+            except ValueError:
+                params = {}
+        else:
+            params = {k: v[0] for k, v in parse_qs(body.decode("utf-8", "ignore")).items()}
+
+        self._handle(params)
+
+    def _handle(self, params: Dict):
+        secret = self.server.receiver.secret
+        if secret:
+            query = parse_qs(urlparse(self.path).query)
+            if not hmac.compare_digest(query.get("secret", [""])[0], secret):
+                self.send_response(403)
+                self.end_headers()
+                return
+
+        # 2Captcha: id/code, Anti-Captcha: taskId/solution.gRecaptchaResponse
+        captcha_id = params.get("id") or params.get("taskId")
+        token = params.get("code")
+        if token is None and isinstance(params.get("solution"), dict):
+            token = params["solution"].get("gRecaptchaResponse")
+
+        if captcha_id is not None and token:
+            self.server.receiver.deliver(str(captcha_id), token)
+
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"OK")
+
+    def log_message(self, format, *args):
+        logger.debug(f"Pingback: {format % args}")
+
+
+class PingbackReceiver:
+    """Receives CAPTCHA results pushed by solver services"""
+
+    def __init__(
+        self,
+        public_url: str,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        secret: Optional[str] = None
+    ):
+        """
+        Initialize pingback receiver.
+
+        Args:
+            public_url: URL the solver service can reach this endpoint on
+                (e.g. a tunnel or reverse proxy in front of host:port)
+            host: Interface to bind (use "0.0.0.0" to accept direct
+                connections from the internet, ideally with a secret)
+            port: Port to bind
+            secret: If set, requests must carry it as ?secret=...; it is
+                added to callback_url
+        """
+        self.public_url = public_url
+        self.host = host
+        self.port = port
+        self.secret = secret
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # captcha_id -> (token, monotonic delivery time), oldest first
+        self._results: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._events: Dict[str, threading.Event] = {}
+
+    @property
+    def callback_url(self) -> str:
+        """URL to hand to the solver service (public_url plus the secret)"""
+        if not self.secret:
+            return self.public_url
+        separator = "&" if "?" in self.public_url else "?"
+        return f"{self.public_url}{separator}{urlencode({'secret': self.secret})}"
+
+    def start(self):
+        """Start serving in a background thread"""
+        if self._server:
+            return
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _PingbackHandler)
+        self._server.receiver = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        logger.info(f"Pingback receiver listening on {self.host}:{self.port}")
+
+    def stop(self):
+        """Stop the server"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def deliver(self, captcha_id: str, token: str):
+        """Store token and wake any waiter for this ID"""
+        now = time.monotonic()
+
+        with self._lock:
+            self._results[captcha_id] = (token, now)
+            self._results.move_to_end(captcha_id)
+
+            while self._results:
+                stale_id, (_, delivered_at) = next(iter(self._results.items()))
+                if now - delivered_at <= RESULT_TTL:
+                    break
+                del self._results[stale_id]
+
+            event = self._events.get(captcha_id)
+
+        if event:
+            event.set()
+
+    def wait_for(self, captcha_id, timeout: float) -> Optional[str]:
+        """
+        Block until the token for a CAPTCHA ID arrives.
+
+        Solvers call this once per poll interval; nothing is kept for the
+        ID after it returns, and a token delivered between calls is
+        picked up by the next one.
+
+        Args:
+            captcha_id: Solver task ID
+            timeout: Maximum wait time in seconds
+
+        Returns:
+            Solution token or None on timeout
+        """
+        captcha_id = str(captcha_id)
+
+        with self._lock:
+            entry = self._results.pop(captcha_id, None)
+            if entry:
+                return entry[0]
+            event = self._events.setdefault(captcha_id, threading.Event())
+
+        event.wait(timeout)
+
+        with self._lock:
+            self._events.pop(captcha_id, None)
+            entry = self._results.pop(captcha_id, None)
+        return entry[0] if entry else None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
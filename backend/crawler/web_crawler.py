@@ -4,19 +4,58 @@ Discovers URLs by following links with sitemap support
 """
 import re
 import time
+import asyncio
+import httpx
 import requests
-from typing import List, Optional, Callable, Set, Dict
-from urllib.parse import urljoin, urlparse, urlunparse
-from collections import deque
-from bs4 import BeautifulSoup
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Callable, Set, Dict, Tuple, Union
+from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from lxml import html as lxml_html
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 from utils.logger import get_logger
-from utils.helpers import get_domain
+from utils.helpers import get_domain, url_fingerprint
+from utils.bloom_filter import ScalableBloomFilter
 from backend.stealth.robots_parser import RobotsParser
 
 logger = get_logger(__name__)
 
+# All pagination link shapes in one alternation, matched once per href
+_PAGINATION_RE = re.compile(r'(?:page=\d+|/page/\d+|\?p=\d+|/p\d+|offset=\d+|start=\d+)', re.IGNORECASE)
+
+
+# Parallel fetches for sub-sitemaps listed in a sitemap index
+SITEMAP_FETCH_WORKERS = 16
+
+# Sitemap protocol tags (namespaced, as lxml reports them)
+_SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+_SITEMAP_URL = _SITEMAP_NS + 'url'
+_SITEMAP_SITEMAP = _SITEMAP_NS + 'sitemap'
+_SITEMAP_LOC = _SITEMAP_NS + 'loc'
+
+
+# Statuses that mean "slow down" rather than "broken page"
+RATE_LIMIT_STATUSES = (429, 503)
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_HOST_DELAY = 60.0
+
+# Minimum seconds between progress callbacks
+CALLBACK_INTERVAL = 0.25
+
+
+@lru_cache(maxsize=64)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a URL filter pattern once per distinct pattern string"""
+    return re.compile(pattern)
+
 
 class WebCrawler:
     """Discovers URLs by following links with sitemap support"""
@@ -25,29 +64,62 @@ class WebCrawler:
         self,
         respect_robots: bool = True,
         request_delay: float = 2.0,
-        user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        concurrency: int = 8,
+        large_crawl: bool = False
     ):
         """
         Initialize web crawler.
 
         Args:
             respect_robots: Respect robots.txt rules
-            request_delay: Delay between requests (seconds)
+            request_delay: Delay between requests to the same host (seconds)
             user_agent: User agent string
+            concurrency: Maximum pages fetched in parallel
+            large_crawl: Track seen URLs in a growing Bloom filter (a few bytes per URL,
+                rare false positives skip a link) instead of a set of URL fingerprints
         """
         self.respect_robots = respect_robots
         self.request_delay = request_delay
         self.user_agent = user_agent
+        self.concurrency = max(1, concurrency)
+        self.large_crawl = large_crawl
         self.robots_parser = RobotsParser(respect_robots)
         self.session = requests.Session()
         self.session.headers['User-Agent'] = user_agent
+        self.session.headers['Connection'] = 'keep-alive'
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate, br'
+
+        # Large keep-alive pool so sitemap fan-out reuses connections
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=128,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"]
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
         # State
-        self.seen_urls: Set[str] = set()
+        self.seen_urls: Union[Set[int], ScalableBloomFilter] = set()
         self.matched_urls: List[str] = []
+        self._matched_set: Set[str] = set()
         self.paused = False
         self.stopped = False
 
+        # Async crawl state
+        self._crawled_count = 0
+        self._pages_started = 0
+        self._last_callback_time = 0.0
+        self._host_next_allowed: Dict[str, float] = {}
+        self._host_base_delay: Dict[str, float] = {}
+        self._host_delay: Dict[str, float] = {}
+        self._host_backoff_at: Dict[str, float] = {}
+
     def crawl(
         self,
         start_url: str,
@@ -81,6 +153,7 @@ class WebCrawler:
         # Reset state
         self.seen_urls.clear()
         self.matched_urls.clear()
+        self._matched_set.clear()
         self.paused = False
         self.stopped = False
 
@@ -90,6 +163,7 @@ class WebCrawler:
             if sitemap_urls:
                 logger.info(f"Found {len(sitemap_urls)} URLs from sitemap.xml")
                 self.matched_urls = sitemap_urls[:max_pages]
+                self._matched_set = set(self.matched_urls)
                 if callback:
                     callback({
                         'found': len(sitemap_urls),
@@ -100,92 +174,300 @@ class WebCrawler:
                 return self.matched_urls
 
         # Compile pattern if provided
-        pattern_regex = re.compile(pattern) if pattern else None
+        pattern_regex = _compile_pattern(pattern) if pattern else None
+
+        asyncio.run(self._crawl_async(
+            start_url,
+            max_pages,
+            max_depth,
+            pattern_regex,
+            internal_only,
+            follow_pagination,
+            callback
+        ))
+
+        logger.info(f"Crawl complete. Found {len(self.matched_urls)} matching URLs")
+        return self.matched_urls
+
+    async def _crawl_async(
+        self,
+        start_url: str,
+        max_pages: int,
+        max_depth: int,
+        pattern_regex: Optional[re.Pattern],
+        internal_only: bool,
+        follow_pagination: bool,
+        callback: Optional[Callable[[Dict], None]]
+    ):
+        """
+        BFS crawl with several pages in flight at once.
 
+        Worker tasks share one queue and one keep-alive client; seen_urls needs
+        no lock since everything runs on a single event loop.
+        """
         # BFS queue: (url, depth)
-        queue = deque([(start_url, 0)])
-        self.seen_urls.add(start_url)
-        crawled_count = 0
+        queue: asyncio.Queue = asyncio.Queue()
+        queue.put_nowait((start_url, 0))
+
+        # Starts sized for ~20 discovered links per crawled page and grows
+        # with link-heavy pages; the exact set stores 64-bit fingerprints
+        # rather than URL strings
+        if self.large_crawl:
+            self.seen_urls = ScalableBloomFilter(initial_capacity=max_pages * 20, false_positive_rate=0.001)
+            seen_key = str
+        else:
+            seen_key = url_fingerprint
+
+        self.seen_urls.add(seen_key(start_url))
+        self._crawled_count = 0
+        self._pages_started = 0
+        self._last_callback_time = 0.0
+        self._host_next_allowed.clear()
+        self._host_base_delay.clear()
+        self._host_delay.clear()
+        self._host_backoff_at.clear()
+        rate_limited: Dict[str, int] = {}
         base_domain = get_domain(start_url)
 
-        while queue and crawled_count < max_pages and not self.stopped:
+        async def crawl_page(client: httpx.AsyncClient, current_url: str, depth: int):
             # Handle pause
             while self.paused and not self.stopped:
-                time.sleep(0.1)
+                await asyncio.sleep(0.1)
 
-            if self.stopped:
-                break
+            if self.stopped or self._pages_started >= max_pages:
+                return
 
-            current_url, depth = queue.popleft()
+            # Check depth limit
+            if max_depth != -1 and depth > max_depth:
+                return
 
             # Check if allowed by robots.txt
-            if not self.robots_parser.can_fetch(current_url, self.user_agent):
+            if not await self._can_fetch(current_url):
                 logger.warning(f"Robots.txt blocks {current_url}")
-                continue
+                return
 
-            # Check depth limit
-            if max_depth != -1 and depth > max_depth:
-                continue
+            # Re-check after the await: other workers may have filled the budget
+            if self.stopped or self._pages_started >= max_pages:
+                return
+            self._pages_started += 1
 
             try:
+                # Rate limiting
+                await self._wait_for_host(current_url)
+
                 # Fetch page
                 logger.debug(f"Crawling {current_url} (depth {depth})")
-                response = self.session.get(current_url, timeout=10)
-                response.raise_for_status()
-                crawled_count += 1
+                response = await client.get(current_url)
+
+                # Host is pushing back: slow it down and retry the page later
+                if response.status_code in RATE_LIMIT_STATUSES:
+                    self._pages_started -= 1
+                    self._throttle_host(current_url, response.headers.get('Retry-After'))
 
-                # Extract links
-                soup = BeautifulSoup(response.text, 'html.parser')
-                links = soup.find_all('a', href=True)
+                    rate_limited[current_url] = rate_limited.get(current_url, 0) + 1
+                    if rate_limited[current_url] <= MAX_RATE_LIMIT_RETRIES:
+                        queue.put_nowait((current_url, depth))
+                    else:
+                        logger.warning(f"Giving up on {current_url} after repeated rate limiting")
+                    return
 
-                for link in links:
-                    href = link['href']
-                    absolute_url = urljoin(current_url, href)
-                    absolute_url = self._normalize_url(absolute_url)
+                response.raise_for_status()
+                self._crawled_count += 1
+                self._relax_host(current_url)
 
-                    # Skip if already seen
-                    if absolute_url in self.seen_urls:
-                        continue
+            except Exception as e:
+                self._pages_started -= 1
+                logger.warning(f"Failed to crawl {current_url}: {e}")
+                return
+
+            for href, absolute_url in self._extract_links(response.content, current_url):
+                # Skip if already seen
+                url_key = seen_key(absolute_url)
+                if url_key in self.seen_urls:
+                    continue
+
+                # Check internal only
+                if internal_only and not self._is_internal(absolute_url, base_domain):
+                    continue
+
+                # Check pagination
+                if not follow_pagination and self._is_pagination(href):
+                    continue
+
+                # Mark as seen
+                self.seen_urls.add(url_key)
+
+                # Check pattern match
+                if pattern_regex is None or pattern_regex.search(absolute_url):
+                    if absolute_url not in self._matched_set:
+                        self._matched_set.add(absolute_url)
+                        self.matched_urls.append(absolute_url)
+                        logger.debug(f"Matched: {absolute_url}")
+
+                # Add to queue for further crawling
+                if depth < max_depth or max_depth == -1:
+                    queue.put_nowait((absolute_url, depth + 1))
+
+            # Progress callback (throttled; UI updates cost more than a page)
+            now = time.monotonic()
+            if callback and now - self._last_callback_time >= CALLBACK_INTERVAL:
+                self._last_callback_time = now
+                report_progress()
+
+        def report_progress():
+            callback({
+                'found': len(self.seen_urls),
+                'crawled': self._crawled_count,
+                'matched': len(self.matched_urls),
+                'queue_size': queue.qsize()
+            })
+
+        async def worker(client: httpx.AsyncClient):
+            while True:
+                current_url, depth = await queue.get()
+                try:
+                    await crawl_page(client, current_url, depth)
+                except Exception as e:
+                    logger.warning(f"Failed to crawl {current_url}: {e}")
+                finally:
+                    queue.task_done()
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(
+            headers={'User-Agent': self.user_agent},
+            limits=limits,
+            timeout=10,
+            follow_redirects=True
+        ) as client:
+            workers = [asyncio.create_task(worker(client)) for _ in range(self.concurrency)]
+
+            await queue.join()
+
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        # Final state always reaches the callback
+        if callback:
+            report_progress()
+
+    async def _can_fetch(self, url: str) -> bool:
+        """
+        robots.txt check that only leaves the event loop when it must.
 
-                    # Check internal only
-                    if internal_only and not self._is_internal(absolute_url, base_domain):
-                        continue
+        The first lookup per domain downloads robots.txt, so it runs in a
+        thread; later lookups are a quick in-memory rule match.
+        """
+        if self.robots_parser.is_loaded(url):
+            return self.robots_parser.can_fetch(url, self.user_agent)
+        return await asyncio.to_thread(self.robots_parser.can_fetch, url, self.user_agent)
+
+    def _delay_for_host(self, url: str, host: str) -> float:
+        """Current spacing for a host: request_delay or robots.txt Crawl-delay, plus any backoff"""
+        if host not in self._host_delay:
+            # robots.txt is already loaded by the can_fetch check
+            crawl_delay = self.robots_parser.get_crawl_delay(url, self.user_agent)
+            base_delay = max(self.request_delay, crawl_delay or 0.0)
+            self._host_base_delay[host] = base_delay
+            self._host_delay[host] = base_delay
+
+        return self._host_delay[host]
+
+    def _throttle_host(self, url: str, retry_after: Optional[str] = None):
+        """
+        Back off a host that answered 429/503.
 
-                    # Check pagination
-                    if not follow_pagination and self._is_pagination(href):
-                        continue
+        Doubles the host's spacing (capped at MAX_HOST_DELAY) and holds it
+        until Retry-After, when given in seconds. Responses to requests that
+        were already in flight when the host was last backed off don't
+        double it again.
+        """
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        delay = self._delay_for_host(url, host)
+
+        if now - self._host_backoff_at.get(host, 0.0) >= delay:
+            delay = min(MAX_HOST_DELAY, max(delay * 2, 1.0))
+            self._host_delay[host] = delay
+            self._host_backoff_at[host] = now
+
+        wait = float(retry_after) if retry_after and retry_after.strip().isdigit() else delay
+        self._host_next_allowed[host] = max(
+            self._host_next_allowed.get(host, 0.0),
+            now + min(wait, MAX_HOST_DELAY)
+        )
+
+        logger.warning(f"Rate limited by {host}, spacing requests {delay:.1f}s apart")
+
+    def _relax_host(self, url: str):
+        """Ease a backed-off host's spacing back toward its base delay after a success"""
+        host = urlparse(url).netloc
+        base_delay = self._host_base_delay.get(host)
+        if base_delay is not None and self._host_delay[host] > base_delay:
+            self._host_delay[host] = max(base_delay, self._host_delay[host] * 0.75)
+
+    async def _wait_for_host(self, url: str):
+        """Space requests to the same host by its current delay; other hosts proceed in parallel"""
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        next_allowed = max(now, self._host_next_allowed.get(host, 0.0))
+        self._host_next_allowed[host] = next_allowed + self._delay_for_host(url, host)
+
+        if next_allowed > now:
+            await asyncio.sleep(next_allowed - now)
+
+    def _extract_links(self, html: Union[str, bytes], base_url: str) -> List[Tuple[str, str]]:
+        """
+        Extract links from a page.
 
-                    # Mark as seen
-                    self.seen_urls.add(absolute_url)
+        Args:
+            html: Page HTML (raw bytes)
+            base_url: URL of the page (for resolving relative links)
 
-                    # Check pattern match
-                    if pattern_regex is None or pattern_regex.search(absolute_url):
-                        if absolute_url not in self.matched_urls:
-                            self.matched_urls.append(absolute_url)
-                            logger.debug(f"Matched: {absolute_url}")
+        Returns:
+            (href, normalized absolute URL) pairs
+        """
+        base_href, hrefs = self._parse_hrefs(html)
+        if base_href:
+            base_url = urljoin(base_url, base_href.strip())
+
+        links = []
+        for href in hrefs:
+            # Already-absolute links (the common case) need no urljoin
+            if href.startswith(('http://', 'https://')):
+                absolute_url = href
+            else:
+                absolute_url = urljoin(base_url, href)
+            links.append((href, self._normalize_url(absolute_url)))
+
+        return links
+
+    def _parse_hrefs(self, html: Union[str, bytes]) -> Tuple[Optional[str], List[str]]:
+        """
+        Pull the <base href> and all non-empty anchor hrefs out of a page.
 
-                    # Add to queue for further crawling
-                    if depth < max_depth or max_depth == -1:
-                        queue.append((absolute_url, depth + 1))
+        Only plain strings are needed here, so no BeautifulSoup tree is
+        built: selectolax (Lexbor) when installed, else an lxml XPath.
 
-                # Progress callback
-                if callback:
-                    callback({
-                        'found': len(self.seen_urls),
-                        'crawled': crawled_count,
-                        'matched': len(self.matched_urls),
-                        'queue_size': len(queue)
-                    })
+        Args:
+            html: Page HTML
 
-                # Rate limiting
-                time.sleep(self.request_delay)
+        Returns:
+            (base href or None, hrefs in document order)
+        """
+        if LexborHTMLParser is not None:
+            tree = LexborHTMLParser(html)
+            base = tree.css_first('base[href]')
+            hrefs = [node.attributes.get('href') for node in tree.css('a[href]')]
+            return (base.attributes.get('href') if base else None), [href for href in hrefs if href]
 
-            except Exception as e:
-                logger.warning(f"Failed to crawl {current_url}: {e}")
-                continue
+        try:
+            doc = lxml_html.fromstring(html)
+        except (etree.ParserError, ValueError):
+            return None, []
 
-        logger.info(f"Crawl complete. Found {len(self.matched_urls)} matching URLs")
-        return self.matched_urls
+        base_href = doc.xpath('//base/@href')
+        return (base_href[0] if base_href else None), [href for href in doc.xpath('//a/@href') if href]
 
     def _try_sitemap(self, start_url: str, pattern: Optional[str] = None) -> List[str]:
         """
@@ -203,33 +485,19 @@ class WebCrawler:
 
         try:
             logger.info(f"Trying sitemap at {sitemap_url}")
-            response = self.session.get(sitemap_url, timeout=10)
-            response.raise_for_status()
-
-            # Parse XML
-            root = ET.fromstring(response.content)
-
-            # Handle different sitemap formats
-            urls = []
-
-            # Standard sitemap
-            for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc'):
-                url = url_elem.text
-                if url:
-                    urls.append(url)
+            urls, sub_sitemaps = self._stream_sitemap(sitemap_url)
 
             # Sitemap index (contains other sitemaps)
-            if not urls:
-                for sitemap_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}sitemap'):
-                    loc = sitemap_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-                    if loc is not None and loc.text:
-                        # Recursively fetch sub-sitemap
-                        sub_urls = self._fetch_sitemap_urls(loc.text)
+            if not urls and sub_sitemaps:
+                # Fetch sub-sitemaps in parallel over the pooled session
+                workers = min(SITEMAP_FETCH_WORKERS, len(sub_sitemaps))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for sub_urls in executor.map(self._fetch_sitemap_urls, sub_sitemaps):
                         urls.extend(sub_urls)
 
             # Apply pattern filter
             if pattern:
-                pattern_regex = re.compile(pattern)
+                pattern_regex = _compile_pattern(pattern)
                 urls = [url for url in urls if pattern_regex.search(url)]
 
             logger.info(f"Extracted {len(urls)} URLs from sitemap")
@@ -239,18 +507,49 @@ class WebCrawler:
             logger.debug(f"Failed to parse sitemap: {e}")
             return []
 
+    def _stream_sitemap(self, sitemap_url: str) -> Tuple[List[str], List[str]]:
+        """
+        Stream-parse a sitemap or sitemap index.
+
+        Only the current <url>/<sitemap> entry is kept in memory; each one is
+        cleared, with its already-processed siblings, once its <loc> is read.
+
+        Args:
+            sitemap_url: Sitemap URL
+
+        Returns:
+            (page URLs, sub-sitemap URLs)
+        """
+        response = self.session.get(sitemap_url, timeout=10, stream=True)
+        response.raise_for_status()
+        response.raw.decode_content = True
+
+        urls = []
+        sub_sitemaps = []
+
+        try:
+            for _, elem in etree.iterparse(
+                response.raw,
+                events=('end',),
+                tag=(_SITEMAP_URL, _SITEMAP_SITEMAP),
+                resolve_entities=False
+            ):
+                loc = elem.findtext(_SITEMAP_LOC)
+                if loc:
+                    (urls if elem.tag == _SITEMAP_URL else sub_sitemaps).append(loc.strip())
+
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        finally:
+            response.close()
+
+        return urls, sub_sitemaps
+
     def _fetch_sitemap_urls(self, sitemap_url: str) -> List[str]:
         """Fetch URLs from a specific sitemap"""
         try:
-            response = self.session.get(sitemap_url, timeout=10)
-            response.raise_for_status()
-            root = ET.fromstring(response.content)
-
-            urls = []
-            for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc'):
-                if url_elem.text:
-                    urls.append(url_elem.text)
-
+            urls, _ = self._stream_sitemap(sitemap_url)
             return urls
         except Exception as e:
             logger.warning(f"Failed to fetch sitemap {sitemap_url}: {e}")
@@ -263,19 +562,14 @@ class WebCrawler:
 
     def _is_pagination(self, href: str) -> bool:
         """Detect pagination links"""
-        pagination_patterns = [
-            r'page=\d+',
-            r'/page/\d+',
-            r'\?p=\d+',
-            r'/p\d+',
-            r'offset=\d+',
-            r'start=\d+'
-        ]
-        return any(re.search(pattern, href, re.IGNORECASE) for pattern in pagination_patterns)
+        return _PAGINATION_RE.search(href) is not None
 
     def _normalize_url(self, url: str) -> str:
         """
-        Normalize URL (remove fragments, sort query params).
+        Normalize URL (remove fragment).
+
+        A plain string split instead of a urlparse/urlunparse round trip;
+        this runs for every discovered link.
 
         Args:
             url: URL to normalize
@@ -283,15 +577,7 @@ class WebCrawler:
         Returns:
             Normalized URL
         """
-        parsed = urlparse(url)
-
-        # Remove fragment
-        parsed = parsed._replace(fragment='')
-
-        # Rebuild URL
-        normalized = urlunparse(parsed)
-
-        return normalized
+        return url.partition('#')[0]
 
     def _matches_pattern(self, url: str, pattern: str) -> bool:
         """
@@ -305,7 +591,7 @@ class WebCrawler:
             True if matches
         """
         try:
-            return bool(re.search(pattern, url))
+            return bool(_compile_pattern(pattern).search(url))
         except re.error:
             logger.error(f"Invalid regex pattern: {pattern}")
             return False
@@ -1,9 +1,11 @@
 """
 Category Tree Crawler - Recursively crawl category hierarchies
 """
+import re
 import time
 import random
-from typing import Dict, List, Set, Optional
+from collections import deque
+from typing import Dict, List, Set, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass
 import csv
@@ -11,13 +13,17 @@ from pathlib import Path
 
 from bs4 import BeautifulSoup
 import requests
+import soupsieve
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from utils.logger import get_logger
+from utils.helpers import url_fingerprint
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     """Represents a category in the tree"""
     name: str
@@ -48,6 +54,24 @@ class CategoryTreeCrawler:
     - CSV export with hierarchical structure
     """
 
+    # Common breadcrumb selectors (in order of priority)
+    BREADCRUMB_SELECTOR_LIST = (
+        'nav[aria-label="breadcrumb"] a',
+        '.breadcrumb a',
+        '[itemtype="https://schema.org/BreadcrumbList"] a',
+        'ol.breadcrumb a',
+        '.breadcrumbs a'
+    )
+
+    # Category name selectors (in order of priority)
+    NAME_SELECTOR_LIST = ('h1', '.page-title', '.category-title', 'title')
+
+    # Compiled once instead of per page; the union finds pages without any
+    # breadcrumb in a single tree walk
+    BREADCRUMB_SELECTORS = [soupsieve.compile(selector) for selector in BREADCRUMB_SELECTOR_LIST]
+    BREADCRUMB_ANY = soupsieve.compile(', '.join(BREADCRUMB_SELECTOR_LIST))
+    NAME_SELECTORS = [soupsieve.compile(selector) for selector in NAME_SELECTOR_LIST]
+
     def __init__(
         self,
         base_url: str,
@@ -71,6 +95,9 @@ class CategoryTreeCrawler:
         self.base_url = base_url.rstrip('/')
         self.start_paths = start_paths or ["/"]
         self.path_patterns = path_patterns or ["/t/", "/cl/"]
+        # All path patterns as one alternation, matched once per link
+        self._path_re = re.compile('|'.join(re.escape(pattern) for pattern in self.path_patterns))
+        self._base_netloc = urlparse(self.base_url).netloc
         self.max_depth = max_depth
         self.timeout = timeout
 
@@ -80,7 +107,7 @@ class CategoryTreeCrawler:
         self.last_request_time = 0
 
         # Tracking
-        self.visited_urls: Set[str] = set()
+        self.visited_urls: Set[int] = set()  # url_fingerprint() values
         self.categories: List[Category] = []
 
         # Session with headers
@@ -95,6 +122,21 @@ class CategoryTreeCrawler:
             'Upgrade-Insecure-Requests': '1'
         })
 
+        # Keep-alive pool; transient 5xx retried by urllib3, 429 handled in _fetch_with_retry
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=128,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"],
+                raise_on_status=False
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
     def _wait_with_rate_limit(self):
         """Wait to respect rate limiting with jitter"""
         elapsed = time.time() - self.last_request_time
@@ -103,7 +145,7 @@ class CategoryTreeCrawler:
             jitter = random.uniform(0, sleep_time * 0.1)  # Add 10% jitter
             time.sleep(sleep_time + jitter)
 
-    def _fetch_with_retry(self, url: str, max_retries: int = 5) -> Optional[str]:
+    def _fetch_with_retry(self, url: str, max_retries: int = 5) -> Optional[bytes]:
         """
         Fetch URL with exponential backoff on 429.
 
@@ -112,7 +154,7 @@ class CategoryTreeCrawler:
             max_retries: Maximum retry attempts
 
         Returns:
-            HTML content or None
+            Raw HTML bytes (the parser detects the encoding) or None
         """
         retry_count = 0
         backoff = 1.0
@@ -126,7 +168,7 @@ class CategoryTreeCrawler:
                 self.last_request_time = time.time()
 
                 if response.status_code == 200:
-                    return response.text
+                    return response.content
 
                 elif response.status_code == 429:
                     # Rate limited - check Retry-After header
@@ -163,17 +205,13 @@ class CategoryTreeCrawler:
         """
         breadcrumbs = []
 
-        # Common breadcrumb selectors
-        selectors = [
-            'nav[aria-label="breadcrumb"] a',
-            '.breadcrumb a',
-            '[itemtype="https://schema.org/BreadcrumbList"] a',
-            'ol.breadcrumb a',
-            '.breadcrumbs a'
-        ]
-
-        for selector in selectors:
-            elements = soup.select(selector)
+        # Most pages have no breadcrumb at all
+        if self.BREADCRUMB_ANY.select_one(soup) is None:
+            return breadcrumbs
+
+        # Per-selector pass keeps the priority order when several match
+        for selector in self.BREADCRUMB_SELECTORS:
+            elements = selector.select(soup)
             if elements:
                 breadcrumbs = [elem.get_text(strip=True) for elem in elements]
                 # Remove "Home" or similar
@@ -195,11 +233,11 @@ class CategoryTreeCrawler:
         """
         links = []
 
-        for link in soup.find_all('a', href=True):
+        for link in soup.select('a[href]'):
             href = link['href']
 
             # Check if link matches our patterns
-            if any(pattern in href for pattern in self.path_patterns):
+            if self._path_re.search(href):
                 # Convert to absolute URL
                 absolute_url = urljoin(current_url, href)
 
@@ -208,7 +246,7 @@ class CategoryTreeCrawler:
                 clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
 
                 # Only include if from same domain
-                if parsed.netloc == urlparse(self.base_url).netloc:
+                if parsed.netloc == self._base_netloc:
                     links.append(clean_url)
 
         return list(set(links))  # Remove duplicates
@@ -225,10 +263,8 @@ class CategoryTreeCrawler:
             Category name
         """
         # Try various selectors
-        selectors = ['h1', '.page-title', '.category-title', 'title']
-
-        for selector in selectors:
-            element = soup.select_one(selector)
+        for selector in self.NAME_SELECTORS:
+            element = selector.select_one(soup)
             if element:
                 name = element.get_text(strip=True)
                 # Clean up title tags
@@ -244,32 +280,36 @@ class CategoryTreeCrawler:
 
         return "Unknown"
 
-    def _crawl_url(self, url: str, parent_path: List[str], depth: int):
+    def _crawl_url(self, url: str, parent_path: List[str], depth: int) -> List[Tuple[str, List[str], int]]:
         """
-        Recursively crawl a URL.
+        Crawl a single URL.
 
         Args:
             url: URL to crawl
             parent_path: Parent category path
             depth: Current depth
+
+        Returns:
+            Child work items as (url, parent_path, depth)
         """
         # Check depth limit
         if depth > self.max_depth:
-            return
+            return []
 
         # Check if already visited
-        if url in self.visited_urls:
-            return
+        url_key = url_fingerprint(url)
+        if url_key in self.visited_urls:
+            return []
 
-        self.visited_urls.add(url)
+        self.visited_urls.add(url_key)
 
         # Fetch page
         html = self._fetch_with_retry(url)
         if not html:
-            return
+            return []
 
         # Parse HTML
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
 
         # Extract category name
         category_name = self._extract_category_name(soup, url)
@@ -297,10 +337,9 @@ class CategoryTreeCrawler:
         links = self._extract_category_links(soup, url)
         logger.info(f"Found {len(links)} category links")
 
-        # Crawl child categories
+        # Child categories are queued by crawl()
         new_parent_path = parent_path + [category_name]
-        for link in links:
-            self._crawl_url(link, new_parent_path, depth + 1)
+        return [(link, new_parent_path, depth + 1) for link in links]
 
     def crawl(self) -> List[Category]:
         """
@@ -315,10 +354,14 @@ class CategoryTreeCrawler:
         logger.info(f"Max depth: {self.max_depth}")
         logger.info(f"Rate limit: {60.0/self.min_delay:.1f} requests/min")
 
-        for start_path in self.start_paths:
-            start_url = self.base_url + start_path
-            logger.info(f"Crawling from: {start_url}")
-            self._crawl_url(start_url, [], 1)
+        # Breadth-first work queue of (url, parent_path, depth) instead of recursion
+        work = deque((self.base_url + start_path, [], 1) for start_path in self.start_paths)
+
+        while work:
+            url, parent_path, depth = work.popleft()
+            if depth == 1:
+                logger.info(f"Crawling from: {url}")
+            work.extend(self._crawl_url(url, parent_path, depth))
 
         logger.info(f"Crawl complete. Discovered {len(self.categories)} categories")
         return self.categories
@@ -341,27 +384,19 @@ class CategoryTreeCrawler:
         headers = [f"level_{i}" for i in range(1, max_depth + 1)]
         headers += ["depth", "full_path", "url"]
 
-        # Write CSV
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f, delimiter='|')
-            writer.writerow(headers)
-
-            for category in sorted(self.categories, key=lambda c: (c.depth, c.full_path)):
-                row = []
-
-                # Fill level columns
-                path_parts = category.parent_path + [category.name]
-                for i in range(max_depth):
-                    if i < len(path_parts):
-                        row.append(path_parts[i])
-                    else:
-                        row.append('')
+        # Evaluate full_path once per category instead of on every sort comparison
+        rows = [(category.depth, category.full_path, category) for category in self.categories]
+        rows.sort(key=lambda row: (row[0], row[1]))
 
-                # Add metadata
-                row.append(category.depth)
-                row.append(category.full_path)
-                row.append(category.url)
+        def csv_row(depth: int, full_path: str, category: Category) -> list:
+            # Level columns padded to max_depth, then metadata
+            path_parts = category.parent_path + [category.name]
+            return path_parts + [''] * (max_depth - len(path_parts)) + [depth, full_path, category.url]
 
-                writer.writerow(row)
+        # Write CSV through a 1 MB buffer
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f, delimiter='|')
+            writer.writerow(headers)
+            writer.writerows(csv_row(*row) for row in rows)
 
         logger.info(f"Exported {len(self.categories)} categories to {output_path}")
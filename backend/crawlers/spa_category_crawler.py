@@ -3,43 +3,124 @@ SPA Category Tree Crawler
 Async crawler for Single Page Applications with API interception
 """
 import asyncio
+import hashlib
+import io
 import json
-import time
+import os
+import re
 import random
-from typing import Dict, List, Set, Optional, Any
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Set, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 from urllib.parse import urljoin, urlparse, parse_qs
 import csv
+import orjson
 
 try:
     import httpx
 except ImportError:
     raise ImportError("httpx required: pip install httpx")
 
-from playwright.async_api import async_playwright, Route, Request, Page
+# Same httpx API on top of aiohttp's connector, which holds up better under
+# many concurrent requests; optional
+try:
+    from httpx_aiohttp import HttpxAiohttpClient as AsyncClient
+except ImportError:
+    AsyncClient = httpx.AsyncClient
+
+from playwright.async_api import async_playwright, BrowserContext, Playwright, Route, Request, Page
+from config.settings import BROWSER_PROFILES_DIR, CACHE_DIR
+from backend.stealth.rate_limiter import AsyncTokenBucket
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Requests routed through _intercept_api_calls during recon. Everything
+# else bypasses the handler, so Chromium keeps its HTTP cache for
+# scripts, styles and images (a catch-all route disables it).
+_BLOCK_ROUTE = re.compile(
+    r"taboola\.com|doubleclick\.net|google-analytics\.com|googletagmanager\.com|facebook\.net|adservice\.google"
+)
+_API_ROUTE = re.compile(r"/api/|\.json")
+
+# Static assets aborted on recon/fallback pages: category links and API
+# calls don't need them, and fewer requests lets networkidle fire sooner.
+# Matched by extension so scripts still bypass the handler (and keep the
+# HTTP cache); the resource-type check covers extensionless assets that
+# reach the handler through the other routes.
+_ASSET_ROUTE = re.compile(
+    r"\.(?:png|jpe?g|gif|webp|avif|svg|ico|bmp|woff2?|ttf|otf|eot|mp4|webm|mp3|ogg|css)(?:[?#]|$)",
+    re.IGNORECASE
+)
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Endpoint kind by URL keyword (one scan instead of per-keyword checks)
+_ENDPOINT_RE = re.compile(r"category|/cat|product", re.IGNORECASE)
+_ENDPOINT_KINDS = {"category": "categories", "/cat": "categories", "product": "products"}
+
+# Request headers worth replaying on direct API calls
+API_HEADER_KEYS = ("accept", "accept-language", "x-api-key", "x-locale")
+
+# Statuses worth retrying; any other non-200 is final
+RETRY_STATUSES = (429, 502, 503, 504)
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+BACKOFF_JITTER = 0.5
+
+
+def _backoff_delay(attempt: int) -> float:
+    """base * 2^attempt capped at BACKOFF_CAP, plus up to 50% jitter"""
+    return min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)) * (1 + random.uniform(0, BACKOFF_JITTER))
+
+
+# Discovered endpoints/headers are reused from disk for this long
+DISCOVERY_CACHE_TTL = 3600
+
+# Above this many categories export_to_csv formats rows in worker processes
+PARALLEL_EXPORT_THRESHOLD = 50000
+EXPORT_CHUNK_SIZE = 10000
+
 
-@dataclass
+def _format_chunk(chunk: List[Tuple], max_depth: int) -> str:
+    """
+    Format exported categories as '|'-delimited CSV text.
+
+    Module-level so ProcessPoolExecutor can pickle it.
+
+    Args:
+        chunk: (parent_names, name, depth, full_path, url, id) tuples
+        max_depth: Number of level columns
+
+    Returns:
+        CSV text for the chunk
+    """
+    buf = io.StringIO()
+    csv.writer(buf, delimiter='|').writerows(
+        parent_names + [name] + [''] * (max_depth - 1 - len(parent_names))
+        + [depth, full_path, url, category_id]
+        for parent_names, name, depth, full_path, url, category_id in chunk
+    )
+    return buf.getvalue()
+
+
+@dataclass(slots=True)
 class Category:
-    """Category with hierarchy"""
+    """Category with hierarchy (path fields are fixed at creation)"""
     id: str
     name: str
     url: str
     level: int
     parent_ids: List[str] = field(default_factory=list)
     parent_names: List[str] = field(default_factory=list)
+    full_path: str = field(init=False)
+    depth: int = field(init=False)
 
-    @property
-    def full_path(self) -> str:
-        return " > ".join(self.parent_names + [self.name])
-
-    @property
-    def depth(self) -> int:
-        return len(self.parent_ids) + 1
+    def __post_init__(self):
+        self.full_path = " > ".join(self.parent_names + [self.name])
+        self.depth = len(self.parent_ids) + 1
 
 
 class SPACategoryCrawler:
@@ -59,7 +140,9 @@ class SPACategoryCrawler:
         headless: bool = True,
         max_depth: int = 5,
         requests_per_second: float = 0.5,
-        timeout: int = 30
+        timeout: int = 30,
+        user_data_dir: Optional[Path] = None,
+        max_concurrent: int = 10
     ):
         """
         Initialize crawler.
@@ -70,15 +153,25 @@ class SPACategoryCrawler:
             max_depth: Maximum category depth
             requests_per_second: Rate limit (QPS)
             timeout: Request timeout
+            user_data_dir: Browser profile directory (keeps the HTTP cache
+                between runs; defaults to one per site under data/browser_profiles)
+            max_concurrent: Maximum API requests in flight (also the pool size)
         """
         self.base_url = base_url.rstrip('/')
         self.headless = headless
         self.max_depth = max_depth
         self.timeout = timeout
+        self.max_concurrent = max(1, max_concurrent)
+        self._sem = asyncio.Semaphore(self.max_concurrent)
+        self.user_data_dir = user_data_dir or BROWSER_PROFILES_DIR / urlparse(self.base_url).netloc.replace(':', '_')
+
+        # Browser shared by recon and DOM fallback
+        self._playwright: Optional[Playwright] = None
+        self._context: Optional[BrowserContext] = None
 
         # Rate limiting
         self.min_delay = 1.0 / requests_per_second
-        self.last_request_time = 0
+        self._limiter = AsyncTokenBucket(requests_per_second)
 
         # Tracking
         self.categories: List[Category] = []
@@ -88,15 +181,57 @@ class SPACategoryCrawler:
         # API patterns discovered during recon
         self.api_endpoints: Dict[str, str] = {}
         self.api_headers: Dict[str, str] = {}
+        self._discovery_cache_path = CACHE_DIR / f"api_discovery_{hashlib.md5(self.base_url.encode()).hexdigest()}.json"
+
+    async def start(self):
+        """Launch the shared persistent browser context (no-op if running)"""
+        if self._context:
+            return
+
+        self._playwright = await async_playwright().start()
+        self._context = await self._playwright.chromium.launch_persistent_context(
+            str(self.user_data_dir),
+            headless=self.headless,
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            locale="en-GB",
+            viewport={"width": 1920, "height": 1080}
+        )
+
+    async def close(self):
+        """Close the browser context and Playwright"""
+        if self._context:
+            await self._context.close()
+            self._context = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
 
-    async def _rate_limit(self):
-        """Async rate limiting with jitter"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_delay:
-            sleep_time = self.min_delay - elapsed
-            jitter = random.uniform(0, sleep_time * 0.1)
-            await asyncio.sleep(sleep_time + jitter)
-        self.last_request_time = time.time()
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _create_api_client(self) -> httpx.AsyncClient:
+        """
+        Create the keep-alive client for API crawling (one per crawl).
+
+        The pool matches max_concurrent, the semaphore in _fetch_json_with_retry.
+
+        Returns:
+            httpx-compatible async client (aiohttp transport when available)
+        """
+        return AsyncClient(
+            headers=self.api_headers,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrent,
+                max_keepalive_connections=self.max_concurrent,
+                keepalive_expiry=30
+            ),
+            timeout=self.timeout,
+            follow_redirects=True
+        )
 
     async def _fetch_json_with_retry(
         self,
@@ -106,7 +241,8 @@ class SPACategoryCrawler:
         max_retries: int = 5
     ) -> Optional[Dict]:
         """
-        Fetch JSON with exponential backoff.
+        Fetch JSON, retrying 429/5xx gateway errors and network errors with
+        capped, jittered exponential backoff.
 
         Args:
             client: HTTP client
@@ -117,108 +253,124 @@ class SPACategoryCrawler:
         Returns:
             JSON response or None
         """
-        retry_count = 0
-
-        while retry_count < max_retries:
-            await self._rate_limit()
-
-            try:
-                response = await client.get(
-                    url,
-                    params=params,
-                    headers=self.api_headers,
-                    timeout=self.timeout
-                )
-
-                if response.status_code == 200:
-                    return response.json()
-
-                elif response.status_code == 429:
-                    retry_after = response.headers.get('Retry-After', '5')
-                    wait_time = float(retry_after)
-                    logger.warning(f"Rate limited (429). Waiting {wait_time}s")
+        # Bounded to the connection pool size so queued requests wait here
+        # instead of piling up on the pool
+        async with self._sem:
+            for attempt in range(max_retries):
+                await self._limiter.acquire()
+
+                try:
+                    response = await client.get(
+                        url,
+                        params=params,
+                        headers=self.api_headers,
+                        timeout=self.timeout
+                    )
+                except httpx.HTTPError as e:
+                    # Network errors are recoverable
+                    wait_time = _backoff_delay(attempt)
+                    logger.warning(f"Request error: {e}. Backoff {wait_time:.1f}s")
                     await asyncio.sleep(wait_time)
-                    retry_count += 1
-
-                elif response.status_code == 503:
-                    backoff = 2 ** retry_count
-                    logger.warning(f"Service unavailable (503). Backoff {backoff}s")
-                    await asyncio.sleep(backoff)
-                    retry_count += 1
+                    continue
 
-                else:
+                if response.status_code == 200:
+                    try:
+                        # orjson parses the body bytes directly, no str decode
+                        return orjson.loads(response.content)
+                    except ValueError as e:
+                        logger.error(f"Invalid JSON from {url}: {e}")
+                        return None
+
+                if response.status_code not in RETRY_STATUSES:
+                    # Other 4xx/5xx won't change on retry
                     logger.error(f"HTTP {response.status_code} for {url}")
                     return None
 
-            except Exception as e:
-                logger.error(f"Request error: {e}")
-                retry_count += 1
-                await asyncio.sleep(2 ** retry_count)
+                retry_after = response.headers.get('Retry-After', '')
+                if response.status_code == 429 and retry_after.isdigit():
+                    wait_time = min(float(retry_after), BACKOFF_CAP)
+                else:
+                    wait_time = _backoff_delay(attempt)
+
+                logger.warning(f"HTTP {response.status_code} for {url}. Waiting {wait_time:.1f}s")
+                await asyncio.sleep(wait_time)
 
-        logger.error(f"Max retries exceeded for {url}")
-        return None
+            logger.error(f"Max retries exceeded for {url}")
+            return None
 
     async def _intercept_api_calls(self, route: Route, request: Request):
         """Intercept XHR/Fetch to discover API patterns"""
-        # Block analytics/tracking to speed up
-        BLOCK_DOMAINS = (
-            "taboola.com", "doubleclick.net", "google-analytics.com",
-            "googletagmanager.com", "facebook.net", "adservice.google"
-        )
+        url = request.url
 
-        if any(blocked in request.url for blocked in BLOCK_DOMAINS):
+        # Block heavy assets and analytics/tracking to speed up
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or _BLOCK_ROUTE.search(url):
             await route.abort()
             return
 
         if request.resource_type in ("xhr", "fetch"):
-            url = request.url
-
             # Log API call
             logger.debug(f"API: [{request.method}] {url}")
 
             # Extract patterns
-            if "/api/" in url or ".json" in url:
-                parsed = urlparse(url)
+            if _API_ROUTE.search(url):
+                kinds = {_ENDPOINT_KINDS[match.group(0).lower()] for match in _ENDPOINT_RE.finditer(url)}
 
                 # Store base patterns
-                if "category" in url.lower() or "/cat" in url:
-                    self.api_endpoints["categories"] = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-
-                if "product" in url.lower():
-                    self.api_endpoints["products"] = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+                if kinds:
+                    parsed = urlparse(url)
+                    endpoint = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+                    for kind in kinds:
+                        self.api_endpoints[kind] = endpoint
 
                 # Store headers
-                for key in ["accept", "accept-language", "x-api-key", "x-locale"]:
-                    if key in request.headers:
-                        self.api_headers[key] = request.headers[key]
+                headers = request.headers
+                for key in API_HEADER_KEYS:
+                    if key in headers:
+                        self.api_headers[key] = headers[key]
 
         await route.fallback()
 
+    async def _install_routes(self, page: Page):
+        """
+        Route only what needs handling: assets, trackers and API calls.
+
+        Everything else bypasses the handler, so Chromium keeps its HTTP
+        cache for scripts (a catch-all route disables it).
+
+        Args:
+            page: Page to install the routes on
+        """
+        await page.route(_ASSET_ROUTE, self._intercept_api_calls)
+        await page.route(_BLOCK_ROUTE, self._intercept_api_calls)
+        await page.route(_API_ROUTE, self._intercept_api_calls)
+
     async def _discover_api_with_playwright(self) -> Dict[str, Any]:
         """
         Use Playwright to discover API endpoints.
 
+        A result cached by a run within DISCOVERY_CACHE_TTL is reused
+        without launching the browser.
+
         Returns:
             Dictionary with API patterns and headers
         """
+        cached = self._load_discovery_cache()
+        if cached:
+            logger.info(f"Using cached API endpoints: {list(self.api_endpoints.keys())}")
+            return cached
+
         logger.info("Starting API reconnaissance with Playwright...")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                locale="en-GB",
-                viewport={"width": 1920, "height": 1080}
-            )
-            page = await context.new_page()
+        await self.start()
+        page = await self._context.new_page()
 
-            # Setup interception
-            await page.route("**/*", self._intercept_api_calls)
+        try:
+            # Setup interception (blocked assets/trackers and API calls only)
+            await self._install_routes(page)
 
             # Navigate and explore
             logger.info(f"Loading {self.base_url}...")
             await page.goto(self.base_url, wait_until="networkidle")
-            await asyncio.sleep(2)
 
             # Click on categories
             try:
@@ -227,20 +379,48 @@ class SPACategoryCrawler:
                     logger.info(f"Found {len(category_links)} category links, clicking first...")
                     await category_links[0].click()
                     await page.wait_for_load_state("networkidle")
-                    await asyncio.sleep(2)
             except Exception as e:
                 logger.warning(f"Category click failed: {e}")
 
-            await browser.close()
+        finally:
+            await page.close()
 
         logger.info(f"Discovered {len(self.api_endpoints)} API endpoints")
         logger.info(f"Endpoints: {list(self.api_endpoints.keys())}")
 
-        return {
+        discovery = {
             "endpoints": self.api_endpoints,
             "headers": self.api_headers
         }
 
+        # Only successful recon is cached; an empty result retries next run
+        if self.api_endpoints:
+            try:
+                self._discovery_cache_path.write_bytes(orjson.dumps(discovery))
+            except OSError as e:
+                logger.warning(f"Could not cache API discovery: {e}")
+
+        return discovery
+
+    def _load_discovery_cache(self) -> Optional[Dict[str, Any]]:
+        """
+        Load endpoints/headers from a previous recon of this site.
+
+        Returns:
+            Discovery dict, or None if missing, stale or unreadable
+        """
+        path = self._discovery_cache_path
+        try:
+            if time.time() - path.stat().st_mtime >= DISCOVERY_CACHE_TTL:
+                return None
+            discovery = orjson.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+        self.api_endpoints = discovery["endpoints"]
+        self.api_headers = discovery["headers"]
+        return discovery
+
     async def _crawl_with_playwright_fallback(self, url: str) -> List[Category]:
         """
         Fallback: crawl via DOM rendering when API unavailable.
@@ -255,10 +435,11 @@ class SPACategoryCrawler:
 
         categories = []
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            page = await browser.new_page()
+        await self.start()
+        page = await self._context.new_page()
 
+        try:
+            await self._install_routes(page)
             await page.goto(url, wait_until="networkidle")
 
             # Scroll to trigger lazy loading
@@ -308,10 +489,118 @@ class SPACategoryCrawler:
 
                     break  # Stop after first working selector
 
-            await browser.close()
+        finally:
+            await page.close()
 
         return categories
 
+    def _parse_api_categories(self, data: Any) -> List[Dict[str, str]]:
+        """
+        Pull category entries out of an API response.
+
+        Handles the common shapes: a list of objects, or an object holding
+        one under categories/children/items/data/results. Override for
+        sites with a different schema.
+
+        Args:
+            data: Decoded JSON response
+
+        Returns:
+            List of {"id", "name", "url"} dicts
+        """
+        if isinstance(data, dict):
+            for key in ("categories", "children", "items", "data", "results"):
+                if isinstance(data.get(key), list):
+                    data = data[key]
+                    break
+
+        if not isinstance(data, list):
+            return []
+
+        entries = []
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+
+            cat_id = item.get("id") or item.get("categoryId")
+            name = item.get("name") or item.get("title")
+            if cat_id is None or not name:
+                continue
+
+            href = item.get("url") or item.get("path") or item.get("href") or ""
+            entries.append({"id": str(cat_id), "name": str(name).strip(), "url": href})
+
+        return entries
+
+    def _add_api_children(self, data: Any, parent: Optional[Category], stack: List[Category]):
+        """
+        Record categories from a response and push the expandable ones.
+
+        IDs are marked seen at push time, so a category reachable from
+        several parents is queued once.
+
+        Args:
+            data: Decoded JSON response (children of parent)
+            parent: Parent category, None for the top level
+            stack: DFS worklist
+        """
+        parent_ids = parent.parent_ids + [parent.id] if parent else []
+        parent_names = parent.parent_names + [parent.name] if parent else []
+
+        for entry in self._parse_api_categories(data):
+            if entry["id"] in self.seen_category_ids:
+                continue
+            self.seen_category_ids.add(entry["id"])
+
+            category = Category(
+                id=entry["id"],
+                name=entry["name"],
+                url=urljoin(self.base_url, entry["url"]) if entry["url"] else self.base_url,
+                level=len(parent_ids) + 1,
+                parent_ids=parent_ids,
+                parent_names=parent_names
+            )
+            self.categories.append(category)
+
+            if category.depth < self.max_depth:
+                stack.append(category)
+
+    async def _crawl_api(self) -> List[Category]:
+        """
+        Walk the category tree through the discovered categories endpoint.
+
+        Depth-first: the worklist holds the open branch plus its pending
+        siblings instead of a whole tree level, which for wide, shallow
+        category trees keeps it far smaller than a BFS queue. Up to
+        max_concurrent nodes are popped and fetched together.
+
+        Returns:
+            List of categories (empty if the endpoint yields none)
+        """
+        endpoint = self.api_endpoints.get("categories")
+        if not endpoint:
+            return []
+
+        self.categories = []
+        stack: List[Category] = []
+
+        async with self._create_api_client() as client:
+            self._add_api_children(await self._fetch_json_with_retry(client, endpoint), None, stack)
+
+            while stack:
+                batch = [stack.pop() for _ in range(min(self.max_concurrent, len(stack)))]
+                responses = await asyncio.gather(*(
+                    self._fetch_json_with_retry(client, endpoint, params={"parentId": category.id})
+                    for category in batch
+                ))
+
+                for category, data in zip(batch, responses):
+                    self._add_api_children(data, category, stack)
+
+                logger.info(f"API crawl: {len(self.categories)} categories, {len(stack)} pending")
+
+        return self.categories
+
     async def crawl(self) -> List[Category]:
         """
         Start crawling.
@@ -322,16 +611,27 @@ class SPACategoryCrawler:
         logger.info(f"Starting SPA category crawl: {self.base_url}")
         logger.info(f"Max depth: {self.max_depth}, QPS: {1/self.min_delay:.2f}")
 
+        # Outside "async with", the browser lives for this crawl only
+        owns_browser = self._context is None
+        try:
+            return await self._crawl()
+        finally:
+            if owns_browser:
+                await self.close()
+
+    async def _crawl(self) -> List[Category]:
+        """Recon, then API or DOM crawl, on the shared browser context"""
         # Step 1: Discover API endpoints
         await self._discover_api_with_playwright()
 
         # Step 2: If API endpoints found, use httpx; else fallback to Playwright
         if self.api_endpoints:
             logger.info("Using API-based crawling...")
-            # TODO: Implement API crawling once endpoints are known
-            # For now, this would require specific API endpoint knowledge
-            logger.warning("API crawling not yet implemented - falling back to DOM")
-            self.categories = await self._crawl_with_playwright_fallback(self.base_url)
+            self.categories = await self._crawl_api()
+
+            if not self.categories:
+                logger.warning("API crawl found no categories - falling back to DOM")
+                self.categories = await self._crawl_with_playwright_fallback(self.base_url)
         else:
             logger.info("No API endpoints found - using DOM rendering fallback")
             self.categories = await self._crawl_with_playwright_fallback(self.base_url)
@@ -350,30 +650,31 @@ class SPACategoryCrawler:
             logger.warning("No categories to export")
             return
 
-        max_depth = max((cat.depth for cat in self.categories), default=1)
+        categories = sorted(self.categories, key=lambda c: (c.depth, c.full_path))
+        max_depth = max((c.depth for c in categories), default=1)
 
         headers = [f"level_{i}" for i in range(1, max_depth + 1)]
         headers += ["depth", "full_path", "url", "category_id"]
 
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        workers = os.cpu_count() or 1
+
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f, delimiter='|')
             writer.writerow(headers)
 
-            for category in sorted(self.categories, key=lambda c: (c.depth, c.full_path)):
-                row = []
-
-                # Fill level columns
-                path_parts = category.parent_names + [category.name]
-                for i in range(max_depth):
-                    row.append(path_parts[i] if i < len(path_parts) else '')
-
-                row.extend([
-                    category.depth,
-                    category.full_path,
-                    category.url,
-                    category.id
-                ])
-
-                writer.writerow(row)
+            if len(categories) > PARALLEL_EXPORT_THRESHOLD and workers > 1:
+                # Rows format independently; plain tuples pickle cheaply and
+                # map() hands the CSV text back in chunk order
+                rows = [(c.parent_names, c.name, c.depth, c.full_path, c.url, c.id) for c in categories]
+                chunks = [rows[i:i + EXPORT_CHUNK_SIZE] for i in range(0, len(rows), EXPORT_CHUNK_SIZE)]
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for text in executor.map(partial(_format_chunk, max_depth=max_depth), chunks):
+                        f.write(text)
+            else:
+                writer.writerows(
+                    c.parent_names + [c.name] + [''] * (max_depth - 1 - len(c.parent_names))
+                    + [c.depth, c.full_path, c.url, c.id]
+                    for c in categories
+                )
 
         logger.info(f"Exported {len(self.categories)} categories to {output_path}")
@@ -2,8 +2,10 @@
 Data Exporter
 Centralized export logic for CSV, JSON, Excel formats
 """
-import pandas as pd
+import csv
+import importlib.util
 import json
+import orjson
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -11,6 +13,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Streaming xlsx writer; openpyxl (via pandas) is the fallback
+XLSXWRITER_AVAILABLE = importlib.util.find_spec("xlsxwriter") is not None
+
+
+def __getattr__(name: str):
+    """Keep data_exporter.pd working for old importers without a module-level pandas import"""
+    if name == "pd":
+        import pandas
+        return pandas
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _validated_rows(data: List[Dict]):
+    """Yield rows, raising ValueError on the first one that is not a dict"""
+    for row in data:
+        if not isinstance(row, dict):
+            raise ValueError("All items must be dictionaries")
+        yield row
+
 
 class DataExporter:
     """Handles data export to various formats"""
@@ -39,6 +60,31 @@ class DataExporter:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"{base_name}_{timestamp}{extension}"
 
+    def _write_json(self, obj, file_path: Path, indent: int = 2, ensure_ascii: bool = False):
+        """
+        Write JSON, via orjson for the default 2-space, non-ASCII-preserving
+        layout; other settings go through the stdlib encoder.
+
+        Args:
+            obj: Object to serialize
+            file_path: Target file path
+            indent: JSON indentation
+            ensure_ascii: Force ASCII encoding
+        """
+        if indent == 2 and not ensure_ascii:
+            try:
+                payload = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # Types orjson rejects (e.g. ints beyond 64 bits)
+                pass
+            else:
+                with open(file_path, 'wb') as f:
+                    f.write(payload)
+                return
+
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=indent, ensure_ascii=ensure_ascii)
+
     def export_csv(
         self,
         data: List[Dict],
@@ -64,11 +110,14 @@ class DataExporter:
             filename = self._generate_filename("scraped_data", ".csv")
             file_path = self.default_dir / filename
 
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
+        # Columns in first-seen order across all rows (same as a DataFrame)
+        fieldnames = list(dict.fromkeys(key for row in _validated_rows(data) for key in row))
 
         # Export
-        df.to_csv(file_path, index=False, encoding=encoding)
+        with open(file_path, 'w', newline='', encoding=encoding) as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(data)
 
         logger.info(f"Exported {len(data)} rows to CSV: {file_path}")
         return file_path
@@ -101,8 +150,7 @@ class DataExporter:
             file_path = self.default_dir / filename
 
         # Export
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
+        self._write_json(data, file_path, indent=indent, ensure_ascii=ensure_ascii)
 
         logger.info(f"Exported {len(data)} items to JSON: {file_path}")
         return file_path
@@ -132,15 +180,62 @@ class DataExporter:
             filename = self._generate_filename("scraped_data", ".xlsx")
             file_path = self.default_dir / filename
 
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
+        if XLSXWRITER_AVAILABLE:
+            self._write_xlsx_streaming(data, file_path, sheet_name)
+        else:
+            # pandas is only needed here; importing it costs ~0.5s
+            import pandas as pd
 
-        # Export
-        df.to_excel(file_path, index=False, sheet_name=sheet_name, engine='openpyxl')
+            # Convert to DataFrame
+            df = pd.DataFrame(data)
+
+            # Export
+            df.to_excel(file_path, index=False, sheet_name=sheet_name, engine='openpyxl')
 
         logger.info(f"Exported {len(data)} rows to Excel: {file_path}")
         return file_path
 
+    def _write_xlsx_streaming(self, data: List[Dict], file_path: Path, sheet_name: str):
+        """
+        Write rows straight to an xlsx file with xlsxwriter.
+
+        constant_memory flushes each row to disk once the next one starts,
+        so memory stays flat regardless of row count, and no DataFrame is
+        built.
+
+        Args:
+            data: List of dictionaries to export
+            file_path: Target file path
+            sheet_name: Excel sheet name
+        """
+        import xlsxwriter
+
+        fieldnames = list(dict.fromkeys(key for row in _validated_rows(data) for key in row))
+
+        # inf becomes an Excel error cell instead of raising, and datetimes
+        # get a date format instead of showing as a bare serial number
+        workbook = xlsxwriter.Workbook(str(file_path), {
+            'constant_memory': True,
+            'strings_to_urls': False,
+            'nan_inf_to_errors': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+        })
+        try:
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, fieldnames, workbook.add_format({'bold': True}))
+
+            for row_index, row in enumerate(data, start=1):
+                for col_index, key in enumerate(fieldnames):
+                    value = row.get(key)
+                    # Empty cell for missing values and NaN, as pandas wrote them
+                    if value is None or value != value:
+                        continue
+                    if isinstance(value, (list, dict, tuple, set)):
+                        value = str(value)
+                    worksheet.write(row_index, col_index, value)
+        finally:
+            workbook.close()
+
     def export_all(
         self,
         data: List[Dict],
@@ -210,8 +305,7 @@ class DataExporter:
         }
 
         # Export
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        self._write_json(export_data, file_path)
 
         logger.info(f"Exported {len(data)} items with metadata to: {file_path}")
         return file_path
@@ -239,7 +333,9 @@ class DataExporter:
         if not isinstance(data, list):
             raise ValueError("Data must be a list")
 
-        if not all(isinstance(item, dict) for item in data):
+        # Sample the first row only; the CSV/Excel writers check every
+        # row while collecting columns, so a full scan here is a second pass
+        if not isinstance(data[0], dict):
             raise ValueError("All items must be dictionaries")
 
         return True
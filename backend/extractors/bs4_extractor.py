@@ -1,32 +1,59 @@
 """
 BeautifulSoup-based Data Extractor
 """
-from typing import Dict, List, Optional
+import functools
+from typing import Dict, List, Optional, Union
 from bs4 import BeautifulSoup
+import soupsieve
+from utils.helpers import query_tokens
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Query keywords that select the product selectors
+_PRODUCT_TOKENS = frozenset({'product', 'price', 'shop', 'buy'})
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """Parsed CSS selector, shared across pages (learned selectors repeat)"""
+    return soupsieve.compile(selector)
+
 
 class BS4Extractor:
     """Extract data using BeautifulSoup and CSS selectors"""
 
+    @staticmethod
+    def parse(html: Union[str, BeautifulSoup]) -> BeautifulSoup:
+        """
+        Parse HTML once so several extraction passes can share the tree.
+
+        Args:
+            html: HTML content, or an already parsed soup (returned as is)
+
+        Returns:
+            BeautifulSoup document
+        """
+        if isinstance(html, BeautifulSoup):
+            return html
+        return BeautifulSoup(html, 'lxml')
+
     @staticmethod
     def extract_with_selectors(
-        html: str,
+        html: Union[str, BeautifulSoup],
         selectors: Dict[str, str]
     ) -> List[Dict[str, str]]:
         """
         Extract data using CSS selectors.
 
         Args:
-            html: HTML content
+            html: HTML content, or a soup from BS4Extractor.parse()
             selectors: Dictionary mapping field names to CSS selectors
 
         Returns:
             List of dictionaries containing extracted data
         """
-        soup = BeautifulSoup(html, 'lxml')
+        soup = BS4Extractor.parse(html)
         results = []
 
         # Find the common parent container
@@ -34,32 +61,30 @@ class BS4Extractor:
         first_selector = list(selectors.values())[0]
 
         try:
+            # Run every selector exactly once (compiled), then zip the
+            # per-field match lists by position
+            matches = {
+                field_name: _compile_selector(selector).select(soup)
+                for field_name, selector in selectors.items()
+            }
+
             # Try to find parent containers
-            first_elements = soup.select(first_selector)
+            first_elements = next(iter(matches.values()))
 
             if not first_elements:
                 logger.warning(f"No elements found for selector: {first_selector}")
                 return []
 
-            # Determine common parent
-            # For simplicity, we'll assume all selectors are at the same level
-            # or we need to extract from multiple items
-
-            # Try extracting from each potential item
-            # Find common ancestor of all selectors
+            # Items are counted by the first selector's matches
             max_items = len(first_elements)
 
             for i in range(max_items):
                 item_data = {}
 
-                for field_name, selector in selectors.items():
-                    elements = soup.select(selector)
-
+                for field_name, elements in matches.items():
                     if i < len(elements):
-                        element = elements[i]
                         # Extract text content
-                        text = element.get_text(strip=True)
-                        item_data[field_name] = text
+                        item_data[field_name] = elements[i].get_text(strip=True)
                     else:
                         item_data[field_name] = ""
 
@@ -75,19 +100,18 @@ class BS4Extractor:
             return []
 
     @staticmethod
-    def extract_common_selectors(html: str, query: str) -> Optional[List[Dict[str, str]]]:
+    def extract_common_selectors(html: Union[str, BeautifulSoup], query: str) -> Optional[List[Dict[str, str]]]:
         """
         Try common CSS selectors based on query.
 
         Args:
-            html: HTML content
+            html: HTML content, or a soup from BS4Extractor.parse()
             query: Natural language query
 
         Returns:
             Extracted data or None
         """
-        soup = BeautifulSoup(html, 'lxml')
-        query_lower = query.lower()
+        soup = BS4Extractor.parse(html)
 
         # Common selectors for different data types
         common_selectors = {
@@ -108,11 +132,11 @@ class BS4Extractor:
         }
 
         # Try to match query to common patterns
-        if any(word in query_lower for word in ['product', 'price', 'shop', 'buy']):
+        if not query_tokens(query).isdisjoint(_PRODUCT_TOKENS):
             # Try product selectors
             for field, selector_list in common_selectors['product']['selectors'].items():
                 for selector in selector_list:
-                    elements = soup.select(selector)
+                    elements = _compile_selector(selector).select(soup)
                     if elements:
                         logger.info(f"Found common selector for {field}: {selector}")
                         # Found something, return partial results
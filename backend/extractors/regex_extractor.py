@@ -2,25 +2,143 @@
 Regex-based Data Extractor
 """
 import re
-from typing import List, Dict
+from typing import List, Dict, Set
+from utils.helpers import query_tokens
 from utils.logger import get_logger
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 logger = get_logger(__name__)
 
+# Query keywords that select each pattern
+CATEGORY_TOKENS = {
+    'email': frozenset({'email', 'mail', 'contact'}),
+    'phone': frozenset({'phone', 'tel', 'telephone', 'number', 'contact'}),
+    'url': frozenset({'url', 'link', 'website'}),
+    'price': frozenset({'price', 'cost', 'amount', '$', '€', '£'}),
+    'date': frozenset({'date', 'time', 'when'}),
+}
+
+# Keywords for which has_patterns() routes a query to regex extraction
+PATTERN_QUERY_TOKENS = frozenset({
+    'email', 'mail', 'phone', 'tel', 'telephone', 'contact',
+    'url', 'link', 'website', 'price', 'cost',
+    'amount', 'date', 'time'
+})
+
 
 class RegexExtractor:
     """Extract common data patterns using regex"""
 
     # Common regex patterns
     PATTERNS = {
-        'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+        # Local part and domain are length-bounded (RFC 5321) so a long run
+        # of address characters costs O(n) instead of O(n^2) to reject
+        'email': r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,63}\b',
         'phone': r'\b(?:\+?1[-.]?)?\(?([0-9]{3})\)?[-.]?([0-9]{3})[-.]?([0-9]{4})\b',
         'url': r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)',
-        'price': r'\$\s?\d+(?:,\d{3})*(?:\.\d{2})?|\d+(?:,\d{3})*(?:\.\d{2})?\s?(?:USD|EUR|GBP|\$|€|£)',
+        # (?<!\d) starts the suffix-currency form only at the first digit of
+        # a run; a later start can never match where that one failed
+        'price': r'\$\s?\d+(?:,\d{3})*(?:\.\d{2})?|(?<!\d)\d+(?:,\d{3})*(?:\.\d{2})?\s?(?:USD|EUR|GBP|\$|€|£)',
         'date': r'\b(?:\d{1,2}[-/]\d{1,2}[-/]\d{2,4}|\d{4}[-/]\d{1,2}[-/]\d{1,2})\b',
         'number': r'\b\d+(?:,\d{3})*(?:\.\d+)?\b',
     }
 
+    # Max distinct results per pattern
+    MAX_MATCHES = 20
+
+    # Compiled once at import
+    COMPILED = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in PATTERNS.items()}
+
+    # Hyperscan database over all patterns, built on first use
+    _hs_db = None
+    _hs_names: List[str] = list(PATTERNS)
+
+    @classmethod
+    def _hyperscan_db(cls):
+        """Compile every pattern into one Hyperscan database (None if unavailable)"""
+        if hyperscan is None:
+            return None
+
+        if cls._hs_db is None:
+            try:
+                # PREFILTER approximates constructs Hyperscan lacks (lookbehind)
+                # with a superset; re still decides the actual matches
+                flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8
+                         | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER)
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[cls.PATTERNS[name].encode('utf-8') for name in cls._hs_names],
+                    ids=list(range(len(cls._hs_names))),
+                    flags=[flags] * len(cls._hs_names),
+                )
+                cls._hs_db = db
+            except Exception as e:
+                logger.warning(f"Hyperscan unavailable, using re only: {str(e)}")
+                cls._hs_db = False
+
+        return cls._hs_db or None
+
+    @classmethod
+    def _matching_patterns(cls, html: str) -> Set[str]:
+        """
+        Names of the patterns that match anywhere in html.
+
+        Uses one Hyperscan pass over the buffer for all patterns; without
+        Hyperscan every pattern is assumed to possibly match.
+
+        Args:
+            html: HTML content
+
+        Returns:
+            Set of pattern names
+        """
+        db = cls._hyperscan_db()
+        if db is None:
+            return set(cls.PATTERNS)
+
+        found = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            found.add(cls._hs_names[pattern_id])
+
+        db.scan(html.encode('utf-8', 'ignore'), match_event_handler=on_match)
+        return found
+
+    @staticmethod
+    def _unique_matches(pattern: re.Pattern, html: str) -> List:
+        """
+        First MAX_MATCHES distinct matches in document order.
+
+        Scans lazily and stops at the cap instead of materializing every
+        match. Values have the same shape as re.findall (full match, single
+        group, or tuple of groups).
+
+        Args:
+            pattern: Compiled pattern
+            html: HTML content
+
+        Returns:
+            List of distinct matches
+        """
+        unique = {}
+        for match in pattern.finditer(html):
+            if pattern.groups == 0:
+                value = match.group()
+            elif pattern.groups == 1:
+                value = match.group(1) or ''
+            else:
+                value = tuple(g or '' for g in match.groups())
+
+            unique[value] = None
+            if len(unique) >= RegexExtractor.MAX_MATCHES:
+                break
+
+        return list(unique)
+
     @classmethod
     def extract(cls, html: str, query: str) -> Dict[str, List[str]]:
         """
@@ -34,32 +152,24 @@ class RegexExtractor:
             Dictionary mapping field names to extracted values
         """
         results = {}
-        query_lower = query.lower()
 
         # Determine which patterns to use based on query
-        patterns_to_use = {}
-
-        if any(word in query_lower for word in ['email', 'mail', 'contact']):
-            patterns_to_use['email'] = cls.PATTERNS['email']
-
-        if any(word in query_lower for word in ['phone', 'tel', 'number', 'contact']):
-            patterns_to_use['phone'] = cls.PATTERNS['phone']
-
-        if any(word in query_lower for word in ['url', 'link', 'website']):
-            patterns_to_use['url'] = cls.PATTERNS['url']
-
-        if any(word in query_lower for word in ['price', 'cost', 'amount', '$', '€', '£']):
-            patterns_to_use['price'] = cls.PATTERNS['price']
-
-        if any(word in query_lower for word in ['date', 'time', 'when']):
-            patterns_to_use['date'] = cls.PATTERNS['date']
+        tokens = query_tokens(query)
+        patterns_to_use = {
+            name: cls.PATTERNS[name]
+            for name, keywords in CATEGORY_TOKENS.items()
+            if tokens & keywords
+        }
+
+        # Skip the re scan for patterns with no match in the page
+        if patterns_to_use:
+            candidates = cls._matching_patterns(html)
+            patterns_to_use = {name: p for name, p in patterns_to_use.items() if name in candidates}
 
         # Extract using selected patterns
-        for name, pattern in patterns_to_use.items():
-            matches = re.findall(pattern, html, re.IGNORECASE)
-            if matches:
-                # Clean up matches (remove duplicates, limit results)
-                unique_matches = list(set(matches))[:20]  # Max 20 results per pattern
+        for name in patterns_to_use:
+            unique_matches = cls._unique_matches(cls.COMPILED[name], html)
+            if unique_matches:
                 results[name] = unique_matches
                 logger.info(f"Regex extracted {len(unique_matches)} {name}(s)")
 
@@ -76,10 +186,4 @@ class RegexExtractor:
         Returns:
             True if query matches known patterns
         """
-        query_lower = query.lower()
-        keywords = [
-            'email', 'mail', 'phone', 'tel', 'contact',
-            'url', 'link', 'website', 'price', 'cost',
-            'amount', 'date', 'time'
-        ]
-        return any(keyword in query_lower for keyword in keywords)
\ No newline at end of file
+        return not query_tokens(query).isdisjoint(PATTERN_QUERY_TOKENS)
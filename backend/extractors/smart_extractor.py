@@ -1,12 +1,22 @@
 """
 LLM-based Smart Data Extractor
 """
-from typing import Dict, List, Optional
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 from bs4 import BeautifulSoup
+from config.settings import CLAUDE_MODEL, CLAUDE_HAIKU_MODEL
+from backend.storage.selector_cache import StructuralSelectorCache
+from backend.llm.semantic_cache import SemanticSelectorCache
 from utils.logger import get_logger
+from utils.helpers import get_domain
 
 logger = get_logger(__name__)
 
+# Models tried in order for selector discovery
+SELECTOR_MODELS = (CLAUDE_HAIKU_MODEL, CLAUDE_MODEL)
+
 
 class SmartExtractor:
     """
@@ -18,20 +28,35 @@ class SmartExtractor:
     3. Extract data intelligently
     """
 
-    def __init__(self, claude_client):
+    def __init__(
+        self,
+        claude_client,
+        selector_cache: Optional[StructuralSelectorCache] = None,
+        semantic_cache: Optional[SemanticSelectorCache] = None
+    ):
         """
         Initialize smart extractor.
 
         Args:
             claude_client: ClaudeClient instance
+            selector_cache: Layout-keyed selector cache (default: data/selector_cache.db)
+            semantic_cache: Per-domain cache matching paraphrased queries
+                (no-op without sentence-transformers)
         """
         self.claude = claude_client
+        self.selector_cache = selector_cache or StructuralSelectorCache()
+        self.semantic_cache = semantic_cache or SemanticSelectorCache()
+
+        # Parsing and selector matching for aextract, off the event loop
+        self._cpu_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="extract")
 
     def extract(
         self,
         html: str,
         query: str,
-        url: str = ""
+        url: str = "",
+        soup: Optional[BeautifulSoup] = None,
+        force: bool = False
     ) -> Dict[str, any]:
         """
         Extract data using LLM intelligence.
@@ -40,6 +65,9 @@ class SmartExtractor:
             html: HTML content
             query: Natural language query
             url: Original URL (for context)
+            soup: Already parsed document, reused for selector extraction
+            force: Skip the selector caches (including cached failures)
+                and always ask the LLM
 
         Returns:
             Dictionary containing:
@@ -48,57 +76,305 @@ class SmartExtractor:
                 - cost: API cost for this extraction
         """
         try:
-            # Get selectors from LLM
-            response = self.claude.find_selectors(html, query, url)
+            # Same site, query and page layout as an earlier success: no API call
+            soup, cache_key, cached = self._from_cache(html, query, url, soup, force)
+            if cached:
+                return cached
+
+            # Selector discovery runs on Haiku; Sonnet gets a second try only
+            # when Haiku's selectors fail validation or match nothing
+            response = None
+            data = []
+            cost = 0.0
+
+            for model in SELECTOR_MODELS:
+                attempt = self.claude.find_selectors(html, query, url, model=model, soup=soup)
+
+                if attempt and 'selectors' in attempt:
+                    response = attempt
+                    cost += attempt.get('cost', 0.0)
+                    soup, data = self._apply_selectors(html, soup, attempt, model)
+
+                    if data:
+                        break
+
+                    if model != CLAUDE_MODEL:
+                        logger.warning(f"Selectors from {model} extracted nothing - retrying with {CLAUDE_MODEL}")
+                elif model != CLAUDE_MODEL:
+                    logger.warning(f"{model} returned no selectors - retrying with {CLAUDE_MODEL}")
+
+            if data:
+                self._remember(cache_key, url, query, response['selectors'])
+            elif response:
+                self.selector_cache.mark_failed(cache_key)
+
+            return self._result(response, data, cost)
+
+        except Exception as e:
+            return self._error_result(e)
+
+    async def aextract(
+        self,
+        html: str,
+        query: str,
+        url: str = "",
+        soup: Optional[BeautifulSoup] = None,
+        force: bool = False
+    ) -> Dict[str, any]:
+        """
+        Async version of extract.
+
+        Many pages can be extracted concurrently with
+        asyncio.gather(*(extractor.aextract(h, q, u) for ...)); the client
+        bounds how many API requests are in flight. Parsing, selector
+        matching and cache updates run in a thread pool so they don't
+        stall other pages' API calls.
+
+        Args:
+            html: HTML content
+            query: Natural language query
+            url: Original URL (for context)
+            soup: Already parsed document, reused for selector extraction
+            force: Skip the selector caches and always ask the LLM
+
+        Returns:
+            Same dictionary as extract()
+        """
+        try:
+            loop = asyncio.get_running_loop()
+
+            soup, cache_key, cached = await loop.run_in_executor(
+                self._cpu_pool, self._from_cache, html, query, url, soup, force
+            )
+            if cached:
+                return cached
+
+            response = None
+            data = []
+            cost = 0.0
+
+            for model in SELECTOR_MODELS:
+                attempt = await self.claude.afind_selectors(html, query, url, model=model, soup=soup)
+
+                if attempt and 'selectors' in attempt:
+                    response = attempt
+                    cost += attempt.get('cost', 0.0)
+                    soup, data = await loop.run_in_executor(
+                        self._cpu_pool, self._apply_selectors, html, soup, attempt, model
+                    )
+
+                    if data:
+                        break
+
+                    if model != CLAUDE_MODEL:
+                        logger.warning(f"Selectors from {model} extracted nothing - retrying with {CLAUDE_MODEL}")
+                elif model != CLAUDE_MODEL:
+                    logger.warning(f"{model} returned no selectors - retrying with {CLAUDE_MODEL}")
+
+            if data:
+                # Embedding the query may load the model on first use
+                await loop.run_in_executor(
+                    self._cpu_pool, self._remember, cache_key, url, query, response['selectors']
+                )
+            elif response:
+                await loop.run_in_executor(self._cpu_pool, self.selector_cache.mark_failed, cache_key)
+
+            return self._result(response, data, cost)
+
+        except Exception as e:
+            return self._error_result(e)
+
+    def extract_many(
+        self,
+        items: List[Dict[str, str]],
+        mode: str = "batch",
+        poll_interval: float = 30.0
+    ) -> List[Dict[str, any]]:
+        """
+        Extract many pages, for queued work that can wait.
+
+        "batch" sends selector discovery through the Message Batches API
+        at half price (typically minutes, up to 24h); pages whose Haiku
+        selectors fail go through a second Sonnet batch. "async" runs
+        aextract concurrently, and "sync" calls extract in a loop.
+
+        Args:
+            items: Dicts with "html", "query" and optionally "url"
+            mode: "batch", "async" or "sync"
+            poll_interval: Seconds between batch status checks
+
+        Returns:
+            One extract()-style result per item, in input order
+        """
+        if mode == "sync":
+            return [self.extract(it["html"], it["query"], it.get("url", "")) for it in items]
+
+        if mode == "async":
+            async def run():
+                try:
+                    return await asyncio.gather(*(
+                        self.aextract(it["html"], it["query"], it.get("url", "")) for it in items
+                    ))
+                finally:
+                    # The client is bound to this loop, which asyncio.run closes
+                    await self.claude.aclose()
+            return asyncio.run(run())
+
+        results: List[Optional[Dict[str, any]]] = [None] * len(items)
+        soups: List[Optional[BeautifulSoup]] = [None] * len(items)
+        keys: List[str] = [""] * len(items)
+        costs = [0.0] * len(items)
+        pending = []
+
+        for i, item in enumerate(items):
+            soups[i], keys[i], results[i] = self._from_cache(
+                item["html"], item["query"], item.get("url", ""), None
+            )
+            if results[i] is None:
+                pending.append(i)
 
-            if not response or 'selectors' not in response:
-                error_detail = "No response from Claude API"
-                if not response:
-                    error_detail = "API returned None - check your ANTHROPIC_API_KEY in .env file"
+        for model in SELECTOR_MODELS:
+            if not pending:
+                break
+
+            batch_id = self.claude.submit_batch(
+                [{**items[i], "id": f"item-{i}", "soup": soups[i]} for i in pending],
+                model=model
+            )
+            if not batch_id or not self.claude.wait_for_batch(batch_id, poll_interval=poll_interval):
+                break
+
+            failed = []
+            for custom_id, selectors, cost in self.claude.fetch_batch_results(batch_id):
+                i = int(custom_id.rsplit("-", 1)[1])
+                costs[i] += cost
+
+                data = []
+                if selectors:
+                    soups[i], data = self._apply_selectors(
+                        items[i]["html"], soups[i], {"selectors": selectors}, model
+                    )
+                    results[i] = {'selectors': selectors, 'data': data}
+
+                if data:
+                    self._remember(keys[i], items[i].get("url", ""), items[i]["query"], selectors)
                 else:
-                    error_detail = "API response missing selectors - check API key validity"
+                    failed.append(i)
+                    if selectors and model == SELECTOR_MODELS[-1]:
+                        self.selector_cache.mark_failed(keys[i])
+
+            pending = failed
+
+        return [
+            {**result, 'cost': cost} if result is not None else self._result(None, [], cost)
+            for result, cost in zip(results, costs)
+        ]
+
+    def _from_cache(
+        self,
+        html: str,
+        query: str,
+        url: str,
+        soup: Optional[BeautifulSoup],
+        force: bool = False
+    ) -> Tuple[BeautifulSoup, str, Optional[Dict[str, any]]]:
+        """
+        Try selectors cached for this domain, query and page layout, then
+        selectors cached for a similarly worded query on the same domain,
+        then a recent failure for the same key.
 
-                logger.error(f"LLM did not return selectors: {error_detail}")
-                return {
-                    'selectors': {},
-                    'data': [],
-                    'cost': 0.0,
-                    'error': error_detail
-                }
+        Returns:
+            (soup, cache key, extract() result or None on a miss or when
+            the cached selectors no longer match anything)
+        """
+        if soup is None:
+            soup = BeautifulSoup(html, 'lxml')
 
-            selectors = response['selectors']
-            cost = response.get('cost', 0.0)
+        key = self.selector_cache.make_key(url, query, soup)
+        if force:
+            return soup, key, None
 
-            logger.info(f"LLM found selectors: {selectors}")
+        for selectors in (self.selector_cache.get(key), self.semantic_cache.get(get_domain(url), query)):
+            if not selectors:
+                continue
 
-            # Extract data using the identified selectors
-            data = self._extract_with_selectors(html, selectors)
+            data = self._extract_with_selectors(soup, selectors)
+            if data:
+                logger.info("Selector cache hit for %s: %s", url, selectors)
+                return soup, key, {'selectors': selectors, 'data': data, 'cost': 0.0, 'cached': True}
 
-            return {
-                'selectors': selectors,
-                'data': data,
-                'cost': cost
+        if self.selector_cache.recently_failed(key):
+            logger.info("Skipping LLM for %s: same query and layout found nothing recently", url)
+            return soup, key, {
+                'selectors': {},
+                'data': [],
+                'cost': 0.0,
+                'cached': True,
+                'error': "No data found for this query and page layout recently (use force to retry)"
             }
 
-        except Exception as e:
-            logger.error(f"Error in smart extraction: {e}")
+        return soup, key, None
+
+    def _remember(self, key: str, url: str, query: str, selectors: Dict[str, str]):
+        """Store selectors that produced data in both caches"""
+        self.selector_cache.put(key, selectors)
+        self.semantic_cache.add(get_domain(url), query, selectors)
+
+    def _apply_selectors(
+        self,
+        html: str,
+        soup: Optional[BeautifulSoup],
+        attempt: Dict[str, Any],
+        model: str
+    ) -> Tuple[BeautifulSoup, List[Dict[str, str]]]:
+        """Run LLM selectors against the page, parsing it on first use"""
+        logger.info("LLM found selectors (%s): %s", model, attempt['selectors'])
+
+        if soup is None:
+            soup = BeautifulSoup(html, 'lxml')
+        return soup, self._extract_with_selectors(soup, attempt['selectors'])
+
+    @staticmethod
+    def _result(response: Optional[Dict[str, Any]], data: List[Dict[str, str]], cost: float) -> Dict[str, any]:
+        """Final extract() result from the last selector response"""
+        if not response:
+            error_detail = "API returned None - check your ANTHROPIC_API_KEY in .env file"
+
+            logger.error(f"LLM did not return selectors: {error_detail}")
             return {
                 'selectors': {},
                 'data': [],
-                'cost': 0.0,
-                'error': str(e)
+                'cost': cost,
+                'error': error_detail
             }
 
+        return {
+            'selectors': response['selectors'],
+            'data': data,
+            'cost': cost
+        }
+
+    @staticmethod
+    def _error_result(e: Exception) -> Dict[str, any]:
+        """extract() result for an unexpected error"""
+        logger.error(f"Error in smart extraction: {e}")
+        return {
+            'selectors': {},
+            'data': [],
+            'cost': 0.0,
+            'error': str(e)
+        }
+
     def _extract_with_selectors(
         self,
-        html: str,
+        html: Union[str, BeautifulSoup],
         selectors: Dict[str, str]
     ) -> List[Dict[str, str]]:
         """
         Extract data using provided selectors.
 
         Args:
-            html: HTML content
+            html: HTML content or parsed soup
             selectors: Dictionary mapping field names to CSS selectors
 
         Returns:
@@ -1,4 +1,6 @@
 """LLM integration modules"""
 from .claude_client import ClaudeClient
 from .prompt_builder import PromptBuilder
-from .response_parser import ResponseParser
\ No newline at end of file
+from .response_parser import ResponseParser
+from .semantic_cache import SemanticSelectorCache
+from .rate_limiter import ApiRateLimiter
@@ -1,28 +1,84 @@
 """
 Claude API Client
 """
+import asyncio
+import gzip
+import hashlib
+import logging
+import httpx
+import orjson
+import random
+import re
 import requests
-import json
-from typing import Dict, Optional, Any
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from config.settings import (
+    CLAUDE_HTTP_BACKEND,
     ANTHROPIC_API_KEY,
     CLAUDE_MODEL,
+    CLAUDE_HAIKU_MODEL,
+    CLAUDE_MAX_CONCURRENCY,
+    CLAUDE_GZIP_REQUESTS,
+    CLAUDE_RPM_LIMIT,
+    CLAUDE_TPM_LIMIT,
+    BATCH_COST_MULTIPLIER,
     DEFAULT_TIMEOUT
 )
 from utils.logger import get_logger
 from utils.budget_manager import BudgetManager
 from utils.helpers import minimize_html
 from .prompt_builder import PromptBuilder
-from .response_parser import ResponseParser
+from .rate_limiter import ApiRateLimiter
+from .response_parser import JsonSpanScanner, ResponseParser
+
+try:
+    from curl_cffi import CurlHttpVersion
+    from curl_cffi import requests as cffi_requests
+except ImportError:
+    cffi_requests = None
 
 logger = get_logger(__name__)
 
+# Async retry policy (the sync session retries through urllib3)
+RETRY_STATUSES = (429, 500, 502, 503, 504, 529)
+ASYNC_MAX_RETRIES = 5
+ASYNC_BACKOFF_BASE = 1.0
+ASYNC_BACKOFF_CAP = 60.0
+
+# Rough input token estimate for rate limiting
+CHARS_PER_TOKEN = 4
+
+# Request bodies above this size are gzipped when CLAUDE_GZIP_REQUESTS is on
+GZIP_MIN_BYTES = 1024
+
+# Output budget for a selector map: ~48 tokens per requested field
+_FIELD_SEPARATOR_RE = re.compile(r'\band\b|,')
+SELECTOR_MIN_TOKENS = 256
+SELECTOR_MAX_TOKENS = 1024
+
+
+def selector_max_tokens(query: str) -> int:
+    """
+    max_tokens for a selector lookup, from the number of fields asked for.
+
+    Args:
+        query: Natural language query (e.g. "name, price and rating")
+
+    Returns:
+        Token limit between SELECTOR_MIN_TOKENS and SELECTOR_MAX_TOKENS
+    """
+    n_fields = len(_FIELD_SEPARATOR_RE.findall(query)) + 1
+    return min(SELECTOR_MAX_TOKENS, max(SELECTOR_MIN_TOKENS, 64 + 48 * n_fields))
+
 
 class ClaudeClient:
     """Client for interacting with Claude API"""
 
     API_URL = "https://api.anthropic.com/v1/messages"
     API_VERSION = "2023-06-01"
+    BATCHES_URL = "https://api.anthropic.com/v1/messages/batches"
 
     def __init__(self, api_key: str = None, budget_manager: BudgetManager = None):
         """
@@ -38,22 +94,159 @@ class ClaudeClient:
             raise ValueError("Anthropic API key not provided")
 
         self.budget_manager = budget_manager or BudgetManager()
+        self.rate_limiter = ApiRateLimiter(CLAUDE_RPM_LIMIT, CLAUDE_TPM_LIMIT)
         self.prompt_builder = PromptBuilder()
         self.parser = ResponseParser()
 
+        # Async client and semaphore, created lazily inside the running loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Identical async selector lookups in flight, keyed by model + prompt
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Keep-alive session: later calls skip the TCP + TLS handshake.
+        # Rate limits (429), overload (529) and gateway errors are retried
+        # with backoff, honouring Retry-After; read timeouts are not, since
+        # the request may already have been processed and billed
+        api_headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": self.API_VERSION,
+            "content-type": "application/json"
+        }
+        self.session = requests.Session()
+        self.session.headers.update(api_headers)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                read=False,
+                backoff_factor=1.0,
+                backoff_max=60,
+                backoff_jitter=1.0,
+                status_forcelist=[429, 500, 502, 503, 504, 529],
+                allowed_methods=["POST"],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        ))
+
+        # Message requests can go through libcurl instead (HTTP/2, less
+        # per-call Python overhead); batches always use the requests session
+        self._message_session = self.session
+        if CLAUDE_HTTP_BACKEND == "curl_cffi":
+            if cffi_requests is None:
+                logger.warning("CLAUDE_HTTP_BACKEND=curl_cffi but curl_cffi is not installed - using requests")
+            else:
+                self._message_session = cffi_requests.Session(
+                    headers=api_headers,
+                    http_version=CurlHttpVersion.V2TLS
+                )
+
+    def _build_payload(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system: Optional[List[Dict]],
+        model: str
+    ) -> Dict[str, Any]:
+        """Request body for the messages API"""
+        data = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        if system:
+            data["system"] = system
+        return data
+
+    @staticmethod
+    def _estimate_tokens(prompt: str, system: Optional[List[Dict]]) -> int:
+        """Approximate input tokens of a request (for rate limiting)"""
+        chars = len(prompt) + sum(len(block.get("text", "")) for block in system or ())
+        return chars // CHARS_PER_TOKEN
+
+    @staticmethod
+    def _encode_body(data: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Serialize a request body, gzipping it when enabled and worthwhile.
+
+        Args:
+            data: JSON request body
+
+        Returns:
+            (body bytes, extra request headers)
+        """
+        body = orjson.dumps(data)
+        if CLAUDE_GZIP_REQUESTS and len(body) > GZIP_MIN_BYTES:
+            return gzip.compress(body, compresslevel=1), {"content-encoding": "gzip"}
+        return body, {}
+
+    def _handle_result(self, result: Dict[str, Any], model: str, cost_multiplier: float = 1.0) -> Dict[str, Any]:
+        """
+        Track usage of a successful response and flatten it.
+
+        Args:
+            result: Decoded API response
+            model: Model ID the request used
+            cost_multiplier: Price factor (BATCH_COST_MULTIPLIER for batches)
+
+        Returns:
+            Dictionary with content, cost and token counts
+        """
+        usage = result.get("usage", {})
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        cache_read_tokens = usage.get("cache_read_input_tokens") or 0
+        cache_creation_tokens = usage.get("cache_creation_input_tokens") or 0
+
+        cost = self.budget_manager.track_usage(
+            input_tokens,
+            output_tokens,
+            "haiku" if "haiku" in model else "sonnet",
+            cache_read_tokens=cache_read_tokens,
+            cache_creation_tokens=cache_creation_tokens,
+            cost_multiplier=cost_multiplier
+        )
+
+        logger.info("Claude API response received (cost: €%.4f)", cost)
+
+        return {
+            "content": result.get("content", [{}])[0].get("text", ""),
+            "cost": cost,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens
+        }
+
     def _make_request(
         self,
         prompt: str,
         max_tokens: int = 1024,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        system: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+        stream: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Make request to Claude API.
 
         Args:
-            prompt: Prompt text
+            prompt: Prompt text (user message)
             max_tokens: Maximum tokens in response
             temperature: Temperature for generation
+            system: System prompt blocks (may carry cache_control)
+            model: Model ID (defaults to CLAUDE_MODEL)
+            stream: Stream the response and stop reading as soon as the
+                first complete JSON value has arrived
 
         Returns:
             API response dictionary or None
@@ -63,52 +256,29 @@ class ClaudeClient:
             logger.error("Daily budget exceeded!")
             return None
 
-        headers = {
-            "x-api-key": self.api_key,
-            "anthropic-version": self.API_VERSION,
-            "content-type": "application/json"
-        }
-
-        data = {
-            "model": CLAUDE_MODEL,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
+        model = model or CLAUDE_MODEL
+        data = self._build_payload(prompt, max_tokens, temperature, system, model)
+        if stream:
+            data["stream"] = True
 
         try:
-            logger.info(f"Sending request to Claude API ({len(prompt)} chars)")
+            logger.info("Sending request to Claude API (%s, %d chars)", model, len(prompt))
 
-            response = requests.post(
+            body, headers = self._encode_body(data)
+            self.rate_limiter.acquire(self._estimate_tokens(prompt, system))
+            response = self._message_session.post(
                 self.API_URL,
+                data=body,
                 headers=headers,
-                json=data,
-                timeout=DEFAULT_TIMEOUT
+                timeout=DEFAULT_TIMEOUT,
+                stream=stream
             )
 
             response.raise_for_status()
-            result = response.json()
-
-            # Track usage
-            usage = result.get("usage", {})
-            input_tokens = usage.get("input_tokens", 0)
-            output_tokens = usage.get("output_tokens", 0)
-
-            cost = self.budget_manager.track_usage(input_tokens, output_tokens, "sonnet")
-
-            logger.info(f"Claude API response received (cost: €{cost:.4f})")
-
-            return {
-                "content": result.get("content", [{}])[0].get("text", ""),
-                "cost": cost,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens
-            }
+            result = self._read_stream(response) if stream else orjson.loads(response.content)
+            if result is None:
+                return None
+            return self._handle_result(result, model)
 
         except requests.exceptions.Timeout:
             logger.error("Claude API request timed out")
@@ -124,37 +294,191 @@ class ClaudeClient:
             logger.error(f"Claude API error: {e}")
             return None
 
-    def find_selectors(
+    @staticmethod
+    def _read_stream(response) -> Optional[Dict[str, Any]]:
+        """
+        Collect a streamed (SSE) message until its JSON answer is complete.
+
+        The connection is closed once the first balanced JSON value parses,
+        so any trailing text is neither waited for nor downloaded.
+
+        Args:
+            response: Streaming response from session.post(..., stream=True)
+                (requests or curl_cffi)
+
+        Returns:
+            Message-shaped dict ({"content": [...], "usage": {...}}) or None
+            on a stream error event
+        """
+        parts: List[str] = []
+        usage: Dict[str, int] = {}
+        scanner = JsonSpanScanner()
+        text = ""
+
+        try:
+            # chunk_size=None hands over each chunk as it arrives instead of
+            # blocking until 512 bytes have been buffered
+            for line in response.iter_lines(chunk_size=None):
+                if not line.startswith(b"data:"):
+                    continue
+
+                event = orjson.loads(line[5:])
+                event_type = event.get("type")
+
+                if event_type == "message_start":
+                    usage.update(event.get("message", {}).get("usage", {}))
+
+                elif event_type == "message_delta":
+                    usage.update(event.get("usage", {}))
+
+                elif event_type == "error":
+                    logger.error(f"Claude API stream error: {event.get('error')}")
+                    return None
+
+                elif event_type == "content_block_delta":
+                    chunk = event.get("delta", {}).get("text", "")
+                    if not chunk:
+                        continue
+
+                    parts.append(chunk)
+                    text = "".join(parts)
+
+                    # A balanced span can still be invalid JSON (brackets in
+                    # leading prose); keep scanning after it in that case
+                    pending = chunk
+                    while (end := scanner.feed(pending)) is not None:
+                        try:
+                            orjson.loads(text[scanner.start:end])
+                        except ValueError:
+                            pending = text[end:]
+                            continue
+
+                        # Cancelled before the final message_delta: estimate
+                        # output tokens (~4 chars each) for budget tracking
+                        usage["output_tokens"] = max(usage.get("output_tokens", 0), len(text) // 4)
+                        logger.debug(f"JSON complete after {len(text)} chars - closing stream")
+                        return {"content": [{"type": "text", "text": text[scanner.start:end]}], "usage": usage}
+
+                elif event_type == "message_stop":
+                    break
+
+        finally:
+            response.close()
+
+        return {"content": [{"type": "text", "text": "".join(parts)}], "usage": usage}
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Shared async client and concurrency limit for the running event loop"""
+        loop = asyncio.get_running_loop()
+
+        # A client is tied to the loop that created it (asyncio.run per batch)
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_loop = loop
+            self._async_client = httpx.AsyncClient(
+                headers=dict(self.session.headers),
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=DEFAULT_TIMEOUT
+            )
+            self._sem = asyncio.Semaphore(CLAUDE_MAX_CONCURRENCY)
+        return self._async_client
+
+    async def _amake_request(
         self,
-        html: str,
-        query: str,
-        url: str = ""
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.0,
+        system: Optional[List[Dict]] = None,
+        model: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
-        Find CSS selectors for extracting data.
+        Async version of _make_request.
+
+        At most CLAUDE_MAX_CONCURRENCY requests are in flight per client.
+        Rate limits, overload and gateway errors are retried with capped
+        exponential backoff, honouring Retry-After.
 
         Args:
-            html: HTML content
-            query: Natural language query
-            url: Original URL
+            prompt: Prompt text (user message)
+            max_tokens: Maximum tokens in response
+            temperature: Temperature for generation
+            system: System prompt blocks (may carry cache_control)
+            model: Model ID (defaults to CLAUDE_MODEL)
 
         Returns:
-            Dictionary with selectors and cost, or None
+            API response dictionary or None
         """
+        if self.budget_manager.is_budget_exceeded():
+            logger.error("Daily budget exceeded!")
+            return None
+
+        model = model or CLAUDE_MODEL
+        data = self._build_payload(prompt, max_tokens, temperature, system, model)
+        client = self._get_async_client()
+        body, headers = self._encode_body(data)
+
+        try:
+            async with self._sem:
+                logger.info("Sending async request to Claude API (%s, %d chars)", model, len(prompt))
+
+                for attempt in range(ASYNC_MAX_RETRIES + 1):
+                    await self.rate_limiter.aacquire(self._estimate_tokens(prompt, system))
+                    response = await client.post(self.API_URL, content=body, headers=headers)
+
+                    if response.status_code not in RETRY_STATUSES or attempt == ASYNC_MAX_RETRIES:
+                        break
+
+                    retry_after = response.headers.get("retry-after", "")
+                    if retry_after.isdigit():
+                        wait_time = min(float(retry_after), ASYNC_BACKOFF_CAP)
+                    else:
+                        # Exponential backoff with jitter so retries spread out
+                        backoff = min(ASYNC_BACKOFF_CAP, ASYNC_BACKOFF_BASE * (2 ** attempt))
+                        wait_time = backoff / 2 + random.uniform(0, backoff / 2)
+
+                    logger.warning(f"Claude API HTTP {response.status_code}, retrying in {wait_time:.1f}s")
+                    await asyncio.sleep(wait_time)
+
+            response.raise_for_status()
+            return self._handle_result(orjson.loads(response.content), model)
+
+        except httpx.TimeoutException:
+            logger.error("Claude API request timed out")
+            return None
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Claude API HTTP error: {e}")
+            logger.error(f"Response: {e.response.text}")
+            return None
+
+        except Exception as e:
+            logger.error(f"Claude API error: {e}")
+            return None
+
+    async def aclose(self):
+        """Close the async client (the sync session needs no cleanup)"""
+        if self._async_client is not None:
+            client, self._async_client, self._async_loop = self._async_client, None, None
+            await client.aclose()
+
+    def _selector_prompt(self, html: str, query: str, url: str, soup=None):
+        """Minimize HTML (reusing soup if parsed) and build the (system, user) selector prompt"""
         # Minimize HTML with query context
-        minimized_html = minimize_html(html, max_length=3000, query=query)
-        logger.info(f"Minimized HTML: {len(html)} -> {len(minimized_html)} chars ({100 - int(len(minimized_html)/len(html)*100)}% reduction)")
+        minimized_html = minimize_html(html, max_length=3000, query=query, soup=soup)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Minimized HTML: %d -> %d chars (%d%% reduction)",
+                len(html), len(minimized_html), 100 - len(minimized_html) * 100 // max(1, len(html))
+            )
 
         # Build prompt
-        prompt = self.prompt_builder.build_selector_prompt(
+        return self.prompt_builder.build_selector_prompt(
             minimized_html,
             query,
             url
         )
 
-        # Make API request
-        response = self._make_request(prompt, max_tokens=1024, temperature=0.0)
-
+    def _parse_selector_response(self, response: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Parse and validate the selectors in an API response"""
         if not response:
             logger.error("No response from Claude API in find_selectors")
             return None
@@ -180,6 +504,216 @@ class ClaudeClient:
             "output_tokens": response["output_tokens"]
         }
 
+    def find_selectors(
+        self,
+        html: str,
+        query: str,
+        url: str = "",
+        model: str = CLAUDE_HAIKU_MODEL,
+        soup=None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find CSS selectors for extracting data.
+
+        Args:
+            html: HTML content
+            query: Natural language query
+            url: Original URL
+            model: Model ID (Haiku by default; selector discovery is a small
+                structured-JSON task)
+            soup: Already parsed BeautifulSoup of html, reused for minimizing
+
+        Returns:
+            Dictionary with selectors and cost, or None
+        """
+        system, prompt = self._selector_prompt(html, query, url, soup)
+
+        # Make API request
+        response = self._make_request(
+            prompt, max_tokens=selector_max_tokens(query), temperature=0.0, system=system, model=model, stream=True
+        )
+
+        return self._parse_selector_response(response)
+
+    async def afind_selectors(
+        self,
+        html: str,
+        query: str,
+        url: str = "",
+        model: str = CLAUDE_HAIKU_MODEL,
+        soup=None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async version of find_selectors, for extracting many pages at once.
+
+        Concurrent calls that build the same prompt share one API request;
+        the callers that joined it get the result with cost 0.0.
+
+        Args:
+            html: HTML content
+            query: Natural language query
+            url: Original URL
+            model: Model ID
+            soup: Already parsed BeautifulSoup of html, reused for minimizing
+
+        Returns:
+            Dictionary with selectors and cost, or None
+        """
+        # Minimizing parses and serializes HTML; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        system, prompt = await loop.run_in_executor(None, self._selector_prompt, html, query, url, soup)
+
+        key = hashlib.blake2b(f"{model}\n{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.info("Joining in-flight selector request for %s", url)
+            # shield: a cancelled joiner must not cancel the shared request
+            result = await asyncio.shield(inflight)
+            return {**result, "cost": 0.0} if result else None
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        result = None
+        try:
+            response = await self._amake_request(
+                prompt, max_tokens=selector_max_tokens(query), temperature=0.0, system=system, model=model
+            )
+            result = self._parse_selector_response(response)
+            return result
+        finally:
+            # Joiners get None if this request failed or was cancelled
+            future.set_result(result)
+            self._inflight.pop(key, None)
+
+    def submit_batch(self, items: List[Dict[str, str]], model: str = CLAUDE_HAIKU_MODEL) -> Optional[str]:
+        """
+        Queue selector lookups on the Message Batches API (half price,
+        results typically within minutes, at most 24h).
+
+        Args:
+            items: Dicts with "id" (1-64 chars of [A-Za-z0-9_-]), "html",
+                "query" and optionally "url" and "soup" (parsed html)
+            model: Model ID for every request in the batch
+
+        Returns:
+            Batch ID, or None if the batch could not be created
+        """
+        if self.budget_manager.is_budget_exceeded():
+            logger.error("Daily budget exceeded!")
+            return None
+
+        requests_payload = []
+        for item in items:
+            system, prompt = self._selector_prompt(
+                item["html"], item["query"], item.get("url", ""), item.get("soup")
+            )
+            requests_payload.append({
+                "custom_id": item["id"],
+                "params": self._build_payload(prompt, selector_max_tokens(item["query"]), 0.0, system, model)
+            })
+
+        try:
+            body, headers = self._encode_body({"requests": requests_payload})
+            response = self.session.post(
+                self.BATCHES_URL,
+                data=body,
+                headers=headers,
+                timeout=DEFAULT_TIMEOUT
+            )
+            response.raise_for_status()
+            batch_id = orjson.loads(response.content)["id"]
+
+        except Exception as e:
+            logger.error(f"Claude batch submit failed: {e}")
+            return None
+
+        logger.info(f"Submitted batch {batch_id} ({len(items)} requests, {model})")
+        return batch_id
+
+    def poll_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get batch status.
+
+        Args:
+            batch_id: ID from submit_batch
+
+        Returns:
+            Batch object (processing_status is "ended" when done), or None
+        """
+        try:
+            response = self.session.get(f"{self.BATCHES_URL}/{batch_id}", timeout=DEFAULT_TIMEOUT)
+            response.raise_for_status()
+            return orjson.loads(response.content)
+
+        except Exception as e:
+            logger.error(f"Claude batch poll failed: {e}")
+            return None
+
+    def wait_for_batch(self, batch_id: str, poll_interval: float = 30.0, timeout: float = 24 * 3600) -> bool:
+        """
+        Block until a batch has ended.
+
+        Args:
+            batch_id: ID from submit_batch
+            poll_interval: Seconds between status checks
+            timeout: Maximum wait in seconds
+
+        Returns:
+            True if the batch ended, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            status = self.poll_batch(batch_id)
+            if status and status.get("processing_status") == "ended":
+                return True
+
+            if status:
+                logger.info(f"Batch {batch_id}: {status.get('request_counts', {})}")
+            time.sleep(poll_interval)
+
+        logger.error(f"Batch {batch_id} did not finish within {timeout:.0f}s")
+        return False
+
+    def fetch_batch_results(self, batch_id: str) -> Iterator[Tuple[str, Optional[Dict[str, Any]], float]]:
+        """
+        Stream the results of an ended batch.
+
+        Args:
+            batch_id: ID from submit_batch
+
+        Yields:
+            (custom_id, selectors or None, cost) per request; cost is billed
+            at BATCH_COST_MULTIPLIER
+        """
+        status = self.poll_batch(batch_id)
+        results_url = status.get("results_url") if status else None
+        if not results_url:
+            logger.error(f"Batch {batch_id} has no results yet")
+            return
+
+        with self.session.get(results_url, stream=True, timeout=DEFAULT_TIMEOUT) as response:
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+
+                entry = orjson.loads(line)
+                custom_id = entry.get("custom_id")
+                result = entry.get("result", {})
+
+                if result.get("type") != "succeeded":
+                    logger.error(f"Batch request {custom_id} {result.get('type')}: {result.get('error')}")
+                    yield custom_id, None, 0.0
+                    continue
+
+                message = result["message"]
+                response_data = self._handle_result(message, message.get("model", ""), BATCH_COST_MULTIPLIER)
+                parsed = self._parse_selector_response(response_data)
+
+                yield custom_id, parsed["selectors"] if parsed else None, response_data["cost"]
+
     def extract_data(
         self,
         html: str,
@@ -201,14 +735,14 @@ class ClaudeClient:
         minimized_html = minimize_html(html, max_length=3000, query=query)
 
         # Build prompt
-        prompt = self.prompt_builder.build_extraction_prompt(
+        system, prompt = self.prompt_builder.build_extraction_prompt(
             minimized_html,
             query,
             url
         )
 
         # Make API request
-        response = self._make_request(prompt, max_tokens=2048, temperature=0.0)
+        response = self._make_request(prompt, max_tokens=2048, temperature=0.0, system=system)
 
         if not response:
             return None
@@ -1,39 +1,12 @@
 """
 Prompt Builder for Claude API
 """
-from typing import Dict
+from typing import Dict, List, Tuple
 from utils.helpers import minimize_html, get_domain
 
-
-class PromptBuilder:
-    """Build optimized prompts for Claude API"""
-
-    @staticmethod
-    def build_selector_prompt(html: str, query: str, url: str = "") -> str:
-        """
-        Build prompt for finding CSS selectors.
-
-        Args:
-            html: Minimized HTML content
-            query: Natural language query
-            url: Original URL (for context)
-
-        Returns:
-            Formatted prompt string
-        """
-        domain = get_domain(url) if url else "the website"
-
-        prompt = f"""You are a web scraping expert. Analyze the following HTML and identify the CSS selectors needed to extract the requested data.
-
-URL: {url}
-Domain: {domain}
-
-User wants to extract: {query}
-
-HTML content (minimized):
-```html
-{html}
-```
+# Static instructions go in the system prompt, marked for prompt caching, so
+# repeat calls only pay full price for the page-specific user message
+SELECTOR_INSTRUCTIONS = """You are a web scraping expert. Analyze the HTML in the user message and identify the CSS selectors needed to extract the requested data.
 
 Your task:
 1. Analyze the HTML structure
@@ -47,60 +20,99 @@ Requirements:
 - Field names should match the user's query (e.g., if they ask for "product name", use "product_name")
 
 Return format (JSON only, no explanation):
-{{
+{
     "field_name_1": ".css-selector-1",
     "field_name_2": "#css-selector-2",
     ...
-}}
+}
 
 Example:
 If user asks for "product name and price", return:
-{{
+{
     "product_name": ".product-title",
     "price": ".product-price"
-}}"""
-
-        return prompt
-
-    @staticmethod
-    def build_extraction_prompt(html: str, query: str, url: str = "") -> str:
-        """
-        Build prompt for direct data extraction (alternative approach).
+}"""
 
-        Args:
-            html: Minimized HTML content
-            query: Natural language query
-            url: Original URL
-
-        Returns:
-            Formatted prompt string
-        """
-        domain = get_domain(url) if url else "the website"
-
-        prompt = f"""You are a web scraping expert. Extract the requested data from the following HTML.
-
-URL: {url}
-Domain: {domain}
-
-User wants to extract: {query}
-
-HTML content (minimized):
-```html
-{html}
-```
+EXTRACTION_INSTRUCTIONS = """You are a web scraping expert. Extract the requested data from the HTML in the user message.
 
 Extract the requested data and return it as a JSON array of objects.
 
 Return format (JSON only, no explanation):
 [
-    {{
+    {
         "field_1": "value_1",
         "field_2": "value_2"
-    }},
+    },
     ...
 ]
 
 If only one item is found, still return an array with one object.
 If no data is found, return an empty array: []"""
 
-        return prompt
\ No newline at end of file
+
+# Page-specific user message; the only part formatted per request
+PAGE_MESSAGE_TEMPLATE = """URL: %(url)s
+Domain: %(domain)s
+
+User wants to extract: %(query)s
+
+HTML content (minimized):
+```html
+%(html)s
+```"""
+
+
+def _cached_system(text: str) -> List[Dict]:
+    """System prompt as one text block with an ephemeral cache breakpoint"""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+# Built once and shared by every request (only ever serialized, never mutated)
+SELECTOR_SYSTEM = _cached_system(SELECTOR_INSTRUCTIONS)
+EXTRACTION_SYSTEM = _cached_system(EXTRACTION_INSTRUCTIONS)
+
+
+class PromptBuilder:
+    """Build optimized prompts for Claude API"""
+
+    @staticmethod
+    def _page_message(html: str, query: str, url: str) -> str:
+        """Page-specific part of a prompt (URL, query and HTML)"""
+        return PAGE_MESSAGE_TEMPLATE % {
+            "url": url,
+            "domain": get_domain(url) if url else "the website",
+            "query": query,
+            "html": html
+        }
+
+    @staticmethod
+    def build_selector_prompt(html: str, query: str, url: str = "") -> Tuple[List[Dict], str]:
+        """
+        Build prompt for finding CSS selectors.
+
+        Args:
+            html: Minimized HTML content
+            query: Natural language query
+            url: Original URL (for context)
+
+        Returns:
+            (system_blocks, user_text): cacheable system prompt blocks and
+            the page-specific user message
+        """
+        return SELECTOR_SYSTEM, PromptBuilder._page_message(html, query, url)
+
+    @staticmethod
+    def build_extraction_prompt(html: str, query: str, url: str = "") -> Tuple[List[Dict], str]:
+        """
+        Build prompt for direct data extraction (alternative approach).
+
+        Args:
+            html: Minimized HTML content
+            query: Natural language query
+            url: Original URL
+
+        Returns:
+            (system_blocks, user_text): cacheable system prompt blocks and
+            the page-specific user message
+        """
+        return EXTRACTION_SYSTEM, PromptBuilder._page_message(html, query, url)
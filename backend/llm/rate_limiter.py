@@ -0,0 +1,98 @@
+"""
+API Rate Limiter - Keeps Claude requests under the account's RPM / input
+TPM limits so bursts wait locally instead of bouncing off 429s
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WINDOW_SECONDS = 60.0
+
+
+class ApiRateLimiter:
+    """
+    Rolling 60s window over requests and estimated input tokens.
+
+    One instance is shared by the sync and async paths of a client; the
+    lock only guards bookkeeping, never a wait.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Initialize rate limiter.
+
+        Args:
+            requests_per_minute: Request limit (0 disables the check)
+            tokens_per_minute: Input token limit (0 disables the check)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._window_tokens = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Record a request if it fits the window.
+
+        Args:
+            tokens: Estimated input tokens
+
+        Returns:
+            0.0 if recorded, else seconds to wait before trying again
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            while self._window and self._window[0][0] <= now - WINDOW_SECONDS:
+                self._window_tokens -= self._window.popleft()[1]
+
+            wait = 0.0
+
+            if self.requests_per_minute and len(self._window) >= self.requests_per_minute:
+                wait = self._window[-self.requests_per_minute][0] + WINDOW_SECONDS - now
+
+            # Oversized requests are let through once the window is empty
+            excess = self._window_tokens + tokens - self.tokens_per_minute
+            if self.tokens_per_minute and excess > 0 and self._window:
+                released = 0
+                for timestamp, entry_tokens in self._window:
+                    released += entry_tokens
+                    if released >= excess:
+                        break
+                wait = max(wait, timestamp + WINDOW_SECONDS - now)
+
+            if wait > 0:
+                return wait
+
+            self._window.append((now, tokens))
+            self._window_tokens += tokens
+            return 0.0
+
+    def acquire(self, tokens: int):
+        """
+        Block until a request of this size fits the limits.
+
+        Args:
+            tokens: Estimated input tokens
+        """
+        while (wait := self._reserve(tokens)) > 0:
+            logger.info(f"Claude rate limit: waiting {wait:.1f}s")
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int):
+        """
+        Async version of acquire.
+
+        Args:
+            tokens: Estimated input tokens
+        """
+        while (wait := self._reserve(tokens)) > 0:
+            logger.info(f"Claude rate limit: waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
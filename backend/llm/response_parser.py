@@ -1,17 +1,90 @@
 """
 Claude API Response Parser
 """
-import json
-import re
-from typing import Dict, Any, Optional
+import orjson
+from typing import Dict, Any, Optional, Tuple
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_OPENERS = frozenset('{[')
+_CLOSERS = frozenset('}]')
+
+
+class JsonSpanScanner:
+    """
+    Incremental scanner for the first balanced top-level JSON object or
+    array in a stream of text chunks.
+
+    Brackets inside JSON strings (including escaped quotes) are ignored;
+    text before the first '{' or '[' is skipped.
+    """
+
+    def __init__(self):
+        self.start: Optional[int] = None
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.pos = 0
+
+    def feed(self, chunk: str) -> Optional[int]:
+        """
+        Scan the next chunk of text.
+
+        Args:
+            chunk: Text following everything fed so far
+
+        Returns:
+            End offset (exclusive, over all text fed) of the first balanced
+            value once it closes, else None
+        """
+        for i, char in enumerate(chunk, self.pos):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char in _OPENERS:
+                if self.depth == 0:
+                    self.start = i
+                self.depth += 1
+            elif self.depth:
+                if char == '"':
+                    self.in_string = True
+                elif char in _CLOSERS:
+                    self.depth -= 1
+                    if self.depth == 0:
+                        self.pos = i + 1
+                        return self.pos
+
+        self.pos += len(chunk)
+        return None
+
 
 class ResponseParser:
     """Parse and validate Claude API responses"""
 
+    @staticmethod
+    def _find_json_span(text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        Locate the first balanced top-level JSON object or array.
+
+        Args:
+            text: Text to scan
+            start: Offset to start scanning from
+
+        Returns:
+            (start, end) offsets of the span, or None
+        """
+        scanner = JsonSpanScanner()
+        scanner.pos = start
+        end = scanner.feed(text[start:])
+        if end is None:
+            return None
+        return scanner.start, end
+
     @staticmethod
     def parse_json_response(response_text: str) -> Optional[Dict[str, Any]]:
         """
@@ -25,28 +98,19 @@ class ResponseParser:
         """
         try:
             # Try direct JSON parsing first
-            return json.loads(response_text)
-
-        except json.JSONDecodeError:
-            # Try to extract JSON from markdown code blocks
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```',
-                                  response_text,
-                                  re.DOTALL)
-
-            if json_match:
-                try:
-                    return json.loads(json_match.group(1))
-                except json.JSONDecodeError:
-                    pass
+            return orjson.loads(response_text)
 
-            # Try to find any JSON object or array in the response
-            json_match = re.search(r'(\{.*?\}|\[.*?\])', response_text, re.DOTALL)
+        except orjson.JSONDecodeError:
+            # One left-to-right pass for balanced {...} / [...] spans, which
+            # also finds JSON inside markdown code fences; a span that is
+            # not valid JSON (brackets in prose) moves the scan past it
+            span = ResponseParser._find_json_span(response_text)
 
-            if json_match:
+            while span:
                 try:
-                    return json.loads(json_match.group(1))
-                except json.JSONDecodeError:
-                    pass
+                    return orjson.loads(response_text[span[0]:span[1]])
+                except orjson.JSONDecodeError:
+                    span = ResponseParser._find_json_span(response_text, span[1])
 
             logger.error(f"Could not parse JSON from response: {response_text[:200]}")
             return None
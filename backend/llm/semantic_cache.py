@@ -0,0 +1,145 @@
+"""
+Semantic Selector Cache
+Reuses selectors across paraphrased queries on the same domain
+("product price" vs "price of the product") by nearest-neighbour search
+over query embeddings
+"""
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.logger import get_logger
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+logger = get_logger(__name__)
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+SIMILARITY_THRESHOLD = 0.92
+MAX_ENTRIES_PER_DOMAIN = 1000
+
+
+class SemanticSelectorCache:
+    """In-memory per-domain cache of (query embedding, selectors)"""
+
+    def __init__(
+        self,
+        embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries: int = MAX_ENTRIES_PER_DOMAIN
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            embed_fn: Text -> vector function (default: sentence-transformers
+                all-MiniLM-L6-v2, loaded on first use)
+            threshold: Minimum cosine similarity for a hit
+            max_entries: LRU cap per domain
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._embed_fn = embed_fn
+        self._model = None
+        self._lock = threading.Lock()
+
+        # domain -> OrderedDict[normalized query -> (unit vector, selectors)]
+        self._entries: Dict[str, "OrderedDict[str, Tuple[np.ndarray, Dict[str, str]]]"] = {}
+        # domain -> (keys, stacked unit vectors), rebuilt after changes
+        self._matrices: Dict[str, Tuple[list, np.ndarray]] = {}
+
+        # Identical query strings are embedded once
+        self._embed = lru_cache(maxsize=4096)(self._embed_uncached)
+
+    @property
+    def available(self) -> bool:
+        """True when an embedding function or sentence-transformers is present"""
+        return self._embed_fn is not None or SentenceTransformer is not None
+
+    def _embed_uncached(self, text: str) -> np.ndarray:
+        """Unit-length float32 embedding of text"""
+        if self._embed_fn is not None:
+            vector = np.asarray(self._embed_fn(text), dtype=np.float32)
+        else:
+            if self._model is None:
+                logger.info(f"Loading embedding model {EMBEDDING_MODEL}")
+                self._model = SentenceTransformer(EMBEDDING_MODEL)
+            vector = self._model.encode(text, convert_to_numpy=True).astype(np.float32)
+
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        vector.setflags(write=False)
+        return vector
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def get(self, domain: str, query: str) -> Optional[Dict[str, str]]:
+        """
+        Selectors of the most similar cached query on this domain.
+
+        Args:
+            domain: Site domain
+            query: Natural language query
+
+        Returns:
+            Selectors dict if the best cosine similarity reaches the
+            threshold, else None
+        """
+        if not self.available:
+            return None
+
+        with self._lock:
+            entries = self._entries.get(domain)
+            if not entries:
+                return None
+
+            query_vector = self._embed(self._normalize(query))
+
+            if domain not in self._matrices:
+                keys = list(entries)
+                self._matrices[domain] = (keys, np.stack([entries[k][0] for k in keys]))
+            keys, matrix = self._matrices[domain]
+
+            # Rows and query are unit vectors, so one gemv gives all cosines
+            similarities = matrix @ query_vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            key = keys[best]
+            entries.move_to_end(key)
+            logger.info(f"Semantic cache hit on {domain}: '{query}' ~ '{key}' ({similarities[best]:.3f})")
+            return entries[key][1]
+
+    def add(self, domain: str, query: str, selectors: Dict[str, str]):
+        """
+        Remember selectors that worked for a query.
+
+        Args:
+            domain: Site domain
+            query: Natural language query
+            selectors: Field name -> CSS selector
+        """
+        if not self.available:
+            return
+
+        key = self._normalize(query)
+        vector = self._embed(key)
+
+        with self._lock:
+            entries = self._entries.setdefault(domain, OrderedDict())
+            entries[key] = (vector, selectors)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+            self._matrices.pop(domain, None)
@@ -7,11 +7,14 @@ This is the core of SmartScraper. It orchestrates the entire scraping pipeline:
 3. Simple Extraction (regex)
 4. LLM Analysis (if needed)
 """
-from typing import Dict, List, Optional, Callable
+from typing import Dict, Iterator, List, Optional, Callable, Tuple
 from enum import Enum
-import time
 import re
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 from utils.logger import get_logger
 from utils.budget_manager import BudgetManager
@@ -19,11 +22,38 @@ from backend.storage import CacheManager, SelectorManager
 from backend.scrapers import RequestsScraper, SeleniumScraper, PlaywrightScraper
 from backend.scrapers.stealth_playwright_scraper import StealthPlaywrightScraper
 from backend.scrapers.adaptive_scraper import AdaptiveScraper
+from backend.stealth.rate_limiter import TokenBucket
 from backend.extractors import RegexExtractor, BS4Extractor, SmartExtractor
 from backend.llm import ClaudeClient
 
 logger = get_logger(__name__)
 
+# JS framework indicators (lowercase; compared against lowercased HTML)
+JS_INDICATORS = (
+    'react', 'angular', 'vue', 'next.js', 'nuxt', '__next_data__', 'ng-app', 'v-app', 'data-reactroot'
+)
+
+# _detect_javascript lowercases this many chars at a time rather than the
+# whole page; blocks overlap so an indicator split across two is still seen
+JS_SCAN_BLOCK = 65536
+JS_SCAN_OVERLAP = max(map(len, JS_INDICATORS)) - 1
+
+# Pagination markers in a URL, in detection priority order
+_PAGINATION_RE = re.compile(r'(?P<query_param>[?&]page=)|(?P<path>/page/)|(?P<hash>#page=)')
+PAGINATION_PATTERNS = ("query_param", "path", "hash")
+
+# Pieces _generate_paginated_url edits in place instead of a parse/unparse
+_PAGE_PARAM_RE = re.compile(r'([?&])page=[^&]*')
+_PAGE_PATH_RE = re.compile(r'/page/\d+$')
+_URL_TAIL_RE = re.compile(r'[?#]')
+
+# Concurrent page fetches in scrape_with_pagination
+PAGINATION_WORKERS = 8
+
+# In-process memo of result cache lookups, misses included
+CACHE_LOOKUP_SIZE = 2048
+CACHE_LOOKUP_TTL = 60.0
+
 
 class ScrapingMethod(Enum):
     """Scraping method options"""
@@ -66,6 +96,8 @@ class ScraperEngine:
             respect_robots: Respect robots.txt rules
         """
         self.cache_manager = CacheManager()
+        # (url, query) -> (monotonic expiry, cached data or None)
+        self._cache_lookup: "OrderedDict[Tuple[str, str], Tuple[float, Optional[Dict]]]" = OrderedDict()
         self.selector_manager = SelectorManager()
         self.budget_manager = BudgetManager(daily_budget)
         self.stealth_level = stealth_level
@@ -87,6 +119,9 @@ class ScraperEngine:
         self.learned_count = 0
         self.llm_count = 0
 
+        # netloc -> pagination pattern that worked there last time
+        self._winning_pattern: Dict[str, str] = {}
+
     def _update_progress(self, message: str, percentage: int = 0):
         """Update progress via callback"""
         logger.info(f"Progress: {message} ({percentage}%)")
@@ -104,20 +139,12 @@ class ScraperEngine:
             True if JavaScript is likely required
         """
         # Simple heuristic: check for common JS framework indicators
-        js_indicators = [
-            'react',
-            'angular',
-            'vue',
-            'next.js',
-            'nuxt',
-            '__NEXT_DATA__',
-            'ng-app',
-            'v-app',
-            'data-reactroot'
-        ]
-
-        html_lower = html.lower()
-        return any(indicator in html_lower for indicator in js_indicators)
+        for start in range(0, len(html), JS_SCAN_BLOCK):
+            block = html[max(0, start - JS_SCAN_OVERLAP):start + JS_SCAN_BLOCK].lower()
+            if any(indicator in block for indicator in JS_INDICATORS):
+                return True
+
+        return False
 
     def _choose_scraper(
         self,
@@ -165,7 +192,8 @@ class ScraperEngine:
         self,
         url: str,
         query: str,
-        method: ScrapingMethod = ScrapingMethod.AUTO
+        method: ScrapingMethod = ScrapingMethod.AUTO,
+        scraper=None
     ) -> Dict:
         """
         Main scraping method - orchestrates the entire pipeline.
@@ -174,6 +202,8 @@ class ScraperEngine:
             url: Target URL
             query: Natural language query
             method: Scraping method to use
+            scraper: Open scraper to fetch with, left open for the caller
+                (default: a new one for this call)
 
         Returns:
             Dictionary containing:
@@ -187,63 +217,176 @@ class ScraperEngine:
 
         # Phase 1: Check cache
         self._update_progress("Checking cache...", 10)
+        cached_result = self._cached_result(url, query)
+
+        if cached_result:
+            self._update_progress("Cache hit! Returning cached data", 100)
+            return cached_result
+
+        # Phase 2: Fetch HTML
+        self._update_progress(f"Fetching HTML ({method.value})...", 20)
+        html = self._fetch_html(url, method, scraper)
+
+        if not html:
+            return self._fetch_failed(method)
+
+        return self._extract(url, query, html)
+
+    def _cached_result(self, url: str, query: str) -> Optional[Dict]:
+        """
+        Phase 1 of scrape(): look up a cached result.
+
+        Args:
+            url: Target URL
+            query: Natural language query
+
+        Returns:
+            scrape() result on a cache hit, else None
+        """
+        cached_data = self._cached_get(url, query)
+
+        if not cached_data:
+            return None
+
+        return self._cache_hit(url, query, cached_data)
+
+    def _cache_hit(self, url: str, query: str, cached_data: Dict) -> Dict:
+        """
+        Count a cache hit and build its scrape() result.
+
+        Args:
+            url: Target URL
+            query: Natural language query
+            cached_data: Entry from _cached_get
+
+        Returns:
+            scrape() result
+        """
+        logger.info("✓ Cache HIT - returning cached data")
+        self.cached_count += 1
+
+        # Track cache hit
+        self.cache_manager.increment_hit(url, query)
+
+        # Get savings estimate
+        savings = self.cache_manager.get_savings_estimate()
+
+        return {
+            "success": True,
+            "data": cached_data.get("data", []),
+            "cost": 0.0,
+            "method_used": "cache",
+            "cached": True,
+            "message": f"💰 Loaded from cache (€0.00) - Total saved: €{savings['total_savings_eur']}"
+        }
+
+    def _cached_get(self, url: str, query: str) -> Optional[Dict]:
+        """
+        cache_manager.get with a short-lived in-process memo.
+
+        Retries and pattern probes check the same (url, query) repeatedly;
+        both hits and misses are remembered for CACHE_LOOKUP_TTL seconds.
+
+        Args:
+            url: Target URL
+            query: Natural language query
+
+        Returns:
+            Cached data or None
+        """
+        key = (url, query)
+        now = time.monotonic()
+
+        entry = self._cache_lookup.get(key)
+        if entry and entry[0] > now:
+            self._cache_lookup.move_to_end(key)
+            return entry[1]
+
         cached_data = self.cache_manager.get(url, query)
 
-        if cached_data:
-            logger.info("✓ Cache HIT - returning cached data")
-            self.cached_count += 1
+        self._cache_lookup[key] = (now + CACHE_LOOKUP_TTL, cached_data)
+        self._cache_lookup.move_to_end(key)
+        while len(self._cache_lookup) > CACHE_LOOKUP_SIZE:
+            self._cache_lookup.popitem(last=False)
 
-            # Track cache hit
-            self.cache_manager.increment_hit(url, query)
+        return cached_data
 
-            # Get savings estimate
-            savings = self.cache_manager.get_savings_estimate()
+    def _cache_set(self, url: str, query: str, result: Dict):
+        """Store a result and drop its memoized lookup"""
+        self.cache_manager.set(url, query, result)
+        self._cache_lookup.pop((url, query), None)
 
-            self._update_progress("Cache hit! Returning cached data", 100)
+    def _fetch_html(self, url: str, method: ScrapingMethod, scraper=None) -> Optional[str]:
+        """
+        Phase 2 of scrape(): fetch the page.
 
-            return {
-                "success": True,
-                "data": cached_data.get("data", []),
-                "cost": 0.0,
-                "method_used": "cache",
-                "cached": True,
-                "message": f"💰 Loaded from cache (€0.00) - Total saved: €{savings['total_savings_eur']}"
-            }
+        Touches no shared engine state, so pagination runs it in worker
+        threads.
 
-        # Phase 2: Fetch HTML
-        self._update_progress(f"Fetching HTML ({method.value})...", 20)
+        Args:
+            url: Target URL
+            method: Scraping method to use
+            scraper: Open scraper to reuse (default: create one and close
+                it afterwards)
 
-        scraper = None
+        Returns:
+            HTML content or None
+        """
+        owned = scraper is None
         try:
-            scraper = self._choose_scraper(method)
+            if owned:
+                scraper = self._choose_scraper(method)
             html = scraper.fetch(url)
 
-            if not html:
-                return {
-                    "success": False,
-                    "data": [],
-                    "cost": 0.0,
-                    "method_used": method.value,
-                    "cached": False,
-                    "message": "Failed to fetch HTML"
-                }
-
-            logger.info(f"Fetched HTML successfully ({len(html)} chars)")
+            if html:
+                logger.info(f"Fetched HTML successfully ({len(html)} chars)")
+            return html
 
         finally:
-            if scraper:
+            if owned and scraper:
                 scraper.close()
 
+    @staticmethod
+    def _fetch_failed(method: ScrapingMethod) -> Dict:
+        """scrape() result when no HTML could be fetched"""
+        return {
+            "success": False,
+            "data": [],
+            "cost": 0.0,
+            "method_used": method.value,
+            "cached": False,
+            "message": "Failed to fetch HTML"
+        }
+
+    def _extract(self, url: str, query: str, html: str) -> Dict:
+        """
+        Phases 3-5 of scrape(): learned selectors, regex, then LLM.
+
+        Updates the caches, selector store, budget and counters, so it
+        always runs on the calling thread.
+
+        Args:
+            url: Page URL
+            query: Natural language query
+            html: Fetched HTML
+
+        Returns:
+            scrape() result
+        """
         # Phase 3: Check learned selectors
         self._update_progress("Checking learned selectors...", 40)
         learned_selectors = self.selector_manager.get(url, query)
 
+        # Parsed at most once, shared by the learned-selector and LLM phases
+        soup = None
+
         if learned_selectors:
             logger.info("✓ Found learned selectors - extracting data")
             self.learned_count += 1
             self._update_progress("Using learned selectors (free)...", 60)
 
-            data = BS4Extractor.extract_with_selectors(html, learned_selectors)
+            soup = BS4Extractor.parse(html)
+            data = BS4Extractor.extract_with_selectors(soup, learned_selectors)
 
             if data:
                 # Update success count for learned selectors
@@ -262,7 +405,7 @@ class ScraperEngine:
                 }
 
                 # Cache the result
-                self.cache_manager.set(url, query, result)
+                self._cache_set(url, query, result)
                 self._update_progress("Extraction complete!", 100)
 
                 return result
@@ -288,7 +431,7 @@ class ScraperEngine:
                 }
 
                 # Cache the result
-                self.cache_manager.set(url, query, result)
+                self._cache_set(url, query, result)
                 self._update_progress("Extraction complete!", 100)
 
                 return result
@@ -319,7 +462,7 @@ class ScraperEngine:
         logger.info("Using LLM for intelligent extraction")
         self.llm_count += 1
 
-        extraction_result = self.smart_extractor.extract(html, query, url)
+        extraction_result = self.smart_extractor.extract(html, query, url, soup=soup)
 
         if not extraction_result or not extraction_result.get("data"):
             error_msg = "LLM extraction failed"
@@ -361,7 +504,7 @@ class ScraperEngine:
         }
 
         # Cache the result
-        self.cache_manager.set(url, query, result)
+        self._cache_set(url, query, result)
 
         self._update_progress("Extraction complete!", 100)
 
@@ -379,26 +522,26 @@ class ScraperEngine:
         Returns:
             Paginated URL
         """
-        parsed = urlparse(base_url)
-
         if pattern == "query_param" or not pattern:
-            # Try query parameter: ?page=2 or &page=2
-            query_params = parse_qs(parsed.query)
-            query_params['page'] = [str(page)]
-            new_query = urlencode(query_params, doseq=True)
-            return urlunparse((parsed.scheme, parsed.netloc, parsed.path,
-                             parsed.params, new_query, parsed.fragment))
+            # Try query parameter: ?page=2 or &page=2 (replacing any existing one)
+            url, hash_mark, fragment = base_url.partition('#')
+            if _PAGE_PARAM_RE.search(url):
+                url = _PAGE_PARAM_RE.sub(rf'\g<1>page={page}', url, count=1)
+            else:
+                separator = '' if url.endswith(('?', '&')) else ('&' if '?' in url else '?')
+                url = f"{url}{separator}page={page}"
+            return url + hash_mark + fragment
 
         elif pattern == "path":
-            # Try path-based: /page/2 or /2/
-            path = parsed.path.rstrip('/')
-            return urlunparse((parsed.scheme, parsed.netloc, f"{path}/page/{page}",
-                             parsed.params, parsed.query, parsed.fragment))
+            # Try path-based: /page/2 (replacing a trailing /page/N)
+            tail = _URL_TAIL_RE.search(base_url)
+            end = tail.start() if tail else len(base_url)
+            path = _PAGE_PATH_RE.sub('', base_url[:end].rstrip('/'))
+            return f"{path}/page/{page}{base_url[end:]}"
 
         elif pattern == "hash":
             # Try hash-based: #page=2
-            return urlunparse((parsed.scheme, parsed.netloc, parsed.path,
-                             parsed.params, parsed.query, f"page={page}"))
+            return f"{base_url.partition('#')[0]}#page={page}"
 
         return base_url
 
@@ -412,12 +555,11 @@ class ScraperEngine:
         Returns:
             Pattern type or None
         """
-        if '?page=' in url or '&page=' in url:
-            return "query_param"
-        elif '/page/' in url:
-            return "path"
-        elif '#page=' in url:
-            return "hash"
+        found = {match.lastgroup for match in _PAGINATION_RE.finditer(url)}
+
+        for pattern in PAGINATION_PATTERNS:
+            if pattern in found:
+                return pattern
 
         # Default to query param
         return "query_param"
@@ -438,7 +580,7 @@ class ScraperEngine:
             query: What to extract (natural language)
             max_pages: Maximum pages to scrape
             method: Scraping method to use
-            page_delay: Delay between pages in seconds
+            page_delay: Minimum seconds between page request starts
 
         Returns:
             Dictionary containing:
@@ -457,78 +599,125 @@ class ScraperEngine:
         total_cost = 0.0
         method_used = None
 
+        # Page requests start at most once per page_delay, even when
+        # several are in flight
+        bucket = TokenBucket(1.0 / page_delay) if page_delay > 0 else None
+
         # Detect pagination pattern
+        netloc = urlparse(base_url).netloc
         pattern = self._detect_pagination_pattern(base_url)
-        logger.info(f"Detected pagination pattern: {pattern}")
+        seed = self._winning_pattern.get(netloc, pattern)
+        logger.info(f"Detected pagination pattern: {pattern} (trying {seed} first)")
 
-        # Try different pagination patterns
-        patterns_to_try = [pattern, "query_param", "path"]
+        # Known winner first, then the detected pattern and the common fallbacks
+        patterns_to_try = list(dict.fromkeys([seed, pattern, "query_param", "path"]))
 
-        for page in range(1, max_pages + 1):
-            self._update_progress(f"Scraping page {page}/{max_pages}...",
-                                int((page / max_pages) * 90))
+        # One scraper (session, browser settings, per-domain rate limits) for
+        # the sequential pages instead of a fresh one per page
+        scraper = None
+        budget_exceeded = False
+        try:
+            scraper = self._choose_scraper(method)
 
-            # Try each pattern until one works
-            page_success = False
+            # Pages 1 and 2 run one at a time: page 2 settles which pattern works
+            for page in range(1, min(max_pages, 2) + 1):
+                self._update_progress(f"Scraping page {page}/{max_pages}...",
+                                    int((page / max_pages) * 90))
 
-            for pattern_type in patterns_to_try:
-                # Generate URL for this page
-                if page == 1:
-                    page_url = base_url  # First page is usually the base URL
-                else:
-                    page_url = self._generate_paginated_url(base_url, page, pattern_type)
+                # Try each pattern until one works
+                page_success = False
 
-                logger.info(f"Trying page {page} with pattern '{pattern_type}': {page_url}")
+                # First page is usually the base URL, which no pattern changes
+                for pattern_type in (patterns_to_try[:1] if page == 1 else patterns_to_try):
+                    # Generate URL for this page
+                    if page == 1:
+                        page_url = base_url
+                    else:
+                        page_url = self._generate_paginated_url(base_url, page, pattern_type)
 
-                try:
-                    # Scrape this page
-                    result = self.scrape(page_url, query, method)
+                    logger.info(f"Trying page {page} with pattern '{pattern_type}': {page_url}")
+
+                    if bucket:
+                        bucket.acquire()
+
+                    try:
+                        # Scrape this page
+                        result = self.scrape(page_url, query, method, scraper=scraper)
+                    except Exception as e:
+                        logger.warning(f"Page {page} with pattern '{pattern_type}' failed: {e}")
+                        continue
 
                     if result.get("success") and result.get("data"):
                         # Success!
                         page_data = result["data"]
                         page_cost = result.get("cost", 0.0)
 
-                        # Check if page has data
-                        if len(page_data) > 0:
-                            all_data.extend(page_data)
-                            total_cost += page_cost
-                            pages_scraped += 1
-                            method_used = result.get("method_used")
+                        all_data.extend(page_data)
+                        total_cost += page_cost
+                        pages_scraped += 1
+                        method_used = result.get("method_used")
 
-                            logger.info(f"✓ Page {page} success: {len(page_data)} items (€{page_cost:.4f})")
-                            page_success = True
+                        logger.info(f"✓ Page {page} success: {len(page_data)} items (€{page_cost:.4f})")
+                        page_success = True
 
-                            # Remember the working pattern
+                        # Remember the working pattern, here and for this site
+                        if page > 1:
                             pattern = pattern_type
-                            break  # This pattern works, move to next page
-                        else:
-                            # Empty page = end of pagination
-                            logger.info(f"Page {page} returned no data - end of pagination")
-                            self._update_progress(f"Completed: reached last page at page {page-1}", 100)
-
-                            return {
-                                "success": True,
-                                "data": all_data,
-                                "pages_scraped": pages_scraped,
-                                "total_cost": total_cost,
-                                "method_used": method_used or method.value,
-                                "message": f"✓ Scraped {pages_scraped} pages, {len(all_data)} total items (€{total_cost:.4f})"
-                            }
+                            patterns_to_try = [pattern_type]
+                            self._winning_pattern[netloc] = pattern_type
+                        break  # This pattern works, move to next page
 
-                except Exception as e:
-                    logger.warning(f"Page {page} with pattern '{pattern_type}' failed: {e}")
-                    continue
+                    # A cached result is for this exact URL; no other pattern
+                    # produced it, so trying them tells us nothing new
+                    if result.get("method_used") == "cache":
+                        break
+
+                    # Out of budget: later patterns and pages would fail the same way
+                    if result.get("method_used") == "none" and self.budget_manager.is_budget_exceeded():
+                        logger.warning(f"Budget exceeded at page {page} - stopping pagination")
+                        budget_exceeded = True
+                        break
+
+                    logger.info(f"Page {page} with pattern '{pattern_type}' failed: {result.get('message')}")
+
+                if budget_exceeded:
+                    break
 
-            # If no pattern worked for this page, stop
-            if not page_success:
-                logger.info(f"Page {page} failed with all patterns - stopping pagination")
-                break
+                # If no pattern worked for this page, stop
+                if not page_success:
+                    logger.info(f"Page {page} failed with all patterns - stopping pagination")
+                    break
 
-            # Delay between pages (except after last page)
-            if page < max_pages:
-                logger.info(f"Waiting {page_delay}s before next page...")
-                time.sleep(page_delay)
+        except Exception as e:
+            logger.warning(f"Pagination scrape failed: {e}")
+
+        finally:
+            if scraper:
+                scraper.close()
+
+        # Remaining pages: fetches overlap in a thread pool, extraction (caches,
+        # LLM, budget) stays on this thread and runs in page order
+        if pages_scraped == 2 and max_pages > 2:
+            for page, result in self._scrape_pages_concurrently(
+                base_url, query, range(3, max_pages + 1), pattern, method, bucket
+            ):
+                self._update_progress(f"Scraping page {page}/{max_pages}...",
+                                    int((page / max_pages) * 90))
+
+                if not (result and result.get("success") and result.get("data")):
+                    # Empty page = end of pagination
+                    logger.info(f"Page {page} returned no data - end of pagination")
+                    break
+
+                page_data = result["data"]
+                page_cost = result.get("cost", 0.0)
+
+                all_data.extend(page_data)
+                total_cost += page_cost
+                pages_scraped += 1
+                method_used = result.get("method_used")
+
+                logger.info(f"✓ Page {page} success: {len(page_data)} items (€{page_cost:.4f})")
 
         # Final result
         self._update_progress(f"Pagination complete!", 100)
@@ -552,6 +741,88 @@ class ScraperEngine:
                 "message": "Failed to scrape any pages"
             }
 
+    def _scrape_pages_concurrently(
+        self,
+        base_url: str,
+        query: str,
+        pages: range,
+        pattern: str,
+        method: ScrapingMethod,
+        bucket: Optional[TokenBucket]
+    ) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """
+        Scrape pages with a known URL pattern, fetching them in parallel.
+
+        Cached pages are looked up front; the rest are fetched by up to
+        PAGINATION_WORKERS threads. Results are yielded in page order, and
+        fetches still queued when the caller stops iterating are cancelled.
+
+        Args:
+            base_url: Base URL
+            query: Natural language query
+            pages: Page numbers, ascending
+            pattern: Pagination pattern that worked for page 2
+            method: Scraping method to use
+            bucket: Shared politeness limit (None for no delay)
+
+        Yields:
+            (page number, scrape() result or None if the page failed)
+        """
+        # Scrapers aren't thread-safe (Selenium drivers), so each worker
+        # thread opens one on first use and keeps it for its later pages
+        local = threading.local()
+        scrapers = []
+        scrapers_lock = threading.Lock()
+
+        def fetch(page_url: str) -> Optional[str]:
+            scraper = getattr(local, "scraper", None)
+            if scraper is None:
+                scraper = local.scraper = self._choose_scraper(method)
+                with scrapers_lock:
+                    scrapers.append(scraper)
+
+            if bucket:
+                bucket.acquire()
+            return self._fetch_html(page_url, method, scraper)
+
+        urls = {page: self._generate_paginated_url(base_url, page, pattern) for page in pages}
+        # Hits are only counted for pages actually yielded
+        cached = {page: self._cached_get(page_url, query) for page, page_url in urls.items()}
+        to_fetch = [page for page in urls if not cached[page]]
+
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(len(to_fetch), PAGINATION_WORKERS)),
+            thread_name_prefix="page"
+        )
+        try:
+            fetches = {page: pool.submit(fetch, urls[page]) for page in to_fetch}
+
+            for page, page_url in urls.items():
+                logger.info(f"Page {page} with pattern '{pattern}': {page_url}")
+
+                if cached[page]:
+                    yield page, self._cache_hit(page_url, query, cached[page])
+                    continue
+
+                try:
+                    html = fetches[page].result()
+                    result = self._extract(page_url, query, html) if html else None
+                except Exception as e:
+                    logger.warning(f"Page {page} with pattern '{pattern}' failed: {e}")
+                    result = None
+
+                yield page, result
+
+        finally:
+            # Fetches already running are waited for (and discarded) so
+            # their scrapers can be closed
+            pool.shutdown(wait=True, cancel_futures=True)
+            for scraper in scrapers:
+                try:
+                    scraper.close()
+                except Exception as e:
+                    logger.warning(f"Error closing scraper: {e}")
+
     def get_stats(self) -> Dict:
         """Get engine statistics"""
         return {
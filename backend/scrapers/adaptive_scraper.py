@@ -3,7 +3,9 @@ Adaptive Scraper
 Automatically selects the best scraping method based on page characteristics
 """
 import logging
-from typing import Optional, Dict
+import re
+from functools import lru_cache
+from typing import Callable, Optional, Dict, Tuple
 from urllib.parse import urlparse
 from .base_scraper import BaseScraper
 from .requests_scraper import RequestsScraper
@@ -13,6 +15,100 @@ from .stealth_playwright_scraper import StealthPlaywrightScraper
 
 logger = logging.getLogger(__name__)
 
+# JS framework indicators; compared lowercased against a lowercased prefix
+JS_INDICATORS = (
+    '<script',
+    'react',
+    'angular',
+    'vue',
+    'next.js',
+    'nuxt',
+    '__NEXT_DATA__',
+    'ng-app',
+    'v-app',
+    'data-reactroot',
+    'data-react-helmet',
+    'gatsby'
+)
+_JS_INDICATORS_LOWER = tuple(indicator.lower() for indicator in JS_INDICATORS)
+
+ANTI_BOT_INDICATORS = (
+    'cloudflare',
+    'captcha',
+    'recaptcha',
+    'hcaptcha',
+    'datadome',
+    'perimeter',
+    'imperva',
+    'blocked',
+    'access denied',
+    'challenge',
+    'bot detection'
+)
+
+# Content tag openings ('<p' also covers '<pre' etc.)
+CONTENT_TAGS = ('<p', '<div', '<article', '<section', '<main')
+
+# Content check lowercases and scans the page this many chars at a time,
+# overlapping by CONTENT_BLOCK_OVERLAP so a tag split across blocks is seen
+CONTENT_BLOCK = 8192
+CONTENT_BLOCK_OVERLAP = max(map(len, CONTENT_TAGS)) - 1
+
+
+# Known JS-heavy domains
+JS_HEAVY_DOMAINS = (
+    'angular',
+    'react',
+    'vue',
+    'next',
+    'nuxt',
+    'gatsby',
+    'svelte'
+)
+
+# Known anti-bot domains
+PROTECTED_DOMAINS = (
+    'cloudflare',
+    'datadome',
+    'perimeter',
+    'imperva',
+    'akamai'
+)
+
+# Fast static sites
+STATIC_DOMAINS = (
+    'wikipedia',
+    'github',
+    'stackoverflow',
+    'reddit'
+)
+
+# All three lists in one pass; a lookahead per position so a substring of
+# one list can't hide an overlapping one from another
+_DOMAIN_RE = re.compile('(?=' + '|'.join(
+    f"(?P<{group}>" + '|'.join(map(re.escape, names)) + ')'
+    for group, names in (
+        ('is_static', STATIC_DOMAINS),
+        ('is_js_heavy', JS_HEAVY_DOMAINS),
+        ('is_protected', PROTECTED_DOMAINS)
+    )
+) + ')')
+
+
+@lru_cache(maxsize=512)
+def _classify_domain(netloc: str) -> Tuple[bool, bool, bool]:
+    """
+    Match a host against the domain lists.
+
+    Args:
+        netloc: Lowercased URL netloc
+
+    Returns:
+        (is_static, is_js_heavy, is_protected)
+    """
+    found = {match.lastgroup for match in _DOMAIN_RE.finditer(netloc)}
+    return 'is_static' in found, 'is_js_heavy' in found, 'is_protected' in found
+
 
 class AdaptiveScraper(BaseScraper):
     """
@@ -25,33 +121,10 @@ class AdaptiveScraper(BaseScraper):
     4. Fallback to Selenium if needed
     """
 
-    # Known JS-heavy domains
-    JS_HEAVY_DOMAINS = [
-        'angular',
-        'react',
-        'vue',
-        'next',
-        'nuxt',
-        'gatsby',
-        'svelte'
-    ]
-
-    # Known anti-bot domains
-    PROTECTED_DOMAINS = [
-        'cloudflare',
-        'datadome',
-        'perimeter',
-        'imperva',
-        'akamai'
-    ]
-
-    # Fast static sites
-    STATIC_DOMAINS = [
-        'wikipedia',
-        'github',
-        'stackoverflow',
-        'reddit'
-    ]
+    # Aliases of the module-level domain lists
+    JS_HEAVY_DOMAINS = JS_HEAVY_DOMAINS
+    PROTECTED_DOMAINS = PROTECTED_DOMAINS
+    STATIC_DOMAINS = STATIC_DOMAINS
 
     def __init__(
         self,
@@ -74,22 +147,38 @@ class AdaptiveScraper(BaseScraper):
         self.use_proxies = use_proxies
         self.respect_robots = respect_robots
 
-        # Initialize all scrapers
-        self.scrapers = {
-            'requests': RequestsScraper(timeout),
-            'playwright': PlaywrightScraper(timeout),
-            'selenium': SeleniumScraper(timeout),
-            'stealth': StealthPlaywrightScraper(
+        # Scrapers are built on first use; most pages never leave 'requests'
+        self._factories: Dict[str, Callable[[], BaseScraper]] = {
+            'requests': lambda: RequestsScraper(timeout),
+            'playwright': lambda: PlaywrightScraper(timeout),
+            'selenium': lambda: SeleniumScraper(timeout),
+            'stealth': lambda: StealthPlaywrightScraper(
                 timeout=timeout,
                 stealth_level=stealth_level,
                 use_proxies=use_proxies,
                 respect_robots=respect_robots
             )
         }
+        self._scrapers: Dict[str, BaseScraper] = {}
 
         self.current_scraper = None
         logger.info("AdaptiveScraper initialized")
 
+    def _get(self, name: str) -> BaseScraper:
+        """
+        Get a scraper by name, creating it on first use.
+
+        Args:
+            name: 'requests', 'playwright', 'selenium' or 'stealth'
+
+        Returns:
+            Scraper instance
+        """
+        scraper = self._scrapers.get(name)
+        if scraper is None:
+            scraper = self._scrapers[name] = self._factories[name]()
+        return scraper
+
     def _analyze_domain(self, url: str) -> Dict[str, bool]:
         """
         Analyze domain to determine characteristics.
@@ -101,11 +190,12 @@ class AdaptiveScraper(BaseScraper):
             Dictionary with domain characteristics
         """
         domain = urlparse(url).netloc.lower()
+        is_static, is_js_heavy, is_protected = _classify_domain(domain)
 
         analysis = {
-            'is_static': any(d in domain for d in self.STATIC_DOMAINS),
-            'is_js_heavy': any(d in domain for d in self.JS_HEAVY_DOMAINS),
-            'is_protected': any(d in domain for d in self.PROTECTED_DOMAINS),
+            'is_static': is_static,
+            'is_js_heavy': is_js_heavy,
+            'is_protected': is_protected,
             'needs_stealth': False
         }
 
@@ -129,26 +219,17 @@ class AdaptiveScraper(BaseScraper):
         if not html:
             return False
 
-        js_indicators = [
-            '<script',
-            'react',
-            'angular',
-            'vue',
-            'next.js',
-            'nuxt',
-            '__NEXT_DATA__',
-            'ng-app',
-            'v-app',
-            'data-reactroot',
-            'data-react-helmet',
-            'gatsby'
-        ]
-
         html_lower = html[:5000].lower()  # Check first 5KB
-        js_count = sum(1 for indicator in js_indicators if indicator in html_lower)
 
-        # If 3+ indicators, likely needs JS
-        return js_count >= 3
+        # If 3+ indicators, likely needs JS; stop at the third
+        js_count = 0
+        for indicator in _JS_INDICATORS_LOWER:
+            if indicator in html_lower:
+                js_count += 1
+                if js_count >= 3:
+                    return True
+
+        return False
 
     def _detect_anti_bot(self, html: str) -> bool:
         """
@@ -163,22 +244,8 @@ class AdaptiveScraper(BaseScraper):
         if not html:
             return False
 
-        anti_bot_indicators = [
-            'cloudflare',
-            'captcha',
-            'recaptcha',
-            'hcaptcha',
-            'datadome',
-            'perimeter',
-            'imperva',
-            'blocked',
-            'access denied',
-            'challenge',
-            'bot detection'
-        ]
-
         html_lower = html[:3000].lower()  # Check first 3KB
-        return any(indicator in html_lower for indicator in anti_bot_indicators)
+        return any(indicator in html_lower for indicator in ANTI_BOT_INDICATORS)
 
     def _has_sufficient_content(self, html: str) -> bool:
         """
@@ -197,11 +264,15 @@ class AdaptiveScraper(BaseScraper):
         if len(html) < 500:
             return False
 
-        # Check for common content indicators
-        content_indicators = ['<p', '<div', '<article', '<section', '<main']
-        content_count = sum(1 for indicator in content_indicators if indicator in html.lower())
+        # Need 3 of the content tag types; stop scanning as soon as they're seen
+        content_tags = set()
+        for start in range(0, len(html), CONTENT_BLOCK):
+            block = html[max(0, start - CONTENT_BLOCK_OVERLAP):start + CONTENT_BLOCK].lower()
+            content_tags.update(tag for tag in CONTENT_TAGS if tag not in content_tags and tag in block)
+            if len(content_tags) >= 3:
+                return True
 
-        return content_count >= 3
+        return False
 
     def fetch(self, url: str) -> Optional[str]:
         """
@@ -221,7 +292,7 @@ class AdaptiveScraper(BaseScraper):
         # Strategy 1: Known static site -> Use Requests
         if domain_info['is_static']:
             logger.info("→ Using Requests (known static site)")
-            self.current_scraper = self.scrapers['requests']
+            self.current_scraper = self._get('requests')
             html = self.current_scraper.fetch(url)
 
             if html and self._has_sufficient_content(html):
@@ -230,27 +301,27 @@ class AdaptiveScraper(BaseScraper):
         # Strategy 2: Protected site -> Use Stealth
         if domain_info['needs_stealth']:
             logger.info("→ Using Stealth (protected site or high stealth level)")
-            self.current_scraper = self.scrapers['stealth']
+            self.current_scraper = self._get('stealth')
             return self.current_scraper.fetch(url)
 
         # Strategy 3: Try Requests first (fastest)
         logger.info("→ Trying Requests first...")
-        self.current_scraper = self.scrapers['requests']
+        self.current_scraper = self._get('requests')
         html = self.current_scraper.fetch(url)
 
         if html:
             # Check for anti-bot
             if self._detect_anti_bot(html):
                 logger.info("  ⚠️ Anti-bot detected, switching to Stealth")
-                self.scrapers['requests'].close()
-                self.current_scraper = self.scrapers['stealth']
+                self._get('requests').close()
+                self.current_scraper = self._get('stealth')
                 return self.current_scraper.fetch(url)
 
             # Check if JS is needed
             if self._detect_javascript(html):
                 logger.info("  ⚠️ JavaScript detected, switching to Playwright")
-                self.scrapers['requests'].close()
-                self.current_scraper = self.scrapers['playwright']
+                self._get('requests').close()
+                self.current_scraper = self._get('playwright')
                 return self.current_scraper.fetch(url)
 
             # Check content sufficiency
@@ -260,8 +331,8 @@ class AdaptiveScraper(BaseScraper):
 
         # Strategy 4: Fallback to Playwright
         logger.info("→ Falling back to Playwright...")
-        self.scrapers['requests'].close()
-        self.current_scraper = self.scrapers['playwright']
+        self._get('requests').close()
+        self.current_scraper = self._get('playwright')
         html = self.current_scraper.fetch(url)
 
         if html and self._has_sufficient_content(html):
@@ -270,25 +341,19 @@ class AdaptiveScraper(BaseScraper):
         # Strategy 5: Last resort - Selenium
         logger.info("→ Last resort: Selenium...")
         self.current_scraper.close()
-        self.current_scraper = self.scrapers['selenium']
+        self.current_scraper = self._get('selenium')
         return self.current_scraper.fetch(url)
 
     def get_method_used(self) -> str:
         """Get the method that was actually used"""
-        if self.current_scraper == self.scrapers['requests']:
-            return "adaptive_requests"
-        elif self.current_scraper == self.scrapers['playwright']:
-            return "adaptive_playwright"
-        elif self.current_scraper == self.scrapers['selenium']:
-            return "adaptive_selenium"
-        elif self.current_scraper == self.scrapers['stealth']:
-            return "adaptive_stealth"
-        else:
-            return "adaptive_unknown"
+        for name, scraper in self._scrapers.items():
+            if self.current_scraper is scraper:
+                return f"adaptive_{name}"
+        return "adaptive_unknown"
 
     def close(self):
-        """Close all scrapers"""
-        for scraper in self.scrapers.values():
+        """Close the scrapers that were created"""
+        for scraper in self._scrapers.values():
             try:
                 scraper.close()
             except:
@@ -185,14 +185,14 @@ class StealthPlaywrightScraper(BaseScraper):
                     return None
 
             # Check for CAPTCHA
-            captcha_result = CaptchaDetector.detect_in_page(page)
+            captcha_result = CaptchaDetector.detect_in_page(page, html=html)
             if captcha_result['detected']:
                 logger.warning(f"CAPTCHA detected: {captcha_result['types']}")
 
                 if self.stealth_level == 'maximum':
                     # Allow manual solving
                     logger.info("Attempting manual CAPTCHA solving...")
-                    if ManualCaptchaSolver.solve_with_browser(page, timeout=300):
+                    if ManualCaptchaSolver.solve_with_browser(page, timeout=300, detection=captcha_result):
                         html = page.content()
                     else:
                         logger.error("CAPTCHA not solved")
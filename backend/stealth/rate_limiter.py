@@ -1,6 +1,8 @@
 """
 Rate Limiter - Prevents too many requests to same domain
 """
+import asyncio
+import threading
 import time
 import random
 from datetime import datetime
@@ -117,4 +119,74 @@ class RateLimiter:
         return {
             "domains_tracked": len(self.last_request),
             "total_requests": sum(len(counts) for counts in self.request_counts.values())
-        }
\ No newline at end of file
+        }
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio code.
+
+    Callers reserve a token up front and sleep until it is due, so
+    concurrent tasks get evenly spaced slots instead of all reading the
+    same "last request" time and firing together.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        """Take one token, waiting until it is available"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        # Reserve now; a negative balance is this caller's place in line
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Same reservation scheme as AsyncTokenBucket, for worker threads: the
+    lock only covers the bookkeeping, each caller sleeps on its own.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, waiting until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
@@ -57,6 +57,18 @@ class RobotsParser:
 
         return allowed
 
+    def is_loaded(self, url: str) -> bool:
+        """
+        Check whether can_fetch() can answer without network I/O.
+
+        Args:
+            url: Target URL
+
+        Returns:
+            True if robots.txt is disabled or already loaded for the domain
+        """
+        return not self.respect_robots or get_domain(url) in self.parsers
+
     def _load_robots(self, url: str):
         """Load robots.txt for domain"""
         domain = get_domain(url)
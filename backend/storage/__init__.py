@@ -2,4 +2,5 @@
 from .cache_manager import CacheManager
 from .learned_selectors import SelectorManager
 from .cookie_manager import CookieManager
-from .session_manager import SessionManager
\ No newline at end of file
+from .session_manager import SessionManager
+from .selector_cache import StructuralSelectorCache
@@ -0,0 +1,204 @@
+"""
+Structural Selector Cache
+Two-tier cache (in-process LRU + sqlite) of LLM-found selectors, keyed by
+domain, query and a fingerprint of the page layout
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+from bs4 import BeautifulSoup
+from config.settings import DATA_DIR, SELECTOR_CACHE_EXPIRY_DAYS
+from utils.logger import get_logger
+from utils.helpers import get_domain
+
+logger = get_logger(__name__)
+
+MEMORY_CACHE_SIZE = 512
+DISK_CACHE_SIZE = 10000
+DISK_EVICT_BATCH = 100
+NEGATIVE_CACHE_SIZE = 2048
+NEGATIVE_CACHE_TTL = 3600
+
+
+def structural_fingerprint(soup: BeautifulSoup) -> str:
+    """
+    Fingerprint of a page's layout, ignoring text and content.
+
+    Built from the set of distinct tag.class combinations, so pages of one
+    template hash the same even when they list a different number of items.
+
+    Args:
+        soup: Parsed document
+
+    Returns:
+        32-char hex digest
+    """
+    shapes = {
+        tag.name + "." + ".".join(sorted(tag.get("class") or ()))
+        for tag in soup.find_all(True)
+    }
+    return hashlib.blake2b("\n".join(sorted(shapes)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class StructuralSelectorCache:
+    """Caches selectors per (domain, query, layout fingerprint)"""
+
+    def __init__(self, db_file: Path = None, memory_size: int = MEMORY_CACHE_SIZE):
+        """
+        Initialize selector cache.
+
+        Args:
+            db_file: sqlite file (default: data/selector_cache.db)
+            memory_size: Entries kept in the in-process LRU
+        """
+        self.db_file = db_file or DATA_DIR / "selector_cache.db"
+        self.memory_size = memory_size
+        self.ttl_seconds = SELECTOR_CACHE_EXPIRY_DAYS * 86400
+
+        self._memory: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # key -> monotonic time of the last failed LLM lookup (memory only)
+        self._failures: "OrderedDict[str, float]" = OrderedDict()
+
+        self._db = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS selectors ("
+            "key TEXT PRIMARY KEY, selectors_json TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL, hit_count INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(url: str, query: str, soup: BeautifulSoup) -> str:
+        """
+        Cache key for a page + query.
+
+        Args:
+            url: Page URL
+            query: Natural language query
+            soup: Parsed page
+
+        Returns:
+            Key string
+        """
+        return f"{get_domain(url)}|{query.strip().lower()}|{structural_fingerprint(soup)}"
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        Look up selectors.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Selectors dict or None
+        """
+        with self._lock:
+            selectors = self._memory.get(key)
+            if selectors is not None:
+                self._memory.move_to_end(key)
+                return selectors
+
+            row = self._db.execute(
+                "SELECT selectors_json, created_at FROM selectors WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+
+            if time.time() - row[1] > self.ttl_seconds:
+                self._db.execute("DELETE FROM selectors WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+
+            selectors = json.loads(row[0])
+            self._remember(key, selectors)
+            self._touch(key)
+            return selectors
+
+    def put(self, key: str, selectors: Dict[str, str]):
+        """
+        Store selectors that produced data.
+
+        Args:
+            key: Key from make_key()
+            selectors: Field name -> CSS selector
+        """
+        now = time.time()
+
+        with self._lock:
+            self._failures.pop(key, None)
+            self._remember(key, selectors)
+            self._db.execute(
+                "INSERT OR REPLACE INTO selectors (key, selectors_json, created_at, last_used, hit_count) "
+                "VALUES (?, ?, ?, ?, 0)",
+                (key, json.dumps(selectors, ensure_ascii=False), now, now)
+            )
+
+            # Drop the least recently used rows in one go when over capacity
+            count = self._db.execute("SELECT COUNT(*) FROM selectors").fetchone()[0]
+            if count > DISK_CACHE_SIZE:
+                self._db.execute(
+                    "DELETE FROM selectors WHERE key IN "
+                    "(SELECT key FROM selectors ORDER BY last_used LIMIT ?)",
+                    (max(DISK_EVICT_BATCH, count - DISK_CACHE_SIZE),)
+                )
+            self._db.commit()
+
+    def mark_failed(self, key: str):
+        """
+        Record that the LLM's selectors found nothing for this key, so
+        repeats within NEGATIVE_CACHE_TTL skip the API call.
+
+        Args:
+            key: Key from make_key()
+        """
+        with self._lock:
+            self._failures[key] = time.monotonic()
+            self._failures.move_to_end(key)
+            while len(self._failures) > NEGATIVE_CACHE_SIZE:
+                self._failures.popitem(last=False)
+
+    def recently_failed(self, key: str) -> bool:
+        """
+        Check for a failed lookup within NEGATIVE_CACHE_TTL.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            True if the key failed recently
+        """
+        with self._lock:
+            failed_at = self._failures.get(key)
+            if failed_at is None:
+                return False
+
+            if time.monotonic() - failed_at > NEGATIVE_CACHE_TTL:
+                del self._failures[key]
+                return False
+            return True
+
+    def _remember(self, key: str, selectors: Dict[str, str]):
+        """Insert into the memory LRU (caller holds the lock)"""
+        self._memory[key] = selectors
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _touch(self, key: str):
+        """Record a hit on disk (caller holds the lock)"""
+        self._db.execute(
+            "UPDATE selectors SET hit_count = hit_count + 1, last_used = ? WHERE key = ?",
+            (time.time(), key)
+        )
+        self._db.commit()
+
+    def close(self):
+        """Close the database"""
+        self._db.close()
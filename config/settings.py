@@ -16,22 +16,31 @@ COOKIES_DIR = DATA_DIR / "cookies"
 SESSIONS_DIR = DATA_DIR / "sessions"
 SCREENSHOTS_DIR = DATA_DIR / "screenshots"
 EXPORTS_DIR = DATA_DIR / "exports"
+BROWSER_PROFILES_DIR = DATA_DIR / "browser_profiles"
 LOG_FILE = DATA_DIR / "app.log"
 
 # Create directories
-for directory in [DATA_DIR, COOKIES_DIR, SESSIONS_DIR, SCREENSHOTS_DIR, EXPORTS_DIR]:
+for directory in [DATA_DIR, COOKIES_DIR, SESSIONS_DIR, SCREENSHOTS_DIR, EXPORTS_DIR, BROWSER_PROFILES_DIR]:
     directory.mkdir(exist_ok=True)
 
 # API Configuration
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 CLAUDE_MODEL = "claude-sonnet-4-20250514"
-CLAUDE_HAIKU_MODEL = "claude-haiku-3-5-20241022"  # Future feature for simple tasks
+CLAUDE_HAIKU_MODEL = "claude-haiku-4-5"  # Selector discovery; Sonnet is the fallback
+CLAUDE_MAX_CONCURRENCY = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "8"))  # Async requests in flight
+CLAUDE_RPM_LIMIT = int(os.getenv("CLAUDE_RPM_LIMIT", "50"))  # Requests per minute for this account tier (0 = off)
+CLAUDE_TPM_LIMIT = int(os.getenv("CLAUDE_TPM_LIMIT", "30000"))  # Input tokens per minute (0 = off)
+CLAUDE_HTTP_BACKEND = os.getenv("CLAUDE_HTTP_BACKEND", "requests")  # "curl_cffi": libcurl + HTTP/2 for message requests
+CLAUDE_GZIP_REQUESTS = os.getenv("CLAUDE_GZIP_REQUESTS", "").lower() in ("1", "true", "yes")  # gzip request bodies (endpoint must accept Content-Encoding)
 
 # API Cost Estimates (per million tokens)
 SONNET_INPUT_COST = 3.0  # $3 per million input tokens
 SONNET_OUTPUT_COST = 15.0  # $15 per million output tokens
-HAIKU_INPUT_COST = 0.8  # $0.80 per million input tokens
-HAIKU_OUTPUT_COST = 4.0  # $4 per million output tokens
+HAIKU_INPUT_COST = 1.0  # $1 per million input tokens
+HAIKU_OUTPUT_COST = 5.0  # $5 per million output tokens
+CACHE_READ_MULTIPLIER = 0.1  # Prompt-cache reads bill at 10% of input price
+CACHE_WRITE_MULTIPLIER = 1.25  # Prompt-cache writes (5 min TTL) bill at 125%
+BATCH_COST_MULTIPLIER = 0.5  # Message Batches API bills at 50%
 
 # Budget Configuration
 DEFAULT_DAILY_BUDGET = 5.0  # €5 default budget
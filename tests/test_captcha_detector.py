@@ -0,0 +1,54 @@
+"""
+Test CAPTCHA Detector
+"""
+import sys
+sys.path.insert(0, '..')
+
+from backend.captcha import indicator_scanner
+from backend.captcha.captcha_detector import CaptchaDetector
+from backend.captcha.cloudflare_handler import CloudflareHandler
+
+
+def test_prefilter_covers_all_indicators():
+    """Every indicator must contain a prefilter trigger, or detect() would miss it"""
+    for captcha_type in indicator_scanner.CAPTCHA_TYPES:
+        for indicator in indicator_scanner.INDICATORS_LOWER[captcha_type]:
+            assert any(trigger in indicator for trigger in indicator_scanner.CAPTCHA_PREFILTER), \
+                f"{captcha_type} indicator {indicator!r} not covered by prefilter"
+
+
+def test_detect_types():
+    """Detection is case-insensitive and reports every matching type"""
+    result = CaptchaDetector.detect('<div class="G-Recaptcha" data-sitekey="x"></div>')
+
+    assert result['detected']
+    assert result['types'] == ['recaptcha', 'generic']
+    assert result['primary_type'] == 'recaptcha'
+
+    assert CaptchaDetector.detect(b'<title>Just a moment...</title><div id="cf_chl_opt">')['types'] == ['cloudflare']
+
+
+def test_clean_page():
+    """Pages without indicators are not flagged"""
+    html = "<html><body><h1>Products</h1><p>Price: 19.99</p></body></html>"
+
+    assert CaptchaDetector.detect(html) == {'detected': False, 'types': [], 'primary_type': None}
+    assert not CaptchaDetector.is_blocked(html)
+    assert CaptchaDetector.is_blocked("<h1>403 Forbidden</h1>")
+    assert not CloudflareHandler.detect_cloudflare(html)
+
+
+def test_scan_tags():
+    """One scan reports CAPTCHA, blocking and Cloudflare tags together"""
+    tags = indicator_scanner.scan("<h1>Access Denied</h1><!-- cf-ray: 123 --><div class='h-captcha'>")
+
+    assert tags == {'hcaptcha', 'generic', indicator_scanner.TAG_BLOCKED, indicator_scanner.TAG_CLOUDFLARE}
+    assert indicator_scanner.captcha_types(tags) == ['hcaptcha', 'generic']
+
+
+if __name__ == "__main__":
+    test_prefilter_covers_all_indicators()
+    test_detect_types()
+    test_clean_page()
+    test_scan_tags()
+    print("\n✅ All CAPTCHA detector tests passed!")
@@ -0,0 +1,33 @@
+"""
+Test Data Exporter
+"""
+import sys
+sys.path.insert(0, '..')
+
+from datetime import datetime
+
+import openpyxl
+
+from backend.exporters.data_exporter import DataExporter
+
+
+def test_excel_nan_and_datetime(tmp_path):
+    """NaN/inf rows export without errors and datetimes stay dates"""
+    exporter = DataExporter(tmp_path)
+    when = datetime(2024, 1, 1, 12, 30)
+    data = [
+        {"a": float('nan'), "b": "x", "c": when},
+        {"a": 1.5, "b": float('inf'), "c": None},
+    ]
+
+    file_path = exporter.export_excel(data, tmp_path / "rows.xlsx")
+
+    sheet = openpyxl.load_workbook(file_path).active
+    rows = list(sheet.iter_rows(values_only=True))
+
+    assert rows[0] == ("a", "b", "c")
+    assert rows[1] == (None, "x", when)
+    assert sheet["C2"].number_format == "yyyy-mm-dd hh:mm:ss"
+
+    # inf is written as Excel's #DIV/0! error
+    assert rows[2] == (1.5, "=1/0", None)
@@ -0,0 +1,150 @@
+"""
+Bloom Filter - Compact probabilistic set for URL dedup on huge crawls
+"""
+import hashlib
+import math
+from collections import OrderedDict
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Membership tests can return false positives (at roughly the configured
+    rate) but never false negatives. Memory is about 1.8 bytes per expected
+    item at a 0.1% error rate, against ~200 bytes per entry in a set of URLs.
+    """
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.001):
+        """
+        Initialize Bloom filter.
+
+        Args:
+            expected_items: Number of items the filter is sized for
+            false_positive_rate: Target false positive rate at that size
+        """
+        expected_items = max(1, expected_items)
+        self.capacity = expected_items
+
+        self.size = max(8, math.ceil(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / expected_items * math.log(2)))
+
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str):
+        """Bit positions for item (double hashing over one 128-bit digest)"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str):
+        """Add item to the filter"""
+        is_new = False
+        for pos in self._positions(item):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                is_new = True
+
+        if is_new:
+            self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self) -> int:
+        """Approximate number of distinct items added"""
+        return self._count
+
+    def clear(self):
+        """Remove all items"""
+        self._bits = bytearray(len(self._bits))
+        self._count = 0
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows instead of saturating.
+
+    Items go into the newest BloomFilter slice; once it holds its planned
+    capacity, a slice twice as large with half the error rate is added.
+    The combined false positive rate therefore stays under
+    false_positive_rate however many items arrive. The most recently
+    added or matched items are also kept exactly in a bounded LRU, so
+    links repeated on every page (navigation, footers) skip hashing.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(
+        self,
+        initial_capacity: int,
+        false_positive_rate: float = 0.001,
+        exact_cache_size: int = 10000
+    ):
+        """
+        Initialize scalable Bloom filter.
+
+        Args:
+            initial_capacity: Items the first slice is sized for
+            false_positive_rate: Upper bound on the overall false positive rate
+            exact_cache_size: Recent items kept exactly in the LRU
+        """
+        self.initial_capacity = max(1, initial_capacity)
+        self.false_positive_rate = false_positive_rate
+        self.exact_cache_size = exact_cache_size
+
+        self._slices = []
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._add_slice()
+
+    def _add_slice(self):
+        """Start a new, larger and tighter slice"""
+        n = len(self._slices)
+        # Slice error rates form a geometric series summing to the target
+        rate = self.false_positive_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** n
+        self._slices.append(BloomFilter(self.initial_capacity * self.GROWTH ** n, rate))
+
+    def _remember(self, item: str):
+        """Insert into the exact LRU"""
+        self._recent[item] = None
+        self._recent.move_to_end(item)
+        if len(self._recent) > self.exact_cache_size:
+            self._recent.popitem(last=False)
+
+    def add(self, item: str):
+        """Add item to the filter"""
+        if item in self:
+            return
+
+        current = self._slices[-1]
+        if len(current) >= current.capacity:
+            self._add_slice()
+            current = self._slices[-1]
+
+        current.add(item)
+        self._remember(item)
+
+    def __contains__(self, item: str) -> bool:
+        if item in self._recent:
+            self._recent.move_to_end(item)
+            return True
+
+        # Newest slice first: recently added items are the likeliest hits
+        if any(item in bloom for bloom in reversed(self._slices)):
+            self._remember(item)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        """Approximate number of distinct items added"""
+        return sum(len(bloom) for bloom in self._slices)
+
+    def clear(self):
+        """Remove all items"""
+        self._slices = []
+        self._recent.clear()
+        self._add_slice()
@@ -12,7 +12,9 @@ from config.settings import (
     SONNET_INPUT_COST,
     SONNET_OUTPUT_COST,
     HAIKU_INPUT_COST,
-    HAIKU_OUTPUT_COST
+    HAIKU_OUTPUT_COST,
+    CACHE_READ_MULTIPLIER,
+    CACHE_WRITE_MULTIPLIER
 )
 from .logger import get_logger
 
@@ -71,46 +73,66 @@ class BudgetManager:
         self,
         input_tokens: int,
         output_tokens: int,
-        model: str = "sonnet"
+        model: str = "sonnet",
+        cache_read_tokens: int = 0,
+        cache_creation_tokens: int = 0,
+        cost_multiplier: float = 1.0
     ) -> float:
         """
         Calculate cost for token usage.
 
         Args:
-            input_tokens: Number of input tokens
+            input_tokens: Number of uncached input tokens
             output_tokens: Number of output tokens
             model: Model used ("sonnet" or "haiku")
+            cache_read_tokens: Input tokens served from the prompt cache
+            cache_creation_tokens: Input tokens written to the prompt cache
+            cost_multiplier: Discount on the whole request (e.g. batch API)
 
         Returns:
             Cost in EUR/USD
         """
         if model.lower() == "haiku":
-            input_cost = (input_tokens / 1_000_000) * HAIKU_INPUT_COST
-            output_cost = (output_tokens / 1_000_000) * HAIKU_OUTPUT_COST
+            input_rate, output_rate = HAIKU_INPUT_COST, HAIKU_OUTPUT_COST
         else:  # sonnet
-            input_cost = (input_tokens / 1_000_000) * SONNET_INPUT_COST
-            output_cost = (output_tokens / 1_000_000) * SONNET_OUTPUT_COST
+            input_rate, output_rate = SONNET_INPUT_COST, SONNET_OUTPUT_COST
 
-        return input_cost + output_cost
+        billed_input = (
+            input_tokens
+            + cache_read_tokens * CACHE_READ_MULTIPLIER
+            + cache_creation_tokens * CACHE_WRITE_MULTIPLIER
+        )
+        input_cost = (billed_input / 1_000_000) * input_rate
+        output_cost = (output_tokens / 1_000_000) * output_rate
+
+        return (input_cost + output_cost) * cost_multiplier
 
     def track_usage(
         self,
         input_tokens: int,
         output_tokens: int,
-        model: str = "sonnet"
+        model: str = "sonnet",
+        cache_read_tokens: int = 0,
+        cache_creation_tokens: int = 0,
+        cost_multiplier: float = 1.0
     ) -> float:
         """
         Track API usage and return cost.
 
         Args:
-            input_tokens: Number of input tokens
+            input_tokens: Number of uncached input tokens
             output_tokens: Number of output tokens
             model: Model used
+            cache_read_tokens: Input tokens served from the prompt cache
+            cache_creation_tokens: Input tokens written to the prompt cache
+            cost_multiplier: Discount on the whole request (e.g. batch API)
 
         Returns:
             Cost of this request
         """
-        cost = self.calculate_cost(input_tokens, output_tokens, model)
+        cost = self.calculate_cost(
+            input_tokens, output_tokens, model, cache_read_tokens, cache_creation_tokens, cost_multiplier
+        )
         today = self._get_today_key()
 
         # Update daily usage
@@ -135,7 +157,10 @@ class BudgetManager:
         self._clean_old_data()
         self._save_usage_data()
 
-        logger.info(f"API usage tracked: €{cost:.4f} ({input_tokens} in, {output_tokens} out)")
+        logger.info(
+            f"API usage tracked: €{cost:.4f} ({input_tokens} in, {output_tokens} out, "
+            f"{cache_read_tokens} cache read, {cache_creation_tokens} cache write)"
+        )
 
         return cost
 
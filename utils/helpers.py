@@ -1,11 +1,21 @@
 """
 Helper utilities
 """
+import functools
 import hashlib
-from typing import Any
+import re
+import threading
+import time
+from typing import Any, Callable, FrozenSet, Hashable
 from urllib.parse import urlparse
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
+
+@functools.lru_cache(maxsize=1024)
 def get_domain(url: str) -> str:
     """
     Extract domain from URL.
@@ -20,6 +30,45 @@ def get_domain(url: str) -> str:
     return parsed.netloc or parsed.path
 
 
+def url_fingerprint(url: str) -> int:
+    """
+    64-bit fingerprint of a URL for dedup sets.
+
+    Sets of these ints take a fraction of the memory of sets of URL
+    strings; collisions are negligible at crawl sizes. Uses xxhash when
+    installed, else the builtin (per-process) str hash.
+
+    Args:
+        url: Normalized URL
+
+    Returns:
+        Integer fingerprint
+    """
+    return xxhash.xxh3_64_intdigest(url) if xxhash else hash(url)
+
+
+_QUERY_TOKEN_RE = re.compile(r'\w+|[$€£]')
+
+
+@functools.lru_cache(maxsize=256)
+def query_tokens(query: str) -> FrozenSet[str]:
+    """
+    Lowercased word tokens of a query, for keyword-set intersection.
+
+    Plural forms also contribute their singular ("emails" -> "email"),
+    and currency symbols are kept as tokens.
+
+    Args:
+        query: Natural language query
+
+    Returns:
+        Frozenset of tokens
+    """
+    tokens = set(_QUERY_TOKEN_RE.findall(query.lower()))
+    tokens.update([token[:-1] for token in tokens if len(token) > 3 and token.endswith('s')])
+    return frozenset(tokens)
+
+
 def create_cache_key(url: str, query: str) -> str:
     """
     Create a unique cache key for URL + query combination.
@@ -35,7 +84,7 @@ def create_cache_key(url: str, query: str) -> str:
     return hashlib.md5(combined.encode()).hexdigest()
 
 
-def minimize_html(html: str, max_length: int = 3000, query: str = "") -> str:
+def minimize_html(html: str, max_length: int = 3000, query: str = "", soup=None) -> str:
     """
     Minimize HTML for LLM processing using intelligent snippet extraction.
 
@@ -43,13 +92,14 @@ def minimize_html(html: str, max_length: int = 3000, query: str = "") -> str:
         html: Raw HTML content
         max_length: Maximum length to keep
         query: User query (helps identify relevant content)
+        soup: Already parsed BeautifulSoup of html (skips a second parse)
 
     Returns:
         Minimized HTML snippet
     """
     # Use smart minimizer for better results
     from utils.html_minimizer import HTMLMinimizer
-    return HTMLMinimizer.minimize(html, max_length, query)
+    return HTMLMinimizer.minimize(html, max_length, query, soup=soup)
 
 
 def format_currency(amount: float) -> str:
@@ -62,4 +112,43 @@ def format_currency(amount: float) -> str:
     Returns:
         Formatted string (e.g., "€2.35")
     """
-    return f"€{amount:.4f}"
\ No newline at end of file
+    return f"€{amount:.4f}"
+
+
+def ttl_cache(seconds: float, key: Callable[..., Hashable]):
+    """
+    Cache a function's results for a limited time.
+
+    None results are not cached so failures are retried on the next call.
+
+    Args:
+        seconds: How long a cached value stays valid
+        key: Builds the cache key from the call arguments
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            now = time.monotonic()
+
+            with lock:
+                entry = cache.get(cache_key)
+            if entry and now - entry[0] < seconds:
+                return entry[1]
+
+            value = func(*args, **kwargs)
+            if value is not None:
+                with lock:
+                    cache[cache_key] = (now, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
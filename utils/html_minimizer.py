@@ -8,6 +8,10 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Attributes that waste tokens (class and id are kept for selectors)
+_NOISE_ATTR_RE = re.compile(r'\s+(?:style|data-[a-z-]+|aria-[a-z-]+|role)="[^"]*"')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 class HTMLMinimizer:
     """Intelligently minimizes HTML to save LLM costs"""
@@ -49,7 +53,7 @@ class HTMLMinimizer:
     ]
 
     @staticmethod
-    def minimize(html: str, max_chars: int = 3000, query: str = "") -> str:
+    def minimize(html: str, max_chars: int = 3000, query: str = "", soup: Optional[BeautifulSoup] = None) -> str:
         """
         Minimize HTML intelligently for LLM processing.
 
@@ -57,24 +61,67 @@ class HTMLMinimizer:
             html: Raw HTML content
             max_chars: Maximum characters to send to LLM
             query: User query (helps identify relevant content)
+            soup: Already parsed document; used instead of parsing html
+                again and left unchanged afterwards
 
         Returns:
             Minimized HTML snippet
         """
+        if soup is not None:
+            # Detached elements are put back in LIFO order, which restores
+            # each one against the tree state it was removed from
+            removed = []
+            try:
+                return HTMLMinimizer._minimize_soup(soup, html, max_chars, query, removed)
+            finally:
+                for element, parent, index in reversed(removed):
+                    parent.insert(index, element)
+
         try:
             soup = BeautifulSoup(html, 'lxml')
         except Exception:
             # Fallback to html.parser
             soup = BeautifulSoup(html, 'html.parser')
 
+        return HTMLMinimizer._minimize_soup(soup, html, max_chars, query)
+
+    @staticmethod
+    def _minimize_soup(
+        soup: BeautifulSoup,
+        html: str,
+        max_chars: int,
+        query: str,
+        removed: Optional[List] = None
+    ) -> str:
+        """
+        minimize() on a parsed document.
+
+        Args:
+            soup: Parsed document (pruned in place)
+            html: Raw HTML content (for the reduction log)
+            max_chars: Maximum characters to send to LLM
+            query: User query
+            removed: If given, pruned elements are detached rather than
+                destroyed and recorded here as (element, parent, index)
+
+        Returns:
+            Minimized HTML snippet
+        """
+        def prune(element, destroy=True):
+            if removed is None:
+                element.decompose() if destroy else element.extract()
+            elif element.parent is not None:
+                removed.append((element, element.parent, element.parent.index(element)))
+                element.extract()
+
         # Step 1: Remove unwanted elements
         for tag in HTMLMinimizer.REMOVE_TAGS:
             for element in soup.find_all(tag):
-                element.decompose()
+                prune(element)
 
         # Remove comments
         for comment in soup.find_all(string=lambda text: isinstance(text, str) and '<!--' in text):
-            comment.extract()
+            prune(comment, destroy=False)
 
         # Step 2: Find main content area
         main_content = HTMLMinimizer._find_main_content(soup)
@@ -163,14 +210,11 @@ class HTMLMinimizer:
     def _clean_html(html: str) -> str:
         """Final HTML cleanup"""
         # Remove attributes that waste tokens (but KEEP class and id!)
-        html = re.sub(r'\s+style="[^"]*"', '', html)
-        html = re.sub(r'\s+data-[a-z-]+="[^"]*"', '', html)
-        html = re.sub(r'\s+aria-[a-z-]+="[^"]*"', '', html)
-        html = re.sub(r'\s+role="[^"]*"', '', html)
-
-        # Collapse whitespace
-        html = re.sub(r'\s+', ' ', html)
-        html = re.sub(r'>\s+<', '><', html)
+        html = _NOISE_ATTR_RE.sub('', html)
+
+        # Collapse whitespace; runs between tags are single spaces by then
+        html = _WHITESPACE_RE.sub(' ', html)
+        html = html.replace('> <', '><')
 
         return html.strip()
 